@@ -0,0 +1,56 @@
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Iterator
+
+# Выбор вычислительного бэкенда для отчётов по OrderTable.
+#
+#   python — циклы по колонкам OrderTable (по умолчанию)
+#   numpy  — векторные групповые свёртки (bincount), см. numpy_backend.py
+#
+# Задаётся переменной окружения SHOP_ANALYTICS_BACKEND или set_backend().
+# Если NumPy не установлен, выбор "numpy" откатывается на "python".
+# Обычные кортежи заказов всегда считаются на чистом Python.
+
+BACKENDS = ("python", "numpy")
+ENV_VAR = "SHOP_ANALYTICS_BACKEND"
+
+
+def _resolve(name: str) -> str:
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд {name!r}, ожидается один из {BACKENDS}")
+    if name == "numpy":
+        from Analytics_Service import numpy_backend
+
+        if not numpy_backend.AVAILABLE:
+            warnings.warn("NumPy не установлен, используется бэкенд python")
+            return "python"
+    return name
+
+
+_current = _resolve(os.environ.get(ENV_VAR, "python"))
+
+
+def get_backend() -> str:
+    return _current
+
+
+def set_backend(name: str) -> str:
+    """Переключает бэкенд; возвращает фактически выбранный"""
+    global _current
+    _current = _resolve(name)
+    return _current
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """Временно переключает бэкенд (для тестов и бенчмарков)"""
+    previous = get_backend()
+    try:
+        yield set_backend(name)
+    finally:
+        set_backend(previous)
+
+
+def numpy_enabled() -> bool:
+    return _current == "numpy"
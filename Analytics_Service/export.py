@@ -0,0 +1,144 @@
+import csv
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Потоковый экспорт отчётов в CSV / JSONL (опционально gzip).
+#
+# Отчёт превращается в ReportTable — имена колонок + ленивый итератор строк,
+# и строки пишутся в файл по одной, без промежуточного списка словарей
+# или собранной целиком строки. Формат и сжатие определяются по имени файла:
+#   report.csv, report.jsonl, report.csv.gz, report.jsonl.gz
+
+FORMATS = ("csv", "jsonl")
+
+_dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+# Уровень 6 — заметно быстрее gzip по умолчанию (9) при почти том же размере
+GZIP_LEVEL = 6
+
+# Имена колонок для отчётов вида {ключ: значение}
+REPORT_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "sales_by_period": ("date", "total_sales"),
+    "customer_lifetime_value": ("user_id", "total_spent"),
+    "sales_by_hour": ("hour", "total_sales"),
+    "sales_by_weekday": ("weekday", "total_sales"),
+    "hourly_pattern": ("hour", "total_sales"),
+    "weekday_pattern": ("weekday", "total_sales"),
+}
+
+
+@dataclass(frozen=True)
+class ReportTable:
+    """Табличный вид отчёта: колонки + строки (итератор читается один раз)"""
+
+    columns: Tuple[str, ...]
+    rows: Iterable[tuple]
+
+
+def report_table(result, columns: Optional[Tuple[str, ...]] = None) -> ReportTable:
+    """
+    ReportTable из результата функции report.py / sql_report.py
+      dict  -> строки (ключ, значение); по умолчанию колонки ("key", "value")
+      list[dict] -> колонки по ключам первой записи
+    """
+    if isinstance(result, dict):
+        return ReportTable(tuple(columns or ("key", "value")), iter(result.items()))
+    if not result:
+        return ReportTable(tuple(columns or ()), iter(()))
+    columns = tuple(columns or result[0].keys())
+    return ReportTable(columns, (tuple(r[c] for c in columns) for r in result))
+
+
+def _split_path(path: str) -> Tuple[str, bool]:
+    """(формат, gzip) по расширению файла"""
+    compressed = path.endswith(".gz")
+    fmt = os.path.splitext(path[:-3] if compressed else path)[1].lstrip(".")
+    return fmt, compressed
+
+
+def _open_text(path: str, compressed: bool):
+    if compressed:
+        return gzip.open(
+            path, "wt", encoding="utf-8", newline="", compresslevel=GZIP_LEVEL
+        )
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class _Counted:
+    """Итератор, считающий прошедшие через него строки"""
+
+    def __init__(self, rows: Iterable[tuple]):
+        self.rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self
+
+    def __next__(self) -> tuple:
+        row = next(self.rows)
+        self.count += 1
+        return row
+
+
+def write_csv(table: ReportTable, f) -> int:
+    """Пишет таблицу в CSV-поток; возвращает число строк"""
+    writer = csv.writer(f)
+    writer.writerow(table.columns)
+    rows = _Counted(table.rows)
+    writer.writerows(rows)
+    return rows.count
+
+
+def write_jsonl(table: ReportTable, f) -> int:
+    """Пишет таблицу в JSONL-поток (объект на строку); возвращает число строк"""
+    # Ключи кодируются один раз в шаблон строки, на каждую строку — только значения
+    # ("%" в имени колонки экранируется, чтобы не стать спецификатором формата)
+    keys = (_dumps(c).replace("%", "%%") for c in table.columns)
+    template = "{" + ", ".join(k + ": %s" for k in keys) + "}\n"
+    rows = _Counted(table.rows)
+    f.writelines(template % tuple(map(_dumps, row)) for row in rows)
+    return rows.count
+
+
+_WRITERS = {"csv": write_csv, "jsonl": write_jsonl}
+
+
+def export_table(table: ReportTable, path: str) -> int:
+    """Экспорт таблицы в файл; формат и gzip — по расширению"""
+    fmt, compressed = _split_path(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {path!r} (ожидается {FORMATS})")
+    with _open_text(path, compressed) as f:
+        return _WRITERS[fmt](table, f)
+
+
+def export_report(result, path: str, columns: Optional[Tuple[str, ...]] = None) -> int:
+    """Экспорт результата отчёта (dict или list[dict]) в файл"""
+    return export_table(report_table(result, columns), path)
+
+
+def comprehensive_tables(report: dict) -> Iterator[Tuple[str, ReportTable]]:
+    """Секции comprehensive_report как отдельные таблицы"""
+    for section, result in report.items():
+        yield section, report_table(result, REPORT_COLUMNS.get(section))
+
+
+def export_comprehensive(
+    report: dict, directory: str, fmt: str = "csv", compress: bool = False
+) -> Dict[str, str]:
+    """
+    Экспорт comprehensive_report: по файлу на секцию в directory
+    Возвращает {секция: путь}
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt!r} (ожидается {FORMATS})")
+    os.makedirs(directory, exist_ok=True)
+    suffix = f".{fmt}.gz" if compress else f".{fmt}"
+    paths = {}
+    for section, table in comprehensive_tables(report):
+        paths[section] = os.path.join(directory, section + suffix)
+        export_table(table, paths[section])
+    return paths
@@ -0,0 +1,242 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from core.domain import Order, Product
+from core.dataset import OrderTable
+from core.timekeys import NO_VALUE
+
+# Однопроходный движок для comprehensive_report.
+#
+# Вместо шести отчётов, каждый из которых заново обходит заказы (а
+# sales_summary — четыре раза), все метрики копятся в одном аккумуляторе
+# за один проход. Аккумуляторы сливаются (merge), поэтому заказы можно
+# обрабатывать кусками, в том числе в разных процессах.
+# Результат совпадает с композицией отчётов из report.py, включая порядок
+# ключей (первое появление среди paid-заказов) и разрешение ничьих в топах.
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _merge_sums(into: dict, other: dict) -> None:
+    """Сложение словарей сумм; новые ключи дописываются в порядке other"""
+    for key, value in other.items():
+        into[key] = into.get(key, 0) + value
+
+
+class ReportAccumulator:
+    """
+    Изменяемое состояние comprehensive_report
+    add_orders — свёртка очередного куска заказов, merge — слияние с
+    аккумулятором следующего (по времени) куска
+    """
+
+    def __init__(self):
+        self.total_orders = 0
+        self.paid_orders = 0
+        self.refunded_orders = 0
+        self.cancelled_orders = 0
+        self.total_revenue = 0
+        self.total_refunded = 0
+        self.users: Dict[str, List[int]] = {}  # user_id -> [сумма, число заказов]
+        self.product_qty: Dict[str, int] = {}
+        self.hourly: Dict[int, int] = {}
+        self.weekday: Dict[str, int] = {}
+
+    def add_orders(self, orders: Iterable[Order]) -> "ReportAccumulator":
+        """Один проход по заказам"""
+        users, product_qty = self.users, self.product_qty
+        hourly, weekday = self.hourly, self.weekday
+        fromisoformat = datetime.fromisoformat
+        total_orders = paid = refunded = cancelled = 0
+        revenue = refunded_total = 0
+
+        for o in orders:
+            total_orders += 1
+            status = o.status
+            if status != "paid":
+                if status == "refunded":
+                    refunded += 1
+                    refunded_total += o.total
+                elif status == "cancelled":
+                    cancelled += 1
+                continue
+
+            total = o.total
+            paid += 1
+            revenue += total
+
+            user = users.get(o.user_id)
+            if user is None:
+                users[o.user_id] = [total, 1]
+            else:
+                user[0] += total
+                user[1] += 1
+
+            for pid, qty in o.items:
+                product_qty[pid] = product_qty.get(pid, 0) + qty
+
+            ts = o.ts
+            try:
+                hour = int(ts[11:13])
+            except (ValueError, IndexError):
+                pass
+            else:
+                hourly[hour] = hourly.get(hour, 0) + total
+            try:
+                day = WEEKDAY_NAMES[fromisoformat(ts).weekday()]
+            except (ValueError, IndexError):
+                pass
+            else:
+                weekday[day] = weekday.get(day, 0) + total
+
+        self.total_orders += total_orders
+        self.paid_orders += paid
+        self.refunded_orders += refunded
+        self.cancelled_orders += cancelled
+        self.total_revenue += revenue
+        self.total_refunded += refunded_total
+        return self
+
+    def add_table(self, orders: OrderTable) -> "ReportAccumulator":
+        """
+        Тот же проход по готовым колонкам OrderTable (коды вместо строк)
+        Выгоден, только если колонки уже построены — иначе см. add_orders
+        """
+        enc, keys = orders.encoded, orders.time_keys
+        paid = enc.status_code("paid")
+        refunded = enc.status_code("refunded")
+        cancelled = enc.status_code("cancelled")
+        sums, counts = [0] * len(enc.user_ids), [0] * len(enc.user_ids)
+        first, hourly, weekday = [], {}, {}
+        revenue = refunded_total = 0
+
+        for u, total, status, hour, wd in zip(
+            enc.order_user, enc.order_total, enc.order_status, keys.hour, keys.weekday
+        ):
+            if status != paid:
+                if status == refunded:
+                    refunded_total += total
+                continue
+            revenue += total
+            if not counts[u]:
+                first.append(u)
+            counts[u] += 1
+            sums[u] += total
+            if hour != NO_VALUE:
+                hourly[hour] = hourly.get(hour, 0) + total
+            if wd != NO_VALUE:
+                weekday[wd] = weekday.get(wd, 0) + total
+
+        part = ReportAccumulator()
+        part.total_orders = len(enc)
+        part.paid_orders = enc.order_status.count(paid)
+        part.refunded_orders = enc.order_status.count(refunded)
+        part.cancelled_orders = enc.order_status.count(cancelled)
+        part.total_revenue, part.total_refunded = revenue, refunded_total
+        part.users = {enc.user_ids[u]: [sums[u], counts[u]] for u in first}
+        part.product_qty = enc.qty_by_product("paid")
+        part.hourly = hourly
+        part.weekday = {WEEKDAY_NAMES[wd]: total for wd, total in weekday.items()}
+        return self.merge(part)
+
+    def merge(self, other: "ReportAccumulator") -> "ReportAccumulator":
+        """Добавляет состояние аккумулятора более позднего куска заказов"""
+        self.total_orders += other.total_orders
+        self.paid_orders += other.paid_orders
+        self.refunded_orders += other.refunded_orders
+        self.cancelled_orders += other.cancelled_orders
+        self.total_revenue += other.total_revenue
+        self.total_refunded += other.total_refunded
+        for uid, (total, count) in other.users.items():
+            user = self.users.get(uid)
+            if user is None:
+                self.users[uid] = [total, count]
+            else:
+                user[0] += total
+                user[1] += count
+        _merge_sums(self.product_qty, other.product_qty)
+        _merge_sums(self.hourly, other.hourly)
+        _merge_sums(self.weekday, other.weekday)
+        return self
+
+    # ============ Результаты (как в report.py) ============
+
+    def sales_summary(self) -> dict:
+        paid = self.paid_orders
+        return {
+            "total_orders": self.total_orders,
+            "paid_orders": paid,
+            "refunded_orders": self.refunded_orders,
+            "cancelled_orders": self.cancelled_orders,
+            "total_revenue": self.total_revenue,
+            "total_refunded": self.total_refunded,
+            "net_revenue": self.total_revenue - self.total_refunded,
+            "average_order_value": self.total_revenue / paid if paid else 0.0,
+        }
+
+    def bestsellers(self, products: Tuple[Product, ...], k: int) -> List[dict]:
+        qty = self.product_qty
+        top_ids = sorted(qty, key=qty.get, reverse=True)[:k]
+        products_dict = {p.id: p for p in products}
+        return [
+            {
+                "product_id": pid,
+                "title": products_dict[pid].title,
+                "price": products_dict[pid].price,
+                "quantity_sold": qty[pid],
+                "revenue": qty[pid] * products_dict[pid].price,
+            }
+            for pid in top_ids
+            if pid in products_dict
+        ]
+
+    def top_customers(self, k: int) -> List[dict]:
+        top = sorted(self.users.items(), key=lambda x: x[1][0], reverse=True)[:k]
+        return [
+            {
+                "user_id": uid,
+                "total_spent": total,
+                "order_count": count,
+                "avg_order": total // count,
+            }
+            for uid, (total, count) in top
+        ]
+
+    def retention(self) -> dict:
+        total_users = len(self.users)
+        repeat_users = sum(1 for _, count in self.users.values() if count > 1)
+        return {
+            "total_customers": total_users,
+            "repeat_customers": repeat_users,
+            "retention_rate": (
+                (repeat_users / total_users * 100) if total_users > 0 else 0
+            ),
+            "first_time_customers": total_users - repeat_users,
+        }
+
+    def report(self, products: Tuple[Product, ...], k: int = 5) -> dict:
+        """Словарь в формате report.comprehensive_report"""
+        return {
+            "sales": self.sales_summary(),
+            "bestsellers": self.bestsellers(products, k),
+            "top_customers": self.top_customers(k),
+            "retention": self.retention(),
+            "hourly_pattern": dict(sorted(self.hourly.items())),
+            "weekday_pattern": dict(self.weekday),
+        }
+
+
+def accumulate(orders: Iterable[Order]) -> ReportAccumulator:
+    """Аккумулятор по заказам за один проход"""
+    if (
+        isinstance(orders, OrderTable)
+        and {"encoded", "time_keys"} <= vars(orders).keys()
+    ):
+        return ReportAccumulator().add_table(orders)
+    return ReportAccumulator().add_orders(orders)
+
+
+def fused_report(
+    orders: Iterable[Order], products: Tuple[Product, ...], k: int = 5
+) -> dict:
+    """comprehensive_report за один проход по заказам"""
+    return accumulate(orders).report(products, k)
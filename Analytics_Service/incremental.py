@@ -0,0 +1,191 @@
+import heapq
+from typing import Dict, Iterable, List, Tuple
+from core.domain import Order
+
+# Инкрементальное состояние отчётов по живому потоку заказов.
+#
+# sales_summary, customer_lifetime_value, retention_rate и
+# top_customers_report не пересчитываются по всей истории: каждый новый
+# заказ и каждая смена статуса (paid -> refunded и т.п.) меняют счётчики
+# за O(1) и кучи за O(log n). Результаты совпадают с пакетными отчётами
+# из report.py по той же истории (смена статуса = заказ заменён на месте),
+# включая порядок ключей LTV (первый paid-заказ пользователя) и
+# разрешение ничьих в топе покупателей.
+
+
+class ReportState:
+    """Метрики продаж и покупателей, обновляемые по одному заказу"""
+
+    def __init__(self, orders: Iterable[Order] = ()):
+        # История: номер заказа -> пользователь, сумма, текущий статус
+        self.user_ids: List[str] = []
+        self.totals: List[int] = []
+        self.statuses: List[str] = []
+        self.seq_by_id: Dict[str, int] = {}  # последний заказ с данным id
+
+        self.counts: Dict[str, int] = {}  # статус -> число заказов
+        self.sums: Dict[str, int] = {}  # статус -> сумма total
+
+        # Пользователь -> [сумма paid, число paid]
+        self.users: Dict[str, List[int]] = {}
+        # Пользователь -> куча номеров paid-заказов (ленивое удаление)
+        self._paid_seqs: Dict[str, List[int]] = {}
+        self.repeat_customers = 0
+        # Куча топа: (-сумма, первый paid-заказ, user_id), устаревшие
+        # записи отбрасываются при чтении
+        self._top: List[Tuple[int, int, str]] = []
+
+        self.add_orders(orders)
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    # ============ Обновления ============
+
+    def add_orders(self, orders: Iterable[Order]) -> "ReportState":
+        for order in orders:
+            self.add_order(order)
+        return self
+
+    def add_order(self, order: Order) -> int:
+        """Дописывает заказ в историю; возвращает его номер"""
+        seq = len(self.statuses)
+        self.user_ids.append(order.user_id)
+        self.totals.append(order.total)
+        self.statuses.append(order.status)
+        self.seq_by_id[order.id] = seq
+        self._count(order.status, order.total, 1)
+        if order.status == "paid":
+            self._add_paid(seq)
+        return seq
+
+    def change_status(self, order_id: str, status: str) -> None:
+        """Смена статуса заказа (например, paid -> refunded) на месте"""
+        seq = self.seq_by_id.get(order_id)
+        if seq is None:
+            raise KeyError(f"Заказ {order_id!r} не найден")
+        previous = self.statuses[seq]
+        if previous == status:
+            return
+        total = self.totals[seq]
+        self._count(previous, total, -1)
+        self._count(status, total, 1)
+        self.statuses[seq] = status
+        if previous == "paid":
+            self._remove_paid(seq)
+        elif status == "paid":
+            self._add_paid(seq)
+
+    def _count(self, status: str, total: int, sign: int) -> None:
+        self.counts[status] = self.counts.get(status, 0) + sign
+        self.sums[status] = self.sums.get(status, 0) + sign * total
+
+    def _add_paid(self, seq: int) -> None:
+        user_id = self.user_ids[seq]
+        row = self.users.get(user_id)
+        if row is None:
+            row = self.users[user_id] = [0, 0]
+        row[0] += self.totals[seq]
+        row[1] += 1
+        if row[1] == 2:
+            self.repeat_customers += 1
+        heapq.heappush(self._paid_seqs.setdefault(user_id, []), seq)
+        self._push_top(user_id)
+
+    def _remove_paid(self, seq: int) -> None:
+        user_id = self.user_ids[seq]
+        row = self.users[user_id]
+        row[0] -= self.totals[seq]
+        row[1] -= 1
+        if row[1] == 1:
+            self.repeat_customers -= 1
+        if row[1] == 0:
+            del self.users[user_id]
+            del self._paid_seqs[user_id]
+            return
+        self._push_top(user_id)
+
+    def _first_paid(self, user_id: str) -> int:
+        """Номер первого paid-заказа пользователя (снимает устаревшие номера)"""
+        seqs, statuses = self._paid_seqs[user_id], self.statuses
+        while statuses[seqs[0]] != "paid":
+            heapq.heappop(seqs)
+        return seqs[0]
+
+    def _push_top(self, user_id: str) -> None:
+        entry = (-self.users[user_id][0], self._first_paid(user_id), user_id)
+        heapq.heappush(self._top, entry)
+        if len(self._top) > 2 * len(self.users) + 64:
+            # Слишком много устаревших записей — пересобираем кучу
+            self._top = [
+                (-row[0], self._first_paid(uid), uid) for uid, row in self.users.items()
+            ]
+            heapq.heapify(self._top)
+
+    def _is_current(self, entry: Tuple[int, int, str]) -> bool:
+        neg_total, first, user_id = entry
+        row = self.users.get(user_id)
+        return (
+            row is not None
+            and -neg_total == row[0]
+            and first == self._first_paid(user_id)
+        )
+
+    # ============ Отчёты ============
+
+    def sales_summary(self) -> dict:
+        """Как report.sales_summary по всей истории"""
+        counts, sums = self.counts, self.sums
+        paid = counts.get("paid", 0)
+        total_paid = sums.get("paid", 0)
+        total_refunded = sums.get("refunded", 0)
+        return {
+            "total_orders": len(self.statuses),
+            "paid_orders": paid,
+            "refunded_orders": counts.get("refunded", 0),
+            "cancelled_orders": counts.get("cancelled", 0),
+            "total_revenue": total_paid,
+            "total_refunded": total_refunded,
+            "net_revenue": total_paid - total_refunded,
+            "average_order_value": total_paid / paid if paid else 0.0,
+        }
+
+    def customer_lifetime_value(self) -> Dict[str, int]:
+        """Как report.customer_lifetime_value (порядок — первый paid-заказ)"""
+        users = self.users
+        return {uid: users[uid][0] for uid in sorted(users, key=self._first_paid)}
+
+    def retention_rate(self) -> dict:
+        """Как report.retention_rate"""
+        total_users, repeat_users = len(self.users), self.repeat_customers
+        return {
+            "total_customers": total_users,
+            "repeat_customers": repeat_users,
+            "retention_rate": (
+                (repeat_users / total_users * 100) if total_users > 0 else 0
+            ),
+            "first_time_customers": total_users - repeat_users,
+        }
+
+    def top_customers_report(self, k: int = 10) -> List[dict]:
+        """Как report.top_customers_report: k извлечений из кучи, O(k log n)"""
+        top, taken = self._top, []
+        while top and len(taken) < k:
+            entry = heapq.heappop(top)
+            if self._is_current(entry) and (not taken or entry != taken[-1]):
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(top, entry)
+
+        result = []
+        for _, _, uid in taken:
+            total, count = self.users[uid]
+            result.append(
+                {
+                    "user_id": uid,
+                    "total_spent": total,
+                    "order_count": count,
+                    "avg_order": total // count,
+                }
+            )
+        return result
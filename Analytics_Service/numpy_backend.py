@@ -0,0 +1,143 @@
+from typing import Dict, List, Tuple
+from core.dataset import OrderTable
+from core.timekeys import NO_VALUE
+
+try:
+    import numpy as np
+except ImportError:  # NumPy — необязательная зависимость
+    np = None
+
+# Векторный бэкенд отчётов поверх колонок OrderTable.
+#
+# Колонки array("l"/"q") оборачиваются в ndarray без копирования, группировки
+# считаются через bincount. Результаты совпадают с report.py один в один:
+#   - ключи идут в порядке первого появления среди подходящих заказов;
+#   - суммы — точные целые (bincount с весами считает в float64, поэтому при
+#     суммах >= 2**53 используется np.add.at по int64);
+#   - значения — обычные int/str, а не скаляры NumPy.
+
+AVAILABLE = np is not None
+
+_EXACT_FLOAT = 2**53
+
+# Ключи из диапазона меньше этого кодируются сдвигом, без сортировки
+_DENSE_RANGE = 1 << 16
+
+
+def _view(column):
+    """ndarray поверх array.array без копирования"""
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _group_sum(codes, weights, size: int):
+    """Точные int64-суммы weights по кодам 0..size-1"""
+    # Оценка сверху по максимуму — в int Python, без переполнения int64
+    if weights.size and int(np.abs(weights).max()) * weights.size >= _EXACT_FLOAT:
+        sums = np.zeros(size, dtype=np.int64)
+        np.add.at(sums, codes, weights)
+        return sums
+    return np.bincount(codes, weights=weights, minlength=size).astype(np.int64)
+
+
+def _first_appearance(codes, size: int):
+    """Различные коды 0..size-1 в порядке первого появления, за O(n)"""
+    first = np.full(size, codes.size, dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(codes.size))
+    present = np.flatnonzero(first < codes.size)
+    return present[np.argsort(first[present], kind="stable")]
+
+
+def _dense_codes(values):
+    """(различные значения, плотный код на элемент) для произвольных целых"""
+    if values.size:
+        lo, hi = int(values.min()), int(values.max())
+        if hi - lo < _DENSE_RANGE:
+            return np.arange(lo, hi + 1), values - lo
+    return np.unique(values, return_inverse=True)
+
+
+def _paid_mask(orders: OrderTable):
+    enc = orders.encoded
+    return _view(enc.order_status) == enc.status_code("paid")
+
+
+def _sum_by_codes(codes, totals, names) -> Dict:
+    """{names[код]: сумма} в порядке первого появления кода"""
+    sums = _group_sum(codes, totals, len(names))
+    order = _first_appearance(codes, len(names))
+    return dict(zip([names[c] for c in order.tolist()], sums[order].tolist()))
+
+
+# ============ Отчёты по продажам ============
+
+
+def sales_by_period(orders: OrderTable, start_date: str, end_date: str) -> Dict:
+    keys = orders.time_keys
+    codes = keys.day_codes(start_date, end_date)
+    day = _view(keys.order_day)
+    mask = _paid_mask(orders) & (day >= codes.start) & (day < codes.stop)
+    totals = _view(orders.encoded.order_total)[mask]
+    return _sum_by_codes(day[mask], totals, keys.day_keys)
+
+
+# ============ Временные паттерны ============
+
+
+def sum_paid_by_key(orders: OrderTable, keys, sort_keys: bool = False) -> Dict:
+    """Как report._sum_paid_by_key: сумма paid-заказов по колонке ключа"""
+    column = _view(keys)
+    mask = _paid_mask(orders) & (column != NO_VALUE)
+    values = column[mask]
+    totals = _view(orders.encoded.order_total)[mask]
+    # Ключи (часы) могут быть произвольными целыми — сначала плотные коды
+    unique, codes = _dense_codes(values)
+    sums = _group_sum(codes, totals, len(unique))
+    if sort_keys:
+        order = np.flatnonzero(np.bincount(codes, minlength=len(unique)))
+    else:
+        order = _first_appearance(codes, len(unique))
+    return dict(zip(unique[order].tolist(), sums[order].tolist()))
+
+
+# ============ Отчёты по пользователям и товарам ============
+
+
+def sum_by_user(orders: OrderTable) -> Dict[str, int]:
+    enc = orders.encoded
+    mask = _paid_mask(orders)
+    users = _view(enc.order_user)[mask]
+    return _sum_by_codes(users, _view(enc.order_total)[mask], enc.user_ids)
+
+
+def paid_orders_per_user(orders: OrderTable):
+    """Число paid-заказов на код пользователя"""
+    enc = orders.encoded
+    users = _view(enc.order_user)[_paid_mask(orders)]
+    return np.bincount(users, minlength=len(enc.user_ids))
+
+
+def retention_counts(orders: OrderTable) -> Tuple[int, int]:
+    """(покупателей, из них с повторными покупками)"""
+    counts = paid_orders_per_user(orders)
+    return int((counts > 0).sum()), int((counts > 1).sum())
+
+
+def qty_by_product(orders: OrderTable) -> Dict[str, int]:
+    enc = orders.encoded
+    item_mask = _paid_mask(orders)[_view(enc.item_order)]
+    products = _view(enc.item_product)[item_mask]
+    return _sum_by_codes(products, _view(enc.item_qty)[item_mask], enc.product_ids)
+
+
+def top_products(orders: OrderTable, k: int) -> List[Tuple[str, int]]:
+    """
+    Топ-K (product_id, qty) по paid-заказам; ничьи — по первому появлению,
+    как sorted(..., reverse=True) по словарю qty_by_product
+    """
+    enc = orders.encoded
+    item_mask = _paid_mask(orders)[_view(enc.item_order)]
+    products = _view(enc.item_product)[item_mask]
+    sums = _group_sum(products, _view(enc.item_qty)[item_mask], len(enc.product_ids))
+    order = _first_appearance(products, len(enc.product_ids))
+    top = order[np.argsort(-sums[order], kind="stable")[:k]]
+    return [(enc.product_ids[p], s) for p, s in zip(top.tolist(), sums[top].tolist())]
@@ -1,6 +1,26 @@
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
 from functools import reduce
 from core.domain import Order, Product, User
+from core.dataset import OrderTable
+from core.timekeys import NO_VALUE
+from core.hll import ActiveBuyers, HyperLogLog, DEFAULT_PRECISION, WINDOWS
+from core.transient import TransientDict, transient_reduce
+from Analytics_Service.fused import fused_report
+from Analytics_Service.backend import numpy_enabled
+from Analytics_Service import numpy_backend
+
+# Общие шаги свёрток (аккумулятор — транзиент, см. core/transient.py)
+
+
+def _add_item(acc: TransientDict, item: Tuple[str, int]) -> TransientDict:
+    pid, qty = item
+    return acc.add(pid, qty)
+
+
+def _count_paid_by_user(acc: TransientDict, order: Order) -> TransientDict:
+    if order.status != "paid":
+        return acc
+    return acc.add(order.user_id, 1)
 
 
 # ============ Отчёты по продажам ============
@@ -13,6 +33,11 @@ def sales_by_period(
     Продажи за период по дням (иммутабельная агрегация через reduce)
     Возвращает: {date: total_sales}
     """
+    if isinstance(orders, OrderTable):
+        if numpy_enabled():
+            return numpy_backend.sales_by_period(orders, start_date, end_date)
+        return _sales_by_period_columns(orders, start_date, end_date)
+
     period_orders = tuple(
         filter(
             lambda o: start_date <= o.ts[:10] <= end_date and o.status == "paid",
@@ -20,12 +45,25 @@ def sales_by_period(
         )
     )
 
-    # Группируем по дням через reduce
-    def accumulate_by_day(acc: dict, order: Order) -> dict:
-        day = order.ts[:10]
-        return {**acc, day: acc.get(day, 0) + order.total}
+    # Группируем по дням через reduce (транзиентный аккумулятор — O(n))
+    def accumulate_by_day(acc: TransientDict, order: Order) -> TransientDict:
+        return acc.add(order.ts[:10], order.total)
+
+    return transient_reduce(accumulate_by_day, period_orders)
 
-    return reduce(accumulate_by_day, period_orders, {})
+
+def _sales_by_period_columns(
+    orders: OrderTable, start_date: str, end_date: str
+) -> Dict[str, int]:
+    """sales_by_period по индексу времени: бинарный поиск и срез периода"""
+    index = orders.time_index
+    sums = {}
+    for i in index.positions(*index.period_range(start_date, end_date)):
+        order = orders[i]
+        if order.status == "paid":
+            day = order.ts[:10]
+            sums[day] = sums.get(day, 0) + order.total
+    return sums
 
 
 def average_order_value(orders: Tuple[Order, ...]) -> float:
@@ -71,17 +109,19 @@ def bestsellers_report(
     """
 
     # Агрегируем количество через reduce
-    def accumulate_product_qty(acc: dict, order: Order) -> dict:
+    def accumulate_product_qty(acc: TransientDict, order: Order) -> TransientDict:
         if order.status != "paid":
             return acc
+        return reduce(_add_item, order.items, acc)
 
-        def add_item(inner_acc: dict, item: Tuple[str, int]) -> dict:
-            pid, qty = item
-            return {**inner_acc, pid: inner_acc.get(pid, 0) + qty}
-
-        return reduce(add_item, order.items, acc)
-
-    product_qty = reduce(accumulate_product_qty, orders, {})
+    # OrderTable: суммы по закодированным колонкам вместо dict по строкам
+    if isinstance(orders, OrderTable) and numpy_enabled():
+        # Уже отсортированный топ-K: сортировка ниже его не меняет
+        product_qty = dict(numpy_backend.top_products(orders, k))
+    elif isinstance(orders, OrderTable):
+        product_qty = orders.encoded.qty_by_product("paid")
+    else:
+        product_qty = transient_reduce(accumulate_product_qty, orders)
 
     # Сортируем и берём топ-K
     top_ids = sorted(product_qty.keys(), key=product_qty.get, reverse=True)[:k]
@@ -114,18 +154,13 @@ def low_stock_alert(
     """
     recent_orders = orders[-20:] if len(orders) >= 20 else orders
 
-    # Иммутабельная агрегация через reduce
-    def accumulate_sales(acc: dict, order: Order) -> dict:
+    # Агрегация через reduce
+    def accumulate_sales(acc: TransientDict, order: Order) -> TransientDict:
         if order.status != "paid":
             return acc
+        return reduce(_add_item, order.items, acc)
 
-        def add_item(inner_acc: dict, item: Tuple[str, int]) -> dict:
-            pid, qty = item
-            return {**inner_acc, pid: inner_acc.get(pid, 0) + qty}
-
-        return reduce(add_item, order.items, acc)
-
-    recent_sales = reduce(accumulate_sales, recent_orders, {})
+    recent_sales = transient_reduce(accumulate_sales, recent_orders)
 
     return [
         {"product_id": pid, "recent_sales": qty}
@@ -142,13 +177,17 @@ def customer_lifetime_value(orders: Tuple[Order, ...]) -> Dict[str, int]:
     LTV по пользователям (иммутабельная агрегация)
     Возвращает: {user_id: total_spent}
     """
+    if isinstance(orders, OrderTable):
+        if numpy_enabled():
+            return numpy_backend.sum_by_user(orders)
+        return orders.encoded.sum_by_user("paid")
 
-    def accumulate_user_totals(acc: dict, order: Order) -> dict:
+    def accumulate_user_totals(acc: TransientDict, order: Order) -> TransientDict:
         if order.status != "paid":
             return acc
-        return {**acc, order.user_id: acc.get(order.user_id, 0) + order.total}
+        return acc.add(order.user_id, order.total)
 
-    return reduce(accumulate_user_totals, orders, {})
+    return transient_reduce(accumulate_user_totals, orders)
 
 
 def top_customers_report(orders: Tuple[Order, ...], k: int = 10) -> List[dict]:
@@ -158,13 +197,11 @@ def top_customers_report(orders: Tuple[Order, ...], k: int = 10) -> List[dict]:
     ltv = customer_lifetime_value(orders)
     top_users = sorted(ltv.items(), key=lambda x: x[1], reverse=True)[:k]
 
-    # Считаем количество заказов (иммутабельно)
-    def count_orders(acc: dict, order: Order) -> dict:
-        if order.status != "paid":
-            return acc
-        return {**acc, order.user_id: acc.get(order.user_id, 0) + 1}
-
-    order_counts = reduce(count_orders, orders, {})
+    # Считаем количество заказов
+    if isinstance(orders, OrderTable):
+        order_counts = orders.encoded.count_by_user("paid")
+    else:
+        order_counts = transient_reduce(_count_paid_by_user, orders)
 
     return [
         {
@@ -183,16 +220,15 @@ def retention_rate(orders: Tuple[Order, ...]) -> dict:
     """
     Процент пользователей с повторными покупками (иммутабельно)
     """
-
-    def count_user_orders(acc: dict, order: Order) -> dict:
-        if order.status != "paid":
-            return acc
-        return {**acc, order.user_id: acc.get(order.user_id, 0) + 1}
-
-    user_orders = reduce(count_user_orders, orders, {})
-
-    total_users = len(user_orders)
-    repeat_users = sum(1 for count in user_orders.values() if count > 1)
+    if isinstance(orders, OrderTable) and numpy_enabled():
+        total_users, repeat_users = numpy_backend.retention_counts(orders)
+    else:
+        if isinstance(orders, OrderTable):
+            user_orders = orders.encoded.count_by_user("paid")
+        else:
+            user_orders = transient_reduce(_count_paid_by_user, orders)
+        total_users = len(user_orders)
+        repeat_users = sum(1 for count in user_orders.values() if count > 1)
 
     return {
         "total_customers": total_users,
@@ -202,6 +238,33 @@ def retention_rate(orders: Tuple[Order, ...]) -> dict:
     }
 
 
+def active_buyers_report(
+    orders: Tuple[Order, ...],
+    products: Tuple[Product, ...],
+    day: Optional[str] = None,
+    precision: int = DEFAULT_PRECISION,
+) -> dict:
+    """
+    DAU / WAU / MAU различных покупателей (HyperLogLog, ~1.6% при precision=12)
+    в целом и по категориям, рядом — точный retention_rate
+    day: последний день окна (по умолчанию — последний день с paid-заказами)
+    """
+    buyers = ActiveBuyers(products, precision).add_orders(orders)
+    day = day or buyers.last_day()
+    if day is None:
+        rolling, by_category = dict.fromkeys(WINDOWS, 0), {}
+    else:
+        rolling = buyers.rolling(day)
+        by_category = {c: buyers.rolling(day, c) for c in buyers.categories()}
+    return {
+        "day": day,
+        **rolling,
+        "by_category": by_category,
+        "relative_error": HyperLogLog(precision).relative_error,
+        "retention": retention_rate(orders),
+    }
+
+
 # ============ Отчёты по корзинам (конверсия) ============
 
 
@@ -226,21 +289,36 @@ def cart_abandonment_rate(carts: Tuple, orders: Tuple[Order, ...]) -> dict:
 # ============ Временные паттерны ============
 
 
+def _sum_paid_by_key(orders: OrderTable, keys, sort_keys: bool = False) -> dict:
+    """Сумма paid-заказов по колонке временного ключа (NO_VALUE пропускается)"""
+    if numpy_enabled():
+        return numpy_backend.sum_paid_by_key(orders, keys, sort_keys)
+    enc = orders.encoded
+    paid = enc.status_code("paid")
+    sums = {}
+    for key, total, status in zip(keys, enc.order_total, enc.order_status):
+        if status == paid and key != NO_VALUE:
+            sums[key] = sums.get(key, 0) + total
+    return dict(sorted(sums.items())) if sort_keys else sums
+
+
 def sales_by_hour(orders: Tuple[Order, ...]) -> Dict[int, int]:
     """
     Продажи по часам дня (иммутабельно)
     """
+    if isinstance(orders, OrderTable):
+        return _sum_paid_by_key(orders, orders.time_keys.hour, sort_keys=True)
 
-    def accumulate_hourly(acc: dict, order: Order) -> dict:
+    def accumulate_hourly(acc: TransientDict, order: Order) -> TransientDict:
         if order.status != "paid":
             return acc
         try:
             hour = int(order.ts[11:13])
-            return {**acc, hour: acc.get(hour, 0) + order.total}
+            return acc.add(hour, order.total)
         except (ValueError, IndexError):
             return acc
 
-    hourly_sales = reduce(accumulate_hourly, orders, {})
+    hourly_sales = transient_reduce(accumulate_hourly, orders)
     return dict(sorted(hourly_sales.items()))
 
 
@@ -252,17 +330,21 @@ def sales_by_weekday(orders: Tuple[Order, ...]) -> Dict[str, int]:
 
     weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
-    def accumulate_weekday(acc: dict, order: Order) -> dict:
+    if isinstance(orders, OrderTable):
+        by_weekday = _sum_paid_by_key(orders, orders.time_keys.weekday)
+        return {weekday_names[wd]: total for wd, total in by_weekday.items()}
+
+    def accumulate_weekday(acc: TransientDict, order: Order) -> TransientDict:
         if order.status != "paid":
             return acc
         try:
             dt = datetime.fromisoformat(order.ts)
             day_name = weekday_names[dt.weekday()]
-            return {**acc, day_name: acc.get(day_name, 0) + order.total}
+            return acc.add(day_name, order.total)
         except (ValueError, IndexError):
             return acc
 
-    return reduce(accumulate_weekday, orders, {})
+    return transient_reduce(accumulate_weekday, orders)
 
 
 # ============ Композитный отчёт ============
@@ -272,13 +354,8 @@ def comprehensive_report(
     orders: Tuple[Order, ...], products: Tuple[Product, ...], users: Tuple[User, ...]
 ) -> dict:
     """
-    Полный аналитический отчёт (композиция всех метрик)
+    Полный аналитический отчёт: sales_summary, bestsellers_report(k=5),
+    top_customers_report(k=5), retention_rate, sales_by_hour, sales_by_weekday
+    Все метрики считаются за один проход по заказам (см. fused.py)
     """
-    return {
-        "sales": sales_summary(orders),
-        "bestsellers": bestsellers_report(orders, products, k=5),
-        "top_customers": top_customers_report(orders, k=5),
-        "retention": retention_rate(orders),
-        "hourly_pattern": sales_by_hour(orders),
-        "weekday_pattern": sales_by_weekday(orders),
-    }
+    return fused_report(orders, products, k=5)
@@ -0,0 +1,183 @@
+from typing import Dict, Iterator, List, Tuple
+from core.ranges import MAX_CHAR
+from core.storage import SqliteStore
+
+# Те же отчёты, что в report.py, но фильтры и GROUP BY выполняются в SQLite.
+# Результаты совпадают с report.py, включая порядок ключей и разрешение
+# ничьих при сортировке (по первому появлению — MIN(seq)).
+
+
+# ============ Отчёты по продажам ============
+
+
+def sales_by_period(
+    store: SqliteStore, start_date: str, end_date: str
+) -> Dict[str, int]:
+    """Продажи за период по дням: {date: total_sales}"""
+    rows = store.query(
+        """
+        SELECT substr(ts, 1, 10) AS day, SUM(total) FROM orders
+        WHERE status = 'paid' AND ts >= ? AND ts < ?
+          AND substr(ts, 1, 10) BETWEEN ? AND ?
+        GROUP BY day ORDER BY MIN(seq)
+        """,
+        (start_date, end_date + MAX_CHAR, start_date, end_date),
+    )
+    return dict(rows)
+
+
+def average_order_value(store: SqliteStore) -> float:
+    """Средний чек (только paid заказы)"""
+    count, total = store.query(
+        "SELECT COUNT(*), COALESCE(SUM(total), 0) FROM orders WHERE status = 'paid'"
+    )[0]
+    return total / count if count else 0.0
+
+
+def sales_summary(store: SqliteStore) -> dict:
+    """Сводка по продажам (один проход в SQL)"""
+    total, paid, refunded, cancelled, total_paid, total_refunded = store.query("""
+        SELECT COUNT(*),
+               COALESCE(SUM(status = 'paid'), 0),
+               COALESCE(SUM(status = 'refunded'), 0),
+               COALESCE(SUM(status = 'cancelled'), 0),
+               COALESCE(SUM(CASE WHEN status = 'paid' THEN total END), 0),
+               COALESCE(SUM(CASE WHEN status = 'refunded' THEN total END), 0)
+        FROM orders
+        """)[0]
+    return {
+        "total_orders": total,
+        "paid_orders": paid,
+        "refunded_orders": refunded,
+        "cancelled_orders": cancelled,
+        "total_revenue": total_paid,
+        "total_refunded": total_refunded,
+        "net_revenue": total_paid - total_refunded,
+        "average_order_value": total_paid / paid if paid else 0.0,
+    }
+
+
+# ============ Отчёты по товарам ============
+
+
+def bestsellers_report(store: SqliteStore, k: int = 10) -> List[dict]:
+    """Топ-K бестселлеров с деталями"""
+    rows = store.query(
+        """
+        WITH top AS (
+            SELECT i.product_id AS pid, SUM(i.qty) AS qty, MIN(i.seq) AS first
+            FROM order_items i JOIN orders o ON o.seq = i.order_seq
+            WHERE o.status = 'paid'
+            GROUP BY i.product_id
+            ORDER BY qty DESC, first
+            LIMIT ?
+        )
+        SELECT top.pid, p.title, p.price, top.qty FROM top
+        JOIN products p ON p.id = top.pid
+        ORDER BY top.qty DESC, top.first
+        """,
+        (k,),
+    )
+    return [
+        {
+            "product_id": pid,
+            "title": title,
+            "price": price,
+            "quantity_sold": qty,
+            "revenue": qty * price,
+        }
+        for pid, title, price, qty in rows
+    ]
+
+
+# ============ Отчёты по пользователям ============
+
+
+def iter_customer_lifetime_value(store: SqliteStore) -> Iterator[Tuple[str, int]]:
+    """Пары (user_id, total_spent) по мере чтения курсора — для экспорта"""
+    return store.iter_query(
+        "SELECT user_id, SUM(total) FROM orders WHERE status = 'paid'"
+        " GROUP BY user_id ORDER BY MIN(seq)"
+    )
+
+
+def customer_lifetime_value(store: SqliteStore) -> Dict[str, int]:
+    """LTV по пользователям: {user_id: total_spent}"""
+    return dict(iter_customer_lifetime_value(store))
+
+
+def top_customers_report(store: SqliteStore, k: int = 10) -> List[dict]:
+    """Топ-K покупателей по выручке"""
+    rows = store.query(
+        """
+        SELECT user_id, SUM(total) AS spent, COUNT(*) FROM orders
+        WHERE status = 'paid'
+        GROUP BY user_id ORDER BY spent DESC, MIN(seq) LIMIT ?
+        """,
+        (k,),
+    )
+    return [
+        {
+            "user_id": uid,
+            "total_spent": total,
+            "order_count": count,
+            "avg_order": total // count if count > 0 else 0,
+        }
+        for uid, total, count in rows
+    ]
+
+
+def retention_rate(store: SqliteStore) -> dict:
+    """Процент пользователей с повторными покупками"""
+    total_users, repeat_users = store.query("""
+        SELECT COUNT(*), COALESCE(SUM(n > 1), 0) FROM (
+            SELECT COUNT(*) AS n FROM orders WHERE status = 'paid' GROUP BY user_id
+        )
+        """)[0]
+    return {
+        "total_customers": total_users,
+        "repeat_customers": repeat_users,
+        "retention_rate": (repeat_users / total_users * 100) if total_users > 0 else 0,
+        "first_time_customers": total_users - repeat_users,
+    }
+
+
+# ============ Временные паттерны ============
+
+
+def sales_by_hour(store: SqliteStore) -> Dict[int, int]:
+    """Продажи по часам дня (ts разбирается как в report.sales_by_hour)"""
+    rows = store.query("""
+        SELECT ts_hour(ts) AS hour, SUM(total) FROM orders
+        WHERE status = 'paid' AND ts_hour(ts) IS NOT NULL
+        GROUP BY hour ORDER BY hour
+        """)
+    return dict(rows)
+
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def sales_by_weekday(store: SqliteStore) -> Dict[str, int]:
+    """Продажи по дням недели (полный ts, как datetime.fromisoformat)"""
+    rows = store.query("""
+        SELECT ts_weekday(ts) AS wd, SUM(total) FROM orders
+        WHERE status = 'paid' AND ts_weekday(ts) IS NOT NULL
+        GROUP BY wd ORDER BY MIN(seq)
+        """)
+    return {WEEKDAY_NAMES[wd]: total for wd, total in rows}
+
+
+# ============ Композитный отчёт ============
+
+
+def comprehensive_report(store: SqliteStore) -> dict:
+    """Полный аналитический отчёт (как report.comprehensive_report)"""
+    return {
+        "sales": sales_summary(store),
+        "bestsellers": bestsellers_report(store, k=5),
+        "top_customers": top_customers_report(store, k=5),
+        "retention": retention_rate(store),
+        "hourly_pattern": sales_by_hour(store),
+        "weekday_pattern": sales_by_weekday(store),
+    }
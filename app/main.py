@@ -8,7 +8,6 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core.domain import Cart, Order
 from core.transforms import (
-    load_seed,
     add_to_cart,
     remove_from_cart,
     checkout,
@@ -26,20 +25,88 @@ from Analytics_Service.report import (
     retention_rate,
     sales_by_hour,
 )
-from core.frp import create_shop_event_bus, create_event, initial_state
+from core.frp import (
+    create_shop_event_bus,
+    create_event,
+    initial_state,
+    with_report_cache,
+)
 from core.async_ops import run_async_pipeline
 from core.lazy import iter_orders_by_day, lazy_top_customers
+from core.seed_dataset import SeedDataset
+from core.product_index import product_index
+from core.report_cache import ReportCache
+from core.disk_cache import DiskReportCache, source_version
+from core.warmup import Warmup
 
 
 # ============ Кэширование данных ============
-@st.cache_data
+# Ленивый набор данных: каждая страница материализует только нужные ей секции
+@st.cache_resource
 def get_data():
-    return load_seed("data/seed.json")
+    return SeedDataset("data/seed.json", snapshot="data/seed.snapshot")
+
+
+# Кэш отчётов общий для всех сессий: отчёты не пересчитываются на каждый
+# rerun и сбрасываются событиями FRP, которые меняют заказы
+@st.cache_resource
+def get_report_cache():
+    return ReportCache()
+
+
+# Дисковый кэш тяжёлых отчётов: переживает рестарт приложения, ключ —
+# отпечаток seed-файла (другой seed — другие ключи) и версия исходников
+# (после деплоя с изменённым кодом старые результаты не отдаются)
+@st.cache_resource
+def get_disk_cache():
+    return DiskReportCache(
+        "data/reports.cache.sqlite",
+        version=source_version(["core", "Analytics_Service"]),
+    )
 
 
 @st.cache_resource
 def get_event_bus():
-    return create_shop_event_bus()
+    return with_report_cache(create_shop_event_bus(), get_report_cache())
+
+
+# Прогрев: основные отчёты и полный async-пайплайн считаются в фоне и
+# кладутся в кэши; страницы читают их оттуда, пока прогрев идёт — показывают
+# прогресс, а задачу, до которой он ещё не дошёл, считают сами.
+# Поток запускается при первом заходе на страницу с отчётами (REPORT_PAGES)
+@st.cache_resource
+def get_warmup():
+    data, reports, disk = get_data(), get_report_cache(), get_disk_cache()
+    tasks = (
+        ("sales_summary", lambda: reports.get(sales_summary, data.orders)),
+        ("sales_by_hour", lambda: reports.get(sales_by_hour, data.orders)),
+        ("retention_rate", lambda: reports.get(retention_rate, data.orders)),
+        (
+            "bestsellers_report",
+            lambda: reports.get(
+                bestsellers_report,
+                data.orders,
+                data.products,
+                k=10,
+                deps=("orders", "products"),
+            ),
+        ),
+        (
+            "top_customers_report",
+            lambda: reports.get(top_customers_report, data.orders, k=10),
+        ),
+        (
+            "async_pipeline",
+            lambda: disk.get(
+                run_async_pipeline, data.orders, data.products, data.users
+            ),
+        ),
+    )
+    # Отпечаток читается в потоке прогрева: создание Warmup не трогает снимок
+    return Warmup(tasks, version=lambda: data.fingerprint)
+
+
+REPORT_PAGES = ("📊 Overview", "📈 Статистика", "📑 Reports", "🚀 Async Analytics")
 
 
 # ============ Инициализация ============
@@ -50,11 +117,13 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-categories, products, users, orders = get_data()
+data = get_data()
+reports = get_report_cache()
+warmup = get_warmup()
 
 # Инициализация состояния
 if "cart" not in st.session_state:
-    st.session_state.cart = Cart(id="cart_default", user_id=users[0].id, items=())
+    st.session_state.cart = Cart(id="cart_default", user_id=data.users[0].id, items=())
 
 if "frp_state" not in st.session_state:
     st.session_state.frp_state = initial_state()
@@ -117,25 +186,44 @@ with st.sidebar:
     st.success("✅ Лаба 7: Композиция")
     st.success("✅ Лаба 8: Async/Parallel")
 
+    st.divider()
+    # Каталог и Корзина не запускают прогрев — их секции остаются ленивыми;
+    # при уже заполненном кэше отчётов прогревать нечего
+    if page in REPORT_PAGES and not warmup.started and len(reports) == 0:
+        warmup.start()
+    if warmup.started and not warmup.finished:
+        done, total = warmup.progress()
+        st.progress(
+            done / total,
+            text=f"🔥 Прогрев отчётов: {done}/{total} ({warmup.current() or '…'})",
+        )
+    cache_stats = reports.stats()
+    st.caption(
+        f"🗄️ Кэш отчётов: {cache_stats['entries']} записей, "
+        f"{cache_stats['bytes'] / 1024:.0f} KB, "
+        f"попаданий {cache_stats['hits']} / промахов {cache_stats['misses']}"
+    )
+
 
 # ============ PAGE: OVERVIEW ============
 if page == "📊 Overview":
     st.header("📦 Обзор системы")
+    orders = data.orders
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("📂 Категории", len(categories))
+        st.metric("📂 Категории", data.count("categories"))
     with col2:
-        st.metric("📦 Товары", len(products))
+        st.metric("📦 Товары", data.count("products"))
     with col3:
-        st.metric("👥 Пользователи", len(users))
+        st.metric("👥 Пользователи", data.count("users"))
     with col4:
         st.metric("🧾 Заказы", len(orders))
 
     st.divider()
 
     # Сводка по продажам
-    summary = sales_summary(orders)
+    summary = warmup.get("sales_summary")
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -152,7 +240,7 @@ if page == "📊 Overview":
 
     # График продаж по часам
     st.subheader("⏰ Продажи по времени суток")
-    hourly = sales_by_hour(orders)
+    hourly = warmup.get("sales_by_hour")
     if hourly:
         st.bar_chart(hourly)
 
@@ -160,6 +248,7 @@ if page == "📊 Overview":
 # ============ PAGE: КАТАЛОГ ============
 elif page == "🏪 Каталог":
     st.header("🏪 Каталог товаров")
+    categories, products = data.categories, data.products
 
     # Фильтры
     col1, col2, col3 = st.columns(3)
@@ -224,23 +313,26 @@ elif page == "🏪 Каталог":
 # ============ PAGE: КОРЗИНА ============
 elif page == "🛒 Корзина":
     st.header("🛒 Ваша корзина")
+    products, users = data.products, data.users
 
     cart = st.session_state.cart
 
     if not cart.items:
         st.info("🛍️ Корзина пуста. Перейдите в каталог!")
     else:
-        # Вычисляем итоговую сумму
+        # Вычисляем итоговую сумму (поиск товара — O(1) по индексу каталога)
+        index = product_index(products)
+
         def calc_item_price(item):
             pid, qty = item
-            product = next((p for p in products if p.id == pid), None)
+            product = index.get(pid)
             return product.price * qty if product else 0
 
         total_sum = reduce(lambda acc, item: acc + calc_item_price(item), cart.items, 0)
 
         # Отображение товаров
         for pid, qty in cart.items:
-            product = next((p for p in products if p.id == pid), None)
+            product = index.get(pid)
             if product:
                 cols = st.columns([5, 2, 2, 1])
                 with cols[0]:
@@ -276,6 +368,7 @@ elif page == "🛒 Корзина":
 # ============ PAGE: СТАТИСТИКА ============
 elif page == "📈 Статистика":
     st.header("📈 Статистика и аналитика")
+    products, users, orders = data.products, data.users, data.orders
 
     tab1, tab2, tab3 = st.tabs(
         ["👥 Пользователи", "📦 Товары", "🔄 Ленивые вычисления"]
@@ -296,7 +389,7 @@ elif page == "📈 Статистика":
         st.divider()
 
         # Ретеншен
-        retention = retention_rate(orders)
+        retention = warmup.get("retention_rate")
         st.subheader("🔁 Retention Rate")
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -349,12 +442,13 @@ elif page == "📈 Статистика":
 # ============ PAGE: REPORTS ============
 elif page == "📑 Reports":
     st.header("📑 Отчёты и анализ")
+    products, orders = data.products, data.orders
 
     tab1, tab2, tab3 = st.tabs(["🏆 Бестселлеры", "👥 Топ клиенты", "🔍 Maybe/Either"])
 
     with tab1:
         st.subheader("🏆 Бестселлеры")
-        bestsellers = bestsellers_report(orders, products, k=10)
+        bestsellers = warmup.get("bestsellers_report")
 
         for item in bestsellers:
             cols = st.columns([3, 2, 2, 2])
@@ -369,7 +463,7 @@ elif page == "📑 Reports":
 
     with tab2:
         st.subheader("👥 Топ клиенты")
-        top_cust = top_customers_report(orders, k=10)
+        top_cust = warmup.get("top_customers_report")
 
         for item in top_cust:
             cols = st.columns([2, 2, 2, 2])
@@ -423,12 +517,10 @@ elif page == "⚡ FRP Events":
 
     bus = get_event_bus()
 
-    st.markdown(
-        """
+    st.markdown("""
     Демонстрация функционального реактивного программирования.  
     Все обработчики событий — **чистые функции**.
-    """
-    )
+    """)
 
     col1, col2 = st.columns(2)
 
@@ -472,20 +564,35 @@ elif page == "⚡ FRP Events":
 elif page == "🚀 Async Analytics":
     st.header("🚀 Асинхронная аналитика (Лаба 8)")
 
-    st.markdown(
-        """
+    st.markdown("""
     Параллельная обработка данных с использованием `asyncio`.  
     Все анализы выполняются **одновременно**.
-    """
-    )
-
-    if st.button("▶️ Запустить полный анализ", type="primary", key="async_run"):
+    """)
+
+    warmed = warmup.ready("async_pipeline")
+    if warmed:
+        st.caption("♨️ Результат полного анализа прогрет в фоне")
+    elif warmup.started:
+        done, total = warmup.progress()
+        st.progress(done / total, text=f"🔥 Прогрев в фоне: {done}/{total} задач")
+
+    if warmed or st.button(
+        "▶️ Запустить полный анализ", type="primary", key="async_run"
+    ):
         with st.spinner("⏳ Выполняется асинхронный анализ..."):
             start = time.perf_counter()
-            result = run_async_pipeline(list(orders), list(products), list(users))
+            result = warmup.get("async_pipeline")
             elapsed = (time.perf_counter() - start) * 1000
 
-        st.success(f"✅ Анализ завершён за {elapsed:.2f} ms")
+        # Время ответа страницы: чтение из кэша или ожидание/расчёт пайплайна
+        task_ms = warmup.stats()["async_pipeline"]["seconds"] * 1000
+        if warmed:
+            st.success(
+                f"✅ Результат прочитан из кэша за {elapsed:.2f} ms "
+                f"(задача прогрева в фоне: {task_ms:.0f} ms)"
+            )
+        else:
+            st.success(f"✅ Результат получен за {elapsed:.2f} ms")
 
         tab1, tab2, tab3, tab4 = st.tabs(
             ["📅 По дням", "👥 По юзерам", "📦 Товары", "🎯 Сегменты"]
@@ -523,14 +630,12 @@ elif page == "🚀 Async Analytics":
 elif page == "🧪 Tests Demo":
     st.header("🧪 Демонстрация тестов")
 
-    st.markdown(
-        """
+    st.markdown("""
     Для запуска тестов используйте команду:
     ```bash
     pytest -v
     ```
-    """
-    )
+    """)
 
     if st.button("▶️ Запустить тесты (демо)", key="run_tests"):
         st.code(
@@ -0,0 +1,97 @@
+"""
+Товары и дерево поддерева категорий: рекурсивный flatten_categories +
+фильтр каталога против интервалов обхода CategoryIndex
+
+    python benchmarks/bench_category_index.py --categories 2000 --products 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.category_index import CategoryIndex
+from core.domain import Category, Product
+from core.recursion import collect_products_recursive, flatten_categories
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def synthetic_tree(n_categories: int, branching: int) -> tuple:
+    """Сбалансированное дерево: родитель категории i — (i - 1) // branching"""
+    return tuple(
+        Category(
+            id=f"c{i:05d}",
+            name=f"Category {i}",
+            parent_id=None if i == 0 else f"c{(i - 1) // branching:05d}",
+        )
+        for i in range(n_categories)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--categories", type=int, default=2_000)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--branching", type=int, default=4)
+    args = parser.parse_args()
+
+    categories = synthetic_tree(args.categories, args.branching)
+    rng = random.Random(1)
+    products = tuple(
+        Product(
+            id=f"p{i:07d}",
+            title=f"Product {i}",
+            price=rng.randint(1_000, 200_000),
+            category_id=categories[rng.randrange(args.categories)].id,
+            tags=(),
+        )
+        for i in range(args.products)
+    )
+
+    build = timed(lambda: CategoryIndex(categories, products)._product_layout)
+    index = CategoryIndex(categories, products)
+    _ = index._product_layout
+    print(
+        f"{args.categories} категорий, {args.products} товаров; "
+        f"построение индекса: {build * 1e3:.1f} ms"
+    )
+
+    # Корень, внутренний узел и лист
+    for root in (categories[0].id, categories[5].id, categories[-1].id):
+        expected = collect_products_recursive(categories, products, root)
+        assert index.products_under(root) == expected
+        assert set(index.subtree(root)) == set(flatten_categories(categories, root))
+        cases = (
+            (
+                "get_category_tree",
+                lambda root=root: flatten_categories(categories, root),
+                lambda root=root: index.subtree(root),
+            ),
+            (
+                "products_by_category",
+                lambda root=root: collect_products_recursive(
+                    categories, products, root
+                ),
+                lambda root=root: index.products_under(root),
+            ),
+        )
+        for name, before_fn, after_fn in cases:
+            before, after = timed(before_fn), timed(after_fn, repeat=20)
+            print(
+                f"{root} ({len(expected):6d} товаров) {name:<21}"
+                f" рекурсия {before * 1e3:9.2f} ms   индекс {after * 1e3:8.3f} ms"
+                f"   x{before / after:.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Рестарт приложения: comprehensive_report и run_async_pipeline считаются
+заново против попадания в DiskReportCache (ключ — отпечаток seed-файла)
+
+    python benchmarks/bench_disk_cache.py --orders 300000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import write_seed
+from core.async_ops import run_async_pipeline
+from core.disk_cache import DiskReportCache
+from core.seed_dataset import SeedDataset
+from core.transforms import load_seed
+from Analytics_Service.report import comprehensive_report
+
+REPORTS = (comprehensive_report, run_async_pipeline)
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=300_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "seed.json")
+        snap_path = os.path.join(tmp, "seed.snapshot")
+        cache_path = os.path.join(tmp, "reports.sqlite")
+        write_seed(json_path, args.orders, n_products=5_000)
+        load_seed(json_path, snapshot=snap_path)  # тёплый снимок, как в приложении
+        print(f"{args.orders} заказов")
+
+        def restart(cache_path=None):
+            """Новый SeedDataset (и кэш) — как после рестарта процесса"""
+            data = SeedDataset(json_path, snapshot=snap_path)
+            sections = (data.orders, data.products, data.users)
+            if cache_path is None:
+                return [report(*sections) for report in REPORTS]
+            cache = DiskReportCache(cache_path)
+            result = [cache.get(report, *sections) for report in REPORTS]
+            cache.close()
+            return result
+
+        data = SeedDataset(json_path, snapshot=snap_path)
+        load = timed(lambda: (data.orders, data.products, data.users))
+        print(f"загрузка секций из снимка {load * 1e3:9.1f} ms")
+
+        cold = timed(restart)
+        print(f"без кэша                  {cold * 1e3:9.1f} ms")
+        first = timed(lambda: restart(cache_path))
+        print(f"промах + запись на диск   {first * 1e3:9.1f} ms")
+        warm = timed(lambda: restart(cache_path), repeat=3)
+        print(f"тёплый рестарт, попадания {warm * 1e3:9.1f} ms")
+
+        cache = DiskReportCache(cache_path)
+        sections = (data.orders, data.products, data.users)
+        for report in REPORTS:
+            hit = timed(lambda report=report: cache.get(report, *sections), repeat=20)
+            print(f"  {report.__name__:<24} попадание {hit * 1e3:7.2f} ms")
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Байт на Order / Product: прежние датаклассы (с __dict__, без интернирования)
+против текущих (slots + интернированные строки)
+
+    python benchmarks/bench_domain_memory.py --orders 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.transforms import _to_order, _to_product
+
+
+@dataclass(frozen=True)
+class DictOrder:
+    id: str
+    user_id: str
+    items: Tuple[Tuple[str, int], ...]
+    total: int
+    ts: str
+    status: str
+
+
+@dataclass(frozen=True)
+class DictProduct:
+    id: str
+    title: str
+    price: int
+    category_id: str
+    tags: Tuple[str, ...]
+
+
+def old_order(o: dict) -> DictOrder:
+    return DictOrder(
+        id=str(o["id"]),
+        user_id=str(o["user_id"]),
+        items=tuple((str(pid), int(qty)) for pid, qty in o["items"]),
+        total=int(o["total"]),
+        ts=str(o["ts"]),
+        status=str(o["status"]),
+    )
+
+
+def old_product(p: dict) -> DictProduct:
+    return DictProduct(**{**p, "tags": tuple(p["tags"])})
+
+
+def measure(convert, records) -> float:
+    """
+    Байт на объект с учётом строк: записи разбираются из JSON внутри замера,
+    как при загрузке seed, а сырые dict после конвертации освобождаются
+    """
+    lines = [json.dumps(r) for r in records]
+    tracemalloc.start()
+    objects = [convert(json.loads(line)) for line in lines]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(objects) == len(lines)
+    return size / len(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    args = parser.parse_args()
+
+    orders = list(iter_synthetic_orders(args.orders))
+    products = synthetic_products(args.products)
+
+    for label, old, new, records in (
+        ("Order", old_order, _to_order, orders),
+        ("Product", old_product, _to_product, products),
+    ):
+        before, after = measure(old, records), measure(new, records)
+        print(
+            f"{label:<8} до: {before:6.0f} B  после: {after:6.0f} B  "
+            f"экономия {100 * (1 - after / before):.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
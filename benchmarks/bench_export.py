@@ -0,0 +1,104 @@
+"""
+Экспорт LTV по пользователям: пропускная способность и пиковая память
+  ad-hoc    — список словарей + json.dump / csv целиком (как в старых скриптах)
+  streaming — export_report по готовому dict построчно
+  sql       — курсор SqliteStore -> export_table (память не зависит от числа строк)
+
+Пик памяти — tracemalloc (только Python-аллокации, кэш страниц SQLite не входит)
+
+    python benchmarks/bench_export.py --users 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.storage import SqliteStore
+from Analytics_Service import sql_report
+from Analytics_Service.export import ReportTable, export_report, export_table
+
+COLUMNS = ("user_id", "total_spent")
+
+
+def adhoc_export(ltv: dict, path: str) -> None:
+    rows = [{"user_id": u, "total_spent": t} for u, t in ltv.items()]
+    if path.endswith(".csv"):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(r) for r in rows) + "\n")
+
+
+def measure(label: str, n_rows: int, fn) -> None:
+    # Время и память — отдельными прогонами: tracemalloc сильно замедляет аллокации
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{label:<28} {elapsed:6.2f} s  {n_rows / elapsed:>10,.0f} строк/с"
+        f"  пик {peak / 2**20:7.1f} МБ"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=300_000)
+    parser.add_argument("--orders-per-user", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteStore(os.path.join(tmp, "shop.db"))
+        with store.conn:
+            store.conn.executemany(
+                "INSERT INTO orders (id, user_id, total, ts, status)"
+                " VALUES (?, ?, ?, ?, 'paid')",
+                (
+                    (o["id"], o["user_id"], o["total"], o["ts"])
+                    for o in iter_synthetic_orders(
+                        args.users * args.orders_per_user, n_users=args.users
+                    )
+                ),
+            )
+        ltv = sql_report.customer_lifetime_value(store)
+        n = len(ltv)
+        print(f"{n} пользователей")
+
+        for ext in ("csv", "jsonl", "csv.gz"):
+            path = os.path.join(tmp, "ltv." + ext)
+            if ext != "csv.gz":
+                measure(f"ad-hoc .{ext}", n, lambda path=path: adhoc_export(ltv, path))
+            measure(
+                f"streaming .{ext}",
+                n,
+                lambda path=path: export_report(ltv, path, COLUMNS),
+            )
+            measure(
+                f"sql cursor .{ext}",
+                n,
+                lambda path=path: export_table(
+                    ReportTable(
+                        COLUMNS, sql_report.iter_customer_lifetime_value(store)
+                    ),
+                    path,
+                ),
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+comprehensive_report: композиция шести отчётов против однопроходного движка
+
+    python benchmarks/bench_fused_report.py --orders 1000000
+
+Композиция на обычном кортеже (reduce с {**acc}) квадратична по числу
+пользователей/товаров, поэтому для неё берётся --tuple-orders заказов
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.transforms import _to_order, _to_product
+from core.dataset import OrderTable
+from Analytics_Service import report
+from Analytics_Service.fused import fused_report
+
+
+def composed(orders, products):
+    """Прежняя реализация comprehensive_report"""
+    return {
+        "sales": report.sales_summary(orders),
+        "bestsellers": report.bestsellers_report(orders, products, k=5),
+        "top_customers": report.top_customers_report(orders, k=5),
+        "retention": report.retention_rate(orders),
+        "hourly_pattern": report.sales_by_hour(orders),
+        "weekday_pattern": report.sales_by_weekday(orders),
+    }
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed:7.3f} s")
+    return result, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--tuple-orders", type=int, default=20_000)
+    args = parser.parse_args()
+
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    orders = tuple(map(_to_order, iter_synthetic_orders(args.orders)))
+    print(f"{len(orders)} заказов")
+
+    small = orders[: args.tuple_orders]
+    expected, slow = timed(
+        f"композиция, tuple[{len(small)}]", lambda: composed(small, products)
+    )
+    result, fast = timed(
+        f"fused, tuple[{len(small)}]", lambda: fused_report(small, products)
+    )
+    assert result == expected
+    print(f"  x{slow / fast:.1f}")
+
+    table = OrderTable(orders)
+    expected, slow = timed(
+        "композиция, OrderTable (колонки строятся)", lambda: composed(table, products)
+    )
+    result, fast = timed("fused, tuple", lambda: fused_report(orders, products))
+    assert result == expected
+    print(f"  x{slow / fast:.1f}")
+
+    warm, slow = timed(
+        "композиция, OrderTable (колонки готовы)", lambda: composed(table, products)
+    )
+    result, fast = timed(
+        "fused, OrderTable (колонки готовы)", lambda: fused_report(table, products)
+    )
+    assert result == warm
+    print(f"  x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Топ-K товаров по потоку: точный dict + сортировка против Space-Saving и
+Count-Min (точность, пропускная способность, число счётчиков)
+Популярность товаров распределена по Зипфу — как у реальных бестселлеров
+
+    python benchmarks/bench_heavy_hitters.py --items 1000000 --products 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.heavy_hitters import CountMinTopK, SpaceSaving
+
+
+def exact_top(stream, k):
+    counts = {}
+    for key, qty in stream:
+        counts[key] = counts.get(key, 0) + qty
+    top = sorted(counts, key=counts.get, reverse=True)[:k]
+    return [(key, counts[key]) for key in top], counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    weights = [1 / (i + 1) for i in range(args.products)]
+    ids = rng.choices(range(args.products), weights=weights, k=args.items)
+    stream = [(f"p{i:06d}", rng.randint(1, 5)) for i in ids]
+
+    start = time.perf_counter()
+    exact, counts = exact_top(stream, args.k)
+    base = time.perf_counter() - start
+    exact_ids = {key for key, _ in exact}
+    print(f"{args.items} позиций, {len(counts)} различных товаров, k={args.k}")
+    print(f"{'точно (dict + sort)':<28}{base:7.2f} s  счётчиков {len(counts):>8}")
+
+    variants = {
+        "space-saving eps=0.01": lambda: SpaceSaving.from_error(0.01),
+        "space-saving eps=0.001": lambda: SpaceSaving.from_error(0.001),
+        "count-min eps=0.001": lambda: CountMinTopK.from_error(args.k, 0.001),
+    }
+    for label, make in variants.items():
+        sketch = make()
+        start = time.perf_counter()
+        sketch.update_many(stream)
+        top = sketch.top(args.k)
+        elapsed = time.perf_counter() - start
+        recall = len(exact_ids & {row[0] for row in top}) / args.k
+        rel_error = max(abs(row[1] - counts[row[0]]) / counts[row[0]] for row in top)
+        size = (
+            len(sketch.counts)
+            if isinstance(sketch, SpaceSaving)
+            else sketch.sketch.width * sketch.sketch.depth
+        )
+        print(
+            f"{label:<28}{elapsed:7.2f} s  счётчиков {size:>8}"
+            f"  recall@{args.k} {recall:.2f}  макс. отн. ошибка {rel_error:.4f}"
+            f"  граница {sketch.max_error:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
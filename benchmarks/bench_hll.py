@@ -0,0 +1,71 @@
+"""
+DAU / WAU / MAU: точные множества user_id против HyperLogLog по дням
+(точность, время, память на все корзины)
+
+    python benchmarks/bench_hll.py --orders 1000000 --users 300000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.transforms import _to_order, _to_product
+from core.hll import ActiveBuyers, WINDOWS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=300_000)
+    parser.add_argument("--precision", type=int, default=12)
+    args = parser.parse_args()
+
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    orders = tuple(
+        map(_to_order, iter_synthetic_orders(args.orders, n_users=args.users))
+    )
+
+    start = time.perf_counter()
+    exact_days = {}
+    for o in orders:
+        if o.status == "paid":
+            exact_days.setdefault(o.ts[:10], set()).add(o.user_id)
+    exact_build = time.perf_counter() - start
+    day = max(exact_days)
+    days = sorted(exact_days)
+    exact_bytes = sum(sys.getsizeof(s) for s in exact_days.values())
+
+    start = time.perf_counter()
+    buyers = ActiveBuyers(products, args.precision).add_orders(orders)
+    hll_build = time.perf_counter() - start
+    n_sketches = len(buyers.days) + len(buyers.category_days)
+    sketch_bytes = n_sketches * (1 << args.precision)
+
+    print(f"{len(orders)} заказов, {args.users} пользователей, {len(days)} дней")
+    print(
+        f"точные множества по дням: {exact_build:.2f} s, {exact_bytes / 2**20:.1f} МБ"
+    )
+    print(
+        f"HLL (день + день x категория, {n_sketches} скетчей):"
+        f" {hll_build:.2f} s, {sketch_bytes / 2**20:.1f} МБ"
+    )
+    for name, window in WINDOWS.items():
+        start = time.perf_counter()
+        exact = len(set().union(*(exact_days[d] for d in days[-window:])))
+        exact_time = time.perf_counter() - start
+        start = time.perf_counter()
+        approx = buyers.active(day, window)
+        approx_time = time.perf_counter() - start
+        print(
+            f"{name}: точно {exact:>7} ({exact_time * 1e3:6.1f} мс)"
+            f"  HLL {approx:>7} ({approx_time * 1e3:6.1f} мс)"
+            f"  ошибка {abs(approx - exact) / exact:.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Живой поток заказов: пакетный пересчёт sales_summary / LTV / retention /
+топа покупателей на каждое событие против инкрементального ReportState
+
+    python benchmarks/bench_incremental.py --orders 1000000 --events 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.transforms import _to_order
+from Analytics_Service import report
+from Analytics_Service.incremental import ReportState
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def batch_reports(orders) -> tuple:
+    return (
+        report.sales_summary(orders),
+        report.customer_lifetime_value(orders),
+        report.retention_rate(orders),
+        report.top_customers_report(orders, 10),
+    )
+
+
+def state_reports(state: ReportState) -> tuple:
+    return (
+        state.sales_summary(),
+        state.customer_lifetime_value(),
+        state.retention_rate(),
+        state.top_customers_report(10),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=1_000)
+    args = parser.parse_args()
+
+    history = tuple(map(_to_order, iter_synthetic_orders(args.orders)))
+    new = tuple(map(_to_order, iter_synthetic_orders(args.events, start=args.orders)))
+    rng = random.Random(5)
+    refunds = [o.id for o in rng.sample(history, args.events) if o.status == "paid"]
+
+    state = ReportState()
+    build = timed(lambda: state.add_orders(history))
+    print(f"{args.orders} заказов; начальное состояние: {build:.2f} s")
+
+    batch = timed(lambda: batch_reports(history))
+    print(f"пакетный пересчёт на одно событие: {batch * 1e3:9.1f} ms")
+
+    def apply_events() -> None:
+        for order in new:
+            state.add_order(order)
+            state.sales_summary(), state.retention_rate()
+            state.top_customers_report(10)
+        for order_id in refunds:
+            state.change_status(order_id, "refunded")
+            state.sales_summary(), state.retention_rate()
+            state.top_customers_report(10)
+
+    events = len(new) + len(refunds)
+    elapsed = timed(apply_events)
+    print(
+        f"ReportState: {events} событий (заказы + возвраты) с отчётами: "
+        f"{elapsed / events * 1e6:.1f} µs на событие"
+    )
+    ltv = timed(state.customer_lifetime_value)
+    print(f"полный LTV из состояния (вывод всех пользователей): {ltv * 1e3:.1f} ms")
+
+    replaced = {o.id: o for o in history + new}
+    for order_id in refunds:
+        o = replaced[order_id]
+        replaced[order_id] = o.__class__(
+            o.id, o.user_id, o.items, o.total, o.ts, "refunded"
+        )
+    assert state_reports(state) == batch_reports(tuple(replaced.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Пропускная способность загрузки шардов JSONL в зависимости от числа процессов
+
+    python benchmarks/bench_ingest.py --orders 2000000 --shards 60
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.ingest import load_order_shards
+
+
+def write_shards(directory: str, n_orders: int, n_shards: int) -> None:
+    per_shard = -(-n_orders // n_shards)
+    for shard in range(n_shards):
+        count = min(per_shard, n_orders - shard * per_shard)
+        path = os.path.join(directory, f"orders-{shard:04d}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for order in iter_synthetic_orders(
+                count, seed=shard, start=shard * per_shard
+            ):
+                f.write(json.dumps(order) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=32)
+    parser.add_argument("--sort", action="store_true")
+    parser.add_argument("--workers", help="список через запятую, например 1,2,4")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = (
+        [int(w) for w in args.workers.split(",")]
+        if args.workers
+        else sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_shards(tmp, args.orders, args.shards)
+        print(f"{args.orders} заказов в {args.shards} шардах, ядер: {cores}")
+
+        base = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            orders = load_order_shards(tmp, workers=workers, sort_by_ts=args.sort)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(
+                f"workers={workers:<3} {elapsed:7.2f} s  "
+                f"{len(orders) / elapsed:>10,.0f} заказов/с  x{base / elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Время до первой отрисовки страниц Overview и Каталог (данные, которые им нужны):
+load_seed целиком против ленивого SeedDataset (из JSON и из mmap-снимка)
+
+    python benchmarks/bench_lazy_dataset.py --orders 500000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import write_seed
+
+MODES = ("load_seed", "SeedDataset", "SeedDataset+snapshot")
+PAGES = ("overview", "catalog")
+
+
+def render(mode: str, page: str, json_path: str, snap_path: str) -> float:
+    """Выполняется в дочернем процессе: холодный старт + данные одной страницы"""
+    from core.transforms import load_seed
+    from core.seed_dataset import SeedDataset
+    from Analytics_Service.report import sales_summary, sales_by_hour
+
+    start = time.perf_counter()
+    if mode == "load_seed":
+        categories, products, users, orders = load_seed(json_path)
+        tuple(map(len, (categories, products, users, orders)))
+        if page == "overview":
+            sales_summary(orders), sales_by_hour(orders)
+        else:
+            sorted({t for p in products for t in p.tags}), users[0]
+    else:
+        snapshot = snap_path if mode.endswith("snapshot") else None
+        data = SeedDataset(json_path, snapshot=snapshot)
+        users = data.users
+        if page == "overview":
+            tuple(map(data.count, ("categories", "products", "users")))
+            sales_summary(data.orders), sales_by_hour(data.orders)
+        else:
+            data.categories, sorted({t for p in data.products for t in p.tags})
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=300_000)
+    parser.add_argument("--child", nargs=4)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(render(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "seed.json")
+        snap_path = os.path.join(tmp, "seed.snapshot")
+        write_seed(json_path, args.orders, n_products=50_000)
+        from core.transforms import load_seed
+
+        load_seed(json_path, snapshot=snap_path)  # тёплый снимок
+        print(f"{args.orders} заказов, 50000 товаров")
+
+        for page in PAGES:
+            for mode in MODES:
+                out = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--child",
+                        mode,
+                        page,
+                        json_path,
+                        snap_path,
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                print(f"{page:<9} {mode:<22} {json.loads(out):7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
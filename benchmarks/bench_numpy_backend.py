@@ -0,0 +1,66 @@
+"""
+Отчёты по OrderTable: бэкенд python (циклы по колонкам) против numpy (bincount)
+Колонки строятся заранее — сравнивается только сама агрегация
+
+    python benchmarks/bench_numpy_backend.py --orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.transforms import _to_order, _to_product
+from core.dataset import OrderTable
+from Analytics_Service import report
+from Analytics_Service.backend import use_backend
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    orders = OrderTable(
+        map(_to_order, iter_synthetic_orders(args.orders, n_users=args.users))
+    )
+    _ = orders.encoded, orders.time_keys
+
+    reports = {
+        "sales_by_period": lambda: report.sales_by_period(
+            orders, "2025-01-01", "2025-06-30"
+        ),
+        "sales_by_hour": lambda: report.sales_by_hour(orders),
+        "sales_by_weekday": lambda: report.sales_by_weekday(orders),
+        "customer_lifetime_value": lambda: report.customer_lifetime_value(orders),
+        "bestsellers_report": lambda: report.bestsellers_report(orders, products),
+        "retention_rate": lambda: report.retention_rate(orders),
+    }
+
+    print(f"{len(orders)} заказов, {args.users} пользователей")
+    print(f"{'':<26}{'python':>10}{'numpy':>10}")
+    for name, fn in reports.items():
+        with use_backend("python"):
+            expected, slow = fn(), best_of(fn)
+        with use_backend("numpy"):
+            result, fast = fn(), best_of(fn)
+        assert result == expected, name
+        print(f"{name:<26}{slow:>9.3f}s{fast:>9.3f}s   x{slow / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Выборка заказов за день / период: полный проход со startswith против
+бинарного поиска по индексу времени OrderService
+
+    python benchmarks/bench_order_index.py --orders 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.transforms import _to_order
+from core.service import OrderService
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--append", type=int, default=10_000)
+    parser.add_argument("--shuffle", action="store_true", help="заказы не по времени")
+    args = parser.parse_args()
+
+    orders = list(map(_to_order, iter_synthetic_orders(args.orders)))
+    if args.shuffle:
+        random.Random(1).shuffle(orders)
+    orders = tuple(orders)
+    service = OrderService(orders)
+    build = timed(lambda: service.orders.time_index)
+    print(f"{args.orders} заказов; построение индекса (один раз): {build:.2f} s")
+
+    day = orders[len(orders) // 2].ts[:10]
+    cases = (
+        (
+            "один день",
+            lambda: tuple(o for o in orders if o.ts.startswith(day)),
+            lambda: service.orders_by_day(day),
+        ),
+        (
+            "март (31 день)",
+            lambda: tuple(
+                o for o in orders if "2024-03-01" <= o.ts[:10] <= "2024-03-31"
+            ),
+            lambda: service.orders_by_period("2024-03-01", "2024-03-31"),
+        ),
+    )
+    for name, scan, indexed in cases:
+        assert scan() == indexed()
+        before, after = timed(scan), timed(indexed, repeat=20)
+        print(
+            f"{name:<16} полный проход {before * 1e3:9.1f} ms"
+            f"   индекс {after * 1e6:9.1f} µs   x{before / after:.0f}"
+        )
+
+    tail = tuple(map(_to_order, iter_synthetic_orders(args.append, start=args.orders)))
+    print(
+        f"append {args.append} заказов с переносом индекса: "
+        f"{timed(lambda: service.append(tail)):.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Журнал заказов: пропускная способность дозаписи и задержка видимости в OrderService
+--base — сколько заказов уже лежит в сервисе до начала дозаписи
+
+    python benchmarks/bench_order_log.py --orders 200000 --batch 500 --base 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.transforms import _to_order
+from core.order_log import OrderLog, OrderLogFollower
+from core.service import OrderService
+from Analytics_Service.report import sales_by_hour
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--base", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    synthetic = tuple(map(_to_order, iter_synthetic_orders(args.base + args.orders)))
+    base, orders = synthetic[: args.base], synthetic[args.base :]
+    batches = [orders[i : i + args.batch] for i in range(0, len(orders), args.batch)]
+    written_at = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "orders.jsonl")
+        svc = OrderService(base)
+        # Колонки построены, как после первых отчётов в приложении
+        _ = svc.orders.encoded, svc.orders.time_keys, svc.orders.time_index
+        total = len(base) + len(orders)
+        follower = OrderLogFollower(path)
+
+        def writer() -> None:
+            with OrderLog(path) as log:
+                for batch in batches:
+                    written_at[batch[-1].id] = time.perf_counter()
+                    log.append(batch)
+
+        start = time.perf_counter()
+        thread = threading.Thread(target=writer)
+        thread.start()
+
+        lags = []
+        append_seconds = 0.0
+        while svc.order_count() < total:
+            new_orders = follower.poll()
+            if new_orders:
+                t = time.perf_counter()
+                svc.append(new_orders, log_offset=follower.offset)
+                now = time.perf_counter()
+                append_seconds += now - t
+                last = new_orders[-1].id
+                if last in written_at:
+                    lags.append(now - written_at[last])
+            else:
+                time.sleep(0.001)
+        thread.join()
+        elapsed = time.perf_counter() - start
+
+        t = time.perf_counter()
+        assert len(svc.orders) == total
+        merge_seconds = time.perf_counter() - t
+        # Первый отчёт по колонкам после слияния (колонки дописаны, не пересобраны)
+        t = time.perf_counter()
+        sales_by_hour(svc.orders)
+        report_seconds = time.perf_counter() - t
+
+    lags.sort()
+    print(f"{len(orders)} заказов за {elapsed:.2f} s: {len(orders) / elapsed:,.0f}/с")
+    print(
+        f"сервис с {len(base)} заказами: append {append_seconds * 1000:.1f} ms, "
+        f"слияние сегментов при чтении {merge_seconds * 1000:.1f} ms, "
+        f"первый sales_by_hour после слияния {report_seconds * 1000:.1f} ms"
+    )
+    if lags:
+        print(
+            f"задержка видимости: медиана {lags[len(lags) // 2] * 1000:.1f} ms, "
+            f"max {lags[-1] * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+comprehensive_analysis_pipeline: корутины в одном процессе против OrderPool
+(ProcessPoolExecutor) с разным числом воркеров
+
+    python benchmarks/bench_parallel_pipeline.py --orders 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from benchmarks.synthetic import synthetic_users
+from core.async_ops import run_async_pipeline
+from core.dataset import OrderTable
+from core.parallel import OrderPool
+from core.transforms import _to_order, _to_product, _to_user
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    orders = OrderTable(map(_to_order, iter_synthetic_orders(args.orders)))
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    users = tuple(map(_to_user, synthetic_users(args.users)))
+    print(f"{args.orders} заказов, {args.users} пользователей, CPU: {os.cpu_count()}")
+
+    # Колонки OrderTable строятся при первом прогоне и дальше переиспользуются
+    expected = run_async_pipeline(orders, products, users)
+    base = timed(
+        lambda: run_async_pipeline(orders, products, users), repeat=args.repeat
+    )
+    print(f"без пула                  {base * 1e3:9.1f} ms")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        pool = OrderPool(orders, workers=workers)
+        assert run_async_pipeline(orders, products, users, pool=pool) == expected
+        startup = time.perf_counter() - start
+        run = timed(
+            lambda pool=pool: run_async_pipeline(orders, products, users, pool=pool),
+            repeat=args.repeat,
+        )
+        pool.shutdown()
+        print(
+            f"пул, {workers:2d} воркер(ов)       {run * 1e3:9.1f} ms"
+            f"  (x{base / run:.2f}; старт пула + первый прогон {startup * 1e3:.0f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
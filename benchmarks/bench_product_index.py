@@ -0,0 +1,67 @@
+"""
+Оформление корзины из 500 позиций против каталога из 1M товаров:
+линейный поиск цены next(...) против ProductIndex
+
+    python benchmarks/bench_product_index.py --products 1000000 --lines 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import synthetic_products
+from core.domain import Cart
+from core.product_index import ProductTable
+from core.transforms import _to_product, checkout
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def linear_total(cart: Cart, products) -> int:
+    """Прежний get_price: next(...) по всему каталогу на каждую позицию"""
+    return sum(
+        qty * next(p.price for p in products if p.id == pid) for pid, qty in cart.items
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--lines", type=int, default=500)
+    args = parser.parse_args()
+
+    plain = tuple(map(_to_product, synthetic_products(args.products)))
+    table = ProductTable(plain)
+    rng = random.Random(3)
+    cart = Cart(
+        id="c1",
+        user_id="u000001",
+        items=tuple((p.id, rng.randint(1, 5)) for p in rng.sample(plain, args.lines)),
+    )
+    ts = "2025-11-25T12:00:00"
+
+    build = timed(lambda: table.index)
+    expected = checkout(cart, ts, table).get_or_else(None).total
+    assert linear_total(cart, plain) == expected
+    print(
+        f"{args.products} товаров, корзина {args.lines} позиций; "
+        f"построение индекса (один раз): {build:.2f} s"
+    )
+    for name, fn in (
+        ("next(...) на позицию", lambda: linear_total(cart, plain)),
+        ("checkout, кортеж", lambda: checkout(cart, ts, plain)),
+        ("checkout, ProductTable", lambda: checkout(cart, ts, table)),
+    ):
+        print(f"{name:<24} {timed(fn) * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Streamlit rerun: пять отчётов страниц Overview / Статистика / Reports без
+кэша против общего ReportCache (попадания, инвалидация по CHECKOUT)
+
+    python benchmarks/bench_report_cache.py --orders 1000000 --reruns 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.dataset import OrderTable
+from core.frp import create_event, create_shop_event_bus, initial_state
+from core.frp import with_report_cache
+from core.product_index import ProductTable
+from core.report_cache import ReportCache
+from core.transforms import _to_order, _to_product
+from Analytics_Service.report import (
+    bestsellers_report,
+    retention_rate,
+    sales_by_hour,
+    sales_summary,
+    top_customers_report,
+)
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def rerun(get, orders, products) -> None:
+    get(sales_summary, orders)
+    get(sales_by_hour, orders)
+    get(retention_rate, orders)
+    get(bestsellers_report, orders, products, k=10, deps=("orders", "products"))
+    get(top_customers_report, orders, k=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    orders = OrderTable(map(_to_order, iter_synthetic_orders(args.orders)))
+    products = ProductTable(map(_to_product, synthetic_products(1_000)))
+    _ = orders.encoded, orders.time_keys  # колонки строятся один раз, как в приложении
+
+    def uncached(report, *a, deps=(), **kw):
+        return report(*a, **kw)
+
+    cache = ReportCache()
+    bus = with_report_cache(create_shop_event_bus(), cache)
+    print(f"{args.orders} заказов, {args.reruns} rerun-ов")
+    print(
+        f"без кэша          {timed(lambda: rerun(uncached, orders, products)) * 1e3:9.1f} ms на rerun"
+    )
+    print(
+        f"промах (первый)   {timed(lambda: rerun(cache.get, orders, products)) * 1e3:9.1f} ms"
+    )
+    hit = timed(lambda: rerun(cache.get, orders, products), repeat=args.reruns)
+    print(f"попадания         {hit * 1e6:9.1f} µs на rerun")
+
+    event = create_event("CHECKOUT", {"order_id": "o", "user_id": "u", "amount": 1})
+    invalidate = timed(lambda: bus.publish(event, initial_state()))
+    print(
+        f"CHECKOUT: инвалидация {invalidate * 1e6:.1f} µs, записей осталось {len(cache)}"
+    )
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
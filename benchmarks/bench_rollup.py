@@ -0,0 +1,79 @@
+"""
+Отчёты по периодам / категориям / сводка: сырые заказы против куба
+(построение куба, ответы из ячеек, инкрементальная дозапись)
+
+    python benchmarks/bench_rollup.py --orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import (
+    iter_synthetic_orders,
+    synthetic_categories,
+    synthetic_products,
+    synthetic_users,
+)
+from core.transforms import _to_category, _to_order, _to_product, _to_user
+from core.rollup import RollupCube
+from core.service import AnalyticsService, CatalogService, OrderService
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    categories = tuple(map(_to_category, synthetic_categories()))
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    users = tuple(map(_to_user, synthetic_users(10_000)))
+    orders = tuple(map(_to_order, iter_synthetic_orders(args.orders)))
+    catalog = CatalogService(categories, products)
+
+    cube, build = timed(lambda: RollupCube.build(orders, products, users))
+    print(f"{len(orders)} заказов -> {len(cube)} ячеек куба, построение {build:.2f} s")
+
+    plain = AnalyticsService(catalog, OrderService(orders))
+    cubed = AnalyticsService(catalog, OrderService(orders, cube=cube))
+    root = categories[0].id
+    queries = {
+        "sales_by_period (квартал)": (
+            lambda: plain.sales_by_period_report("2025-04-01", "2025-06-30"),
+            lambda: cubed.sales_by_period_report("2025-04-01", "2025-06-30"),
+        ),
+        "sales_summary": (
+            plain.sales_summary_report,
+            cubed.sales_summary_report,
+        ),
+        "category_sales_report": (
+            lambda: plain.category_sales_report(root),
+            lambda: cubed.category_sales_report(root),
+        ),
+    }
+    for name, (slow_fn, fast_fn) in queries.items():
+        expected, slow = timed(slow_fn)
+        result, fast = timed(fast_fn)
+        assert result == expected, name
+        print(
+            f"{name:<28} заказы {slow:7.3f} s   куб {fast:7.4f} s   x{slow / fast:.0f}"
+        )
+
+    batch = tuple(
+        map(_to_order, iter_synthetic_orders(1_000, start=args.orders, seed=7))
+    )
+    _, append = timed(lambda: cube.add_orders(batch))
+    print(f"дозапись 1000 заказов в куб: {append * 1e3:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
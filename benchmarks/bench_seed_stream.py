@@ -0,0 +1,74 @@
+"""
+Пиковая память (RSS) и время загрузки seed: load_seed против потокового загрузчика
+
+    python benchmarks/bench_seed_stream.py --orders 500000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import write_seed
+
+LOADERS = ("load_seed", "load_seed_streaming", "iter_orders")
+
+
+def run_loader(name: str, path: str) -> dict:
+    """Выполняется в дочернем процессе, чтобы ru_maxrss относился к одному загрузчику"""
+    from core.transforms import load_seed
+    from core.seed_stream import load_seed_streaming, iter_orders
+
+    start = time.perf_counter()
+    if name == "load_seed":
+        count = len(load_seed(path)[3])
+    elif name == "load_seed_streaming":
+        count = len(load_seed_streaming(path)[3])
+    else:
+        count = sum(1 for _ in iter_orders(path))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "loader": name,
+        "orders": count,
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--child", nargs=2, metavar=("LOADER", "PATH"))
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_loader(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seed.json")
+        write_seed(path, args.orders)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"seed: {args.orders} заказов, {size_mb:.1f} MB")
+
+        for name in LOADERS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", name, path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            print(json.loads(out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Холодный старт: разбор seed.json против загрузки из mmap-снимка
+
+    python benchmarks/bench_snapshot.py --orders 500000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import write_seed
+from core.transforms import load_seed
+from core.snapshot import SeedSnapshot
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "seed.json")
+        snap_path = os.path.join(tmp, "seed.snapshot")
+        write_seed(json_path, args.orders)
+
+        timed("load_seed (json)", lambda: load_seed(json_path))
+        timed("load_seed (пишет снимок)", lambda: load_seed(json_path, snap_path))
+        timed("load_seed (из снимка)", lambda: load_seed(json_path, snap_path))
+
+        snap = timed("SeedSnapshot: открыть mmap", lambda: SeedSnapshot(snap_path))
+        timed("sum(order_total) по колонке", lambda: sum(snap.column("order_total")))
+        snap.close()
+
+        print(
+            f"размер: json {os.path.getsize(json_path) / 2**20:.1f} MB, "
+            f"снимок {os.path.getsize(snap_path) / 2**20:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
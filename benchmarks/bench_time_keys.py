@@ -0,0 +1,54 @@
+"""
+Временные отчёты: разбор ts на каждом вызове против готовых колонок TimeKeys
+
+    python benchmarks/bench_time_keys.py --orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders
+from core.transforms import _to_order
+from core.dataset import OrderTable
+from core.lazy import iter_orders_by_day
+from Analytics_Service.report import sales_by_hour, sales_by_weekday, sales_by_period
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=500_000)
+    args = parser.parse_args()
+
+    plain = tuple(map(_to_order, iter_synthetic_orders(args.orders)))
+    table = OrderTable(plain)
+    build = timed(lambda: (table.encoded, table.time_keys))
+    print(f"{args.orders} заказов; построение колонок (один раз): {build:.2f} s")
+
+    day = plain[len(plain) // 2].ts[:10]
+    cases = (
+        ("sales_by_hour", lambda o: sales_by_hour(o)),
+        ("sales_by_weekday", lambda o: sales_by_weekday(o)),
+        ("sales_by_period", lambda o: sales_by_period(o, "2024-03-01", "2024-06-30")),
+        ("orders_by_day", lambda o: tuple(iter_orders_by_day(o, day))),
+    )
+    for name, fn in cases:
+        before = timed(lambda fn=fn: fn(plain))
+        after = timed(lambda fn=fn: fn(table))
+        print(
+            f"{name:<18} ts-строки {before:7.3f} s   колонки {after:7.3f} s"
+            f"   x{before / after:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Свёртки report.py на обычном кортеже: время на заказ от 125k до 1M заказов
+(транзиентный аккумулятор) и копирующая {**acc}-свёртка для сравнения
+
+    python benchmarks/bench_transient.py --max-orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import reduce
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.transforms import _to_order, _to_product
+from Analytics_Service import report
+
+
+def copying_ltv(orders):
+    """Прежняя реализация customer_lifetime_value для обычного кортежа"""
+
+    def step(acc, o):
+        if o.status != "paid":
+            return acc
+        return {**acc, o.user_id: acc.get(o.user_id, 0) + o.total}
+
+    return reduce(step, orders, {})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-orders", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+
+    products = tuple(map(_to_product, synthetic_products(1_000)))
+    orders = tuple(
+        map(_to_order, iter_synthetic_orders(args.max_orders, n_users=args.users))
+    )
+    folds = {
+        "customer_lifetime_value": report.customer_lifetime_value,
+        "bestsellers_report": lambda o: report.bestsellers_report(o, products),
+        "sales_by_hour": report.sales_by_hour,
+        "sales_by_weekday": report.sales_by_weekday,
+    }
+
+    n = args.max_orders // 8
+    sizes = []
+    while n <= args.max_orders:
+        sizes.append(n)
+        n *= 2
+
+    print(f"{'':<26}" + "".join(f"{n:>12}" for n in sizes) + "   (нс на заказ)")
+    for name, fn in folds.items():
+        row = []
+        for n in sizes:
+            start = time.perf_counter()
+            fn(orders[:n])
+            row.append((time.perf_counter() - start) / n * 1e9)
+        print(f"{name:<26}" + "".join(f"{ns:>12.0f}" for ns in row))
+
+    # Копирующая свёртка квадратична — только малые размеры
+    row = []
+    for n in (2_000, 4_000, 8_000):
+        start = time.perf_counter()
+        copying_ltv(orders[:n])
+        row.append(f"{n}: {(time.perf_counter() - start) / n * 1e9:.0f}")
+    print("{**acc} ltv, нс на заказ   " + "   ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Попадание в кэш top_products: lru_cache (хеш всех заказов и товаров на
+каждый вызов) против versioned_cache (ключ — версии OrderTable/ProductTable)
+
+    python benchmarks/bench_versioned_cache.py --orders 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import lru_cache
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from core.dataset import OrderTable
+from core.product_index import ProductTable
+from core.transforms import _to_order, _to_product, top_products
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    args = parser.parse_args()
+
+    plain_orders = tuple(map(_to_order, iter_synthetic_orders(args.orders)))
+    plain_products = tuple(map(_to_product, synthetic_products(args.products)))
+    orders, products = OrderTable(plain_orders), ProductTable(plain_products)
+
+    old = lru_cache(top_products.__wrapped__)
+    miss = timed(lambda: old(plain_orders, plain_products, 10))
+    old_hit = timed(lambda: old(plain_orders, plain_products, 10), repeat=5)
+
+    top_products.cache_clear()
+    new_miss = timed(lambda: top_products(orders, products, 10))
+    new_hit = timed(lambda: top_products(orders, products, 10), repeat=100_000)
+    assert top_products(orders, products, 10) == old(plain_orders, plain_products, 10)
+
+    print(f"{args.orders} заказов, {args.products} товаров")
+    print(f"lru_cache        промах {miss:7.2f} s   попадание {old_hit * 1e3:9.2f} ms")
+    print(
+        f"versioned_cache  промах {new_miss:7.2f} s   попадание {new_hit * 1e6:9.2f} µs"
+        f"   x{old_hit / new_hit:.0f}"
+    )
+    print(f"fingerprint (один раз): {timed(lambda: orders.fingerprint):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
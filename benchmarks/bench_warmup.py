@@ -0,0 +1,87 @@
+"""
+Первое открытие страниц после старта: отчёты по запросу против фонового
+прогрева (Warmup), пользователь приходит через --delay секунд после старта
+
+    python benchmarks/bench_warmup.py --orders 300000 --delay 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import iter_synthetic_orders, synthetic_products
+from benchmarks.synthetic import synthetic_users
+from core.async_ops import run_async_pipeline
+from core.dataset import OrderTable
+from core.disk_cache import DiskReportCache
+from core.product_index import ProductTable
+from core.report_cache import ReportCache
+from core.transforms import _to_order, _to_product, _to_user
+from core.versioning import VersionedTuple
+from core.warmup import Warmup
+from Analytics_Service.report import sales_summary, top_customers_report
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def make_tasks(orders, products, users, tmp):
+    # Своя копия таблицы: колонки и отпечаток каждый режим строит сам
+    orders = OrderTable(tuple(orders))
+    reports = ReportCache()
+    disk = DiskReportCache(os.path.join(tmp, f"reports-{time.time_ns()}.sqlite"))
+    return (
+        ("sales_summary", lambda: reports.get(sales_summary, orders)),
+        (
+            "top_customers_report",
+            lambda: reports.get(top_customers_report, orders, k=10),
+        ),
+        (
+            "async_pipeline",
+            lambda: disk.get(run_async_pipeline, orders, products, users),
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=300_000)
+    parser.add_argument("--delay", type=float, default=5.0)
+    args = parser.parse_args()
+
+    orders = OrderTable(map(_to_order, iter_synthetic_orders(args.orders)))
+    products = ProductTable(map(_to_product, synthetic_products(1_000)))
+    users = VersionedTuple(map(_to_user, synthetic_users(10_000)))
+    print(f"{args.orders} заказов, пользователь приходит через {args.delay:.1f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names = [name for name, _ in make_tasks(orders, products, users, tmp)]
+
+        on_demand = Warmup(make_tasks(orders, products, users, tmp))
+        for name in names:
+            page = timed(lambda name=name: on_demand.get(name))
+            print(f"по запросу   {name:<22} {page * 1e3:9.1f} ms")
+
+        warmup = Warmup(make_tasks(orders, products, users, tmp)).start()
+        time.sleep(args.delay)
+        print(f"прогрев за {args.delay:.1f} s: {warmup.progress()[0]}/{len(names)}")
+        for name in names:
+            page = timed(lambda name=name: warmup.get(name))
+            print(f"с прогревом  {name:<22} {page * 1e3:9.1f} ms")
+        warmup.wait()
+        for name, info in warmup.stats().items():
+            print(
+                f"  фон: {name:<22} {info['seconds'] * 1e3:9.1f} ms ({info['state']})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Iterator
+
+# Генератор синтетических данных для бенчмарков (формат как в data/seed.json)
+
+STATUSES = ("paid", "paid", "paid", "paid", "refunded", "cancelled")
+START = datetime(2024, 1, 1)
+
+
+def synthetic_categories(n_categories: int = 12) -> list:
+    return [
+        {
+            "id": f"c{i:03d}",
+            "name": f"Category {i}",
+            "parent_id": None if i <= 4 else f"c{(i - 1) // 4:03d}",
+        }
+        for i in range(1, n_categories + 1)
+    ]
+
+
+def synthetic_products(n_products: int, n_categories: int = 12) -> list:
+    rng = random.Random(1)
+    return [
+        {
+            "id": f"p{i:06d}",
+            "title": f"Product {i}",
+            "price": rng.randint(1_000, 200_000),
+            "category_id": f"c{rng.randint(1, n_categories):03d}",
+            "tags": ["electronics", rng.choice(("new", "sale", "limited"))],
+        }
+        for i in range(1, n_products + 1)
+    ]
+
+
+def synthetic_users(n_users: int) -> list:
+    return [
+        {
+            "id": f"u{i:06d}",
+            "name": f"User {i}",
+            "tier": "VIP" if i % 10 == 0 else "regular",
+        }
+        for i in range(1, n_users + 1)
+    ]
+
+
+def iter_synthetic_orders(
+    n_orders: int,
+    n_users: int = 10_000,
+    n_products: int = 1_000,
+    days: int = 365,
+    seed: int = 42,
+    start: int = 0,
+) -> Iterator[dict]:
+    """Лениво генерирует сырые заказы (dict), отсортированные по времени"""
+    rng = random.Random(seed)
+    step = days * 86_400 / max(n_orders, 1)
+    for i in range(start, start + n_orders):
+        items = [
+            [f"p{rng.randint(1, n_products):06d}", rng.randint(1, 5)]
+            for _ in range(rng.randint(1, 4))
+        ]
+        yield {
+            "id": f"o{i:09d}",
+            "user_id": f"u{rng.randint(1, n_users):06d}",
+            "items": items,
+            "total": sum(qty * 10_000 for _, qty in items),
+            "ts": (START + timedelta(seconds=int(i * step))).isoformat(),
+            "status": rng.choice(STATUSES),
+        }
+
+
+def write_seed(
+    path: str,
+    n_orders: int,
+    n_users: int = 10_000,
+    n_products: int = 1_000,
+    n_categories: int = 12,
+) -> None:
+    """Пишет seed.json потоково, не собирая заказы в список"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"categories": ')
+        json.dump(synthetic_categories(n_categories), f)
+        f.write(', "products": ')
+        json.dump(synthetic_products(n_products, n_categories), f)
+        f.write(', "users": ')
+        json.dump(synthetic_users(n_users), f)
+        f.write(', "orders": [\n')
+        for idx, order in enumerate(
+            iter_synthetic_orders(n_orders, n_users, n_products)
+        ):
+            if idx:
+                f.write(",\n")
+            json.dump(order, f)
+        f.write("\n]}\n")
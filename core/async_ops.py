@@ -1,23 +1,44 @@
 import asyncio
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from functools import reduce
 from .domain import Order, Product, User
-
+from .dataset import OrderTable
+from .transient import TransientDict, transient_reduce
+from .product_index import product_index
+from . import parallel
+from .parallel import OrderPool
 
 # ============ Асинхронные агрегации ============
+# pool=OrderPool(orders) — те же корутины и результаты, но агрегации по
+# заказам считаются в процессах пула (см. parallel.py), а не в event loop
 
 
-async def sales_by_day_async(orders: List[Order], days: List[str]) -> Dict[str, int]:
+async def sales_by_day_async(
+    orders: List[Order], days: List[str], pool: Optional[OrderPool] = None
+) -> Dict[str, int]:
     """
     Асинхронно вычисляет продажи по списку дней
     Каждый день обрабатывается параллельно
     """
+    if pool is not None:
+        pool.check(orders)
+        size = -(-len(days) // pool.workers) or 1
+        chunks = [(days[i : i + size],) for i in range(0, len(days), size)]
+        parts = await pool.map(parallel.day_sales, chunks)
+        return dict(pair for part in parts for pair in part)
+
+    index = orders.time_index if isinstance(orders, OrderTable) else None
 
     async def calculate_day_sales(day: str) -> Tuple[str, int]:
         """Вычисляет продажи за один день"""
         await asyncio.sleep(0.01)
 
-        day_orders = [o for o in orders if o.ts.startswith(day) and o.status == "paid"]
+        if index is not None:
+            day_orders = [o for o in index.select(orders, day) if o.status == "paid"]
+        else:
+            day_orders = [
+                o for o in orders if o.ts.startswith(day) and o.status == "paid"
+            ]
         total = reduce(lambda acc, o: acc + o.total, day_orders, 0)
         return (day, total)
 
@@ -29,15 +50,28 @@ async def sales_by_day_async(orders: List[Order], days: List[str]) -> Dict[str,
 
 
 async def sales_by_user_async(
-    orders: List[Order], user_ids: List[str]
+    orders: List[Order], user_ids: List[str], pool: Optional[OrderPool] = None
 ) -> Dict[str, int]:
     """
     Асинхронно вычисляет продажи по списку пользователей
     """
+    if pool is not None:
+        pool.check(orders)
+        parts = await pool.map(parallel.user_stats, pool.ranges())
+        user_totals = parallel.merge_counts([totals for _, totals in parts])
+        return {uid: user_totals.get(uid, 0) for uid in user_ids}
+
+    # OrderTable: суммы по всем пользователям считаются один раз по колонкам
+    user_totals = (
+        orders.encoded.sum_by_user("paid") if isinstance(orders, OrderTable) else None
+    )
 
     async def calculate_user_sales(user_id: str) -> Tuple[str, int]:
         await asyncio.sleep(0.01)
 
+        if user_totals is not None:
+            return (user_id, user_totals.get(user_id, 0))
+
         user_orders = [o for o in orders if o.user_id == user_id and o.status == "paid"]
         total = reduce(lambda acc, o: acc + o.total, user_orders, 0)
         return (user_id, total)
@@ -49,31 +83,42 @@ async def sales_by_user_async(
 
 
 async def product_performance_async(
-    orders: List[Order], products: List[Product]
+    orders: List[Order], products: List[Product], pool: Optional[OrderPool] = None
 ) -> List[Dict]:
     """
     Асинхронно анализирует производительность каждого товара
     ИСПРАВЛЕНО: используем reduce вместо мутабельных переменных
     """
-
-    async def analyze_product(product: Product) -> Dict:
-        await asyncio.sleep(0.01)
-
-        # Функция для агрегации продаж через reduce
-        def accumulate_sales(acc: Tuple[int, int], order: Order) -> Tuple[int, int]:
+    # Количество по товарам за один проход по заказам (первая позиция товара
+    # в заказе): части заказов в пуле, колонки OrderTable или свёртка с
+    # поиском по индексу каталога
+    if pool is not None:
+        pool.check(orders)
+        ids = frozenset(p.id for p in products)
+        parts = await pool.map(
+            parallel.product_qty, [(lo, hi, ids) for lo, hi in pool.ranges()]
+        )
+        product_qty = parallel.merge_counts(parts)
+    elif isinstance(orders, OrderTable):
+        product_qty = orders.encoded.qty_by_product("paid", first_only=True)
+    else:
+        index = product_index(products)
+
+        def accumulate_sales(acc: TransientDict, order: Order) -> TransientDict:
             if order.status != "paid":
                 return acc
-
-            qty_sold, revenue = acc
-
-            # Ищем товар в заказе
-            item = next((item for item in order.items if item[0] == product.id), None)
-            if item:
-                pid, qty = item
-                return (qty_sold + qty, revenue + product.price * qty)
+            seen = set()
+            for pid, qty in order.items:
+                if pid in index and pid not in seen:
+                    seen.add(pid)
+                    acc.add(pid, qty)
             return acc
 
-        qty_sold, revenue = reduce(accumulate_sales, orders, (0, 0))
+        product_qty = transient_reduce(accumulate_sales, orders)
+
+    def analyze_product(product: Product) -> Dict:
+        qty_sold = product_qty.get(product.id, 0)
+        revenue = product.price * qty_sold
 
         return {
             "product_id": product.id,
@@ -84,27 +129,48 @@ async def product_performance_async(
             "roi": revenue / product.price if product.price > 0 else 0,
         }
 
-    tasks = [analyze_product(p) for p in products]
-    results = await asyncio.gather(*tasks)
+    async def analyze_product_async(product: Product) -> Dict:
+        await asyncio.sleep(0.01)
+        return analyze_product(product)
+
+    if pool is not None:
+        results = list(map(analyze_product, products))
+    else:
+        tasks = [analyze_product_async(p) for p in products]
+        results = await asyncio.gather(*tasks)
 
     # Сортируем по выручке
     return sorted(results, key=lambda x: x["revenue"], reverse=True)
 
 
 async def customer_segmentation_async(
-    orders: List[Order], users: List[User]
+    orders: List[Order], users: List[User], pool: Optional[OrderPool] = None
 ) -> Dict[str, List[str]]:
     """
     Асинхронная сегментация клиентов по поведению
     VIP, Regular, One-time
     """
-
-    async def segment_user(user: User) -> Tuple[str, str]:
-        await asyncio.sleep(0.01)
-
-        user_orders = [o for o in orders if o.user_id == user.id and o.status == "paid"]
-        order_count = len(user_orders)
-        total_spent = reduce(lambda acc, o: acc + o.total, user_orders, 0)
+    if pool is not None:
+        pool.check(orders)
+        parts = await pool.map(parallel.user_stats, pool.ranges())
+        user_counts = parallel.merge_counts([counts for counts, _ in parts])
+        user_totals = parallel.merge_counts([totals for _, totals in parts])
+    elif isinstance(orders, OrderTable):
+        user_totals = orders.encoded.sum_by_user("paid")
+        user_counts = orders.encoded.count_by_user("paid")
+    else:
+        user_counts = user_totals = None
+
+    def segment_user(user: User) -> Tuple[str, str]:
+        if user_counts is not None:
+            order_count = user_counts.get(user.id, 0)
+            total_spent = user_totals.get(user.id, 0)
+        else:
+            user_orders = [
+                o for o in orders if o.user_id == user.id and o.status == "paid"
+            ]
+            order_count = len(user_orders)
+            total_spent = reduce(lambda acc, o: acc + o.total, user_orders, 0)
 
         # Логика сегментации
         if order_count == 0:
@@ -118,28 +184,48 @@ async def customer_segmentation_async(
 
         return (segment, user.id)
 
-    tasks = [segment_user(u) for u in users]
-    results = await asyncio.gather(*tasks)
+    async def segment_user_async(user: User) -> Tuple[str, str]:
+        await asyncio.sleep(0.01)
+        return segment_user(user)
+
+    if pool is not None:
+        results = list(map(segment_user, users))
+    else:
+        tasks = [segment_user_async(u) for u in users]
+        results = await asyncio.gather(*tasks)
 
-    # Группируем по сегментам (иммутабельно через reduce)
-    def group_by_segment(acc: dict, item: Tuple[str, str]) -> dict:
+    # Группируем по сегментам через reduce (транзиент — O(n))
+    def group_by_segment(acc: TransientDict, item: Tuple[str, str]) -> TransientDict:
         segment, user_id = item
-        current_list = acc.get(segment, [])
-        return {**acc, segment: current_list + [user_id]}
+        return acc.append(segment, user_id)
 
-    return reduce(group_by_segment, results, {})
+    return transient_reduce(group_by_segment, results)
 
 
 # ============ Параллельная обработка пакетами ============
 
 
 async def batch_process_orders(
-    orders: List[Order], batch_size: int = 10
+    orders: List[Order], batch_size: int = 10, pool: Optional[OrderPool] = None
 ) -> Dict[str, any]:
     """
     Обрабатывает заказы пакетами параллельно
     Возвращает агрегированную статистику
     """
+    if pool is not None:
+        # Каждый воркер — свой диапазон целых пакетов
+        pool.check(orders)
+        parts = await pool.map(
+            parallel.batch_stats,
+            [(lo, hi, batch_size) for lo, hi in pool.ranges(batch_size)],
+        )
+        return {
+            "total_orders": sum(r["total"] for r in parts),
+            "paid_orders": sum(r["paid"] for r in parts),
+            "refunded_orders": sum(r["refunded"] for r in parts),
+            "total_revenue": sum(r["revenue"] for r in parts),
+            "batches_processed": sum(r["batches"] for r in parts),
+        }
 
     async def process_batch(batch: List[Order]) -> Dict:
         await asyncio.sleep(0.01)
@@ -175,15 +261,21 @@ async def batch_process_orders(
 
 
 async def comprehensive_analysis_pipeline(
-    orders: List[Order], products: List[Product], users: List[User]
+    orders: List[Order],
+    products: List[Product],
+    users: List[User],
+    pool: Optional[OrderPool] = None,
 ) -> Dict:
     """
     Полный аналитический пайплайн с параллельным выполнением
-    Запускает все анализы одновременно
+    Запускает все анализы одновременно (с pool — в процессах пула)
     """
 
     # Получаем уникальные дни из заказов
-    days = sorted(set(o.ts[:10] for o in orders))[-7:]  # Последние 7 дней
+    if isinstance(orders, OrderTable):
+        days = list(orders.time_keys.day_keys[-7:])  # Уже отсортированы
+    else:
+        days = sorted(set(o.ts[:10] for o in orders))[-7:]  # Последние 7 дней
 
     # Получаем ID пользователей
     user_ids = [u.id for u in users[:20]]  # Топ-20 для примера
@@ -196,11 +288,11 @@ async def comprehensive_analysis_pipeline(
         segments,
         batch_stats,
     ) = await asyncio.gather(
-        sales_by_day_async(orders, days),
-        sales_by_user_async(orders, user_ids),
-        product_performance_async(orders, products[:30]),  # Топ-30 товаров
-        customer_segmentation_async(orders, users),
-        batch_process_orders(orders),
+        sales_by_day_async(orders, days, pool=pool),
+        sales_by_user_async(orders, user_ids, pool=pool),
+        product_performance_async(orders, products[:30], pool=pool),  # Топ-30
+        customer_segmentation_async(orders, users, pool=pool),
+        batch_process_orders(orders, pool=pool),
     )
 
     return {
@@ -222,10 +314,15 @@ def run_async_sales_by_day(orders: List[Order], days: List[str]) -> Dict[str, in
 
 
 def run_async_pipeline(
-    orders: List[Order], products: List[Product], users: List[User]
+    orders: List[Order],
+    products: List[Product],
+    users: List[User],
+    pool: Optional[OrderPool] = None,
 ) -> Dict:
     """Синхронная обёртка для полного пайплайна"""
-    return asyncio.run(comprehensive_analysis_pipeline(orders, products, users))
+    return asyncio.run(
+        comprehensive_analysis_pipeline(orders, products, users, pool=pool)
+    )
 
 
 # ============ Параллельная фильтрация с async ============
@@ -0,0 +1,128 @@
+from array import array
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Tuple
+from .domain import Category, Product
+
+# Индекс дерева категорий на интервалах обхода в глубину (Euler tour).
+#
+#   order       — категории в порядке обхода (pre-order)
+#   entry[id]   — позиция категории в order
+#   exit[id]    — позиция сразу за её поддеревом
+#
+# Поддерево X — непрерывный отрезок order[entry[X]:exit[X]], поэтому
+# «Y лежит под X» — проверка интервала за O(1), а дерево категорий — срез.
+# Товары раскладываются в том же порядке (по категориям обхода, внутри —
+# в порядке каталога): товары поддерева — тоже срез, который лишь
+# сливается обратно в порядок каталога (отсортированные прогоны по
+# категориям, O(r log k) для r товаров в k категориях).
+# Индекс строится за O(категорий + товаров) вместо рекурсивного
+# flatten_categories, который пересматривает все категории на каждом уровне.
+
+
+class CategoryIndex:
+    """Дерево категорий: списки детей, интервалы обхода, товары поддеревьев"""
+
+    def __init__(
+        self, categories: Iterable[Category], products: Iterable[Product] = ()
+    ):
+        self.categories = tuple(categories)
+        self.products = products if isinstance(products, tuple) else tuple(products)
+
+        by_id: Dict[str, Category] = {}
+        for c in self.categories:
+            by_id.setdefault(c.id, c)
+        children: Dict[str, List[Category]] = {}
+        for c in by_id.values():
+            if c.parent_id is not None and c.parent_id in by_id:
+                children.setdefault(c.parent_id, []).append(c)
+        self.by_id = by_id
+        self.children: Dict[str, Tuple[Category, ...]] = {
+            parent: tuple(kids) for parent, kids in children.items()
+        }
+
+        # Обход от корней в порядке каталога; затем — категории, недостижимые
+        # из корней (циклы parent_id), чтобы каждая попала в индекс один раз
+        order: List[Category] = []
+        entry: Dict[str, int] = {}
+        exit_: Dict[str, int] = {}
+        roots = [c for c in by_id.values() if c.parent_id not in by_id]
+        for start in roots + list(by_id.values()):
+            if start.id in entry:
+                continue
+            entry[start.id] = len(order)
+            order.append(start)
+            stack = [(start, iter(self.children.get(start.id, ())))]
+            while stack:
+                node, kids = stack[-1]
+                child = next(kids, None)
+                if child is None:
+                    exit_[node.id] = len(order)
+                    stack.pop()
+                elif child.id not in entry:
+                    entry[child.id] = len(order)
+                    order.append(child)
+                    stack.append((child, iter(self.children.get(child.id, ()))))
+        self.order = tuple(order)
+        self.entry = entry
+        self.exit = exit_
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, category_id: str) -> bool:
+        return category_id in self.entry
+
+    def get(self, category_id: str) -> Optional[Category]:
+        return self.by_id.get(category_id)
+
+    # ============ Поддеревья ============
+
+    def is_descendant(self, category_id: str, root_id: str) -> bool:
+        """Лежит ли category_id в поддереве root_id (включая сам root_id)"""
+        entry = self.entry
+        if category_id not in entry or root_id not in entry:
+            return False
+        return entry[root_id] <= entry[category_id] < self.exit[root_id]
+
+    def subtree(self, root_id: str) -> Tuple[Category, ...]:
+        """Категории поддерева в порядке обхода (root первым); () — нет такой"""
+        if root_id not in self.entry:
+            return ()
+        return self.order[self.entry[root_id] : self.exit[root_id]]
+
+    def subtree_ids(self, root_id: str) -> Tuple[str, ...]:
+        return tuple(c.id for c in self.subtree(root_id))
+
+    # ============ Товары поддеревьев ============
+
+    @cached_property
+    def _product_layout(self) -> Tuple[array, array]:
+        """
+        Позиции товаров в каталоге, сгруппированные по категориям в порядке
+        обхода, и смещения: товары i-й категории обхода — [starts[i], starts[i+1])
+        """
+        by_category: Dict[str, array] = {}
+        for i, p in enumerate(self.products):
+            if p.category_id in self.entry:
+                positions = by_category.get(p.category_id)
+                if positions is None:
+                    positions = by_category[p.category_id] = array("q")
+                positions.append(i)
+        layout, starts = array("q"), array("q")
+        for c in self.order:
+            starts.append(len(layout))
+            layout.extend(by_category.get(c.id, ()))
+        starts.append(len(layout))
+        return layout, starts
+
+    def products_under(self, root_id: str) -> Tuple[Product, ...]:
+        """Товары категории и всех её потомков в порядке каталога"""
+        if root_id not in self.entry:
+            return ()
+        layout, starts = self._product_layout
+        lo, hi = starts[self.entry[root_id]], starts[self.exit[root_id]]
+        positions = layout[lo:hi]
+        if self.exit[root_id] - self.entry[root_id] > 1:
+            positions = sorted(positions)  # слияние прогонов категорий
+        products = self.products
+        return tuple(products[i] for i in positions)
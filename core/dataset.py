@@ -0,0 +1,247 @@
+from array import array
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import compress
+from typing import Dict, Iterable, Optional, Tuple
+from .domain import Order, Product
+from .timekeys import TimeKeys, build_time_keys
+from .order_index import TimeIndex, build_time_index
+from .versioning import VersionedTuple
+
+# Колоночное представление заказов для агрегаций по индексам массивов.
+#
+# Строковые id ("p059", "u009") кодируются плотными целыми 0..n-1 в порядке
+# первого появления, позиции заказов упакованы в CSR:
+#   позиции заказа k — item_product[item_offsets[k] : item_offsets[k + 1]]
+# Суммы по товарам/пользователям считаются в списках по индексу вместо dict.
+
+
+class _Codes:
+    """Словарь кодирования: значение -> плотный индекс"""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        self.values = []
+        for v in values:
+            self(v)
+
+    @classmethod
+    def resume(cls, values: Tuple[str, ...], index: Dict[str, int]) -> "_Codes":
+        """Продолжение готового словаря (коды сохраняются, исходный не меняется)"""
+        codes = cls()
+        codes.index, codes.values = dict(index), list(values)
+        return codes
+
+    def __call__(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+@dataclass(frozen=True)
+class EncodedOrders:
+    """Заказы в виде плотных колонок + CSR-позиций"""
+
+    user_ids: Tuple[str, ...]
+    product_ids: Tuple[str, ...]
+    statuses: Tuple[str, ...]
+    user_index: Dict[str, int]
+    product_index: Dict[str, int]
+    order_user: array  # код пользователя на заказ
+    order_total: array
+    order_status: array  # код статуса на заказ
+    item_offsets: array  # len = число заказов + 1
+    item_product: array  # код товара на позицию
+    item_qty: array
+    item_order: array  # номер заказа на позицию
+
+    def __len__(self) -> int:
+        return len(self.order_total)
+
+    def extended(self, new_orders: Iterable[Order]) -> "EncodedOrders":
+        """Колонки с дописанными заказами: кодируются только новые заказы"""
+        return encode_orders(new_orders, base=self)
+
+    def status_code(self, status: str) -> int:
+        """Код статуса (-1, если такого статуса нет ни у одного заказа)"""
+        return self.statuses.index(status) if status in self.statuses else -1
+
+    # ============ Агрегации по индексам ============
+    # Ключи результата идут в порядке первого появления среди подходящих
+    # заказов — так же, как при построении dict через reduce в report.py
+
+    def sum_by_user(self, status: str = "paid") -> Dict[str, int]:
+        """{user_id: сумма total} по заказам со статусом status"""
+        code = self.status_code(status)
+        sums = [0] * len(self.user_ids)
+        seen = [False] * len(self.user_ids)
+        first = []
+        for u, total, s in zip(self.order_user, self.order_total, self.order_status):
+            if s == code:
+                if not seen[u]:
+                    seen[u] = True
+                    first.append(u)
+                sums[u] += total
+        return {self.user_ids[u]: sums[u] for u in first}
+
+    def count_by_user(self, status: str = "paid") -> Dict[str, int]:
+        """{user_id: число заказов} со статусом status"""
+        code = self.status_code(status)
+        counts = [0] * len(self.user_ids)
+        first = []
+        for u, s in zip(self.order_user, self.order_status):
+            if s == code:
+                if not counts[u]:
+                    first.append(u)
+                counts[u] += 1
+        return {self.user_ids[u]: counts[u] for u in first}
+
+    def qty_by_product(
+        self, status: str = "paid", first_only: bool = False
+    ) -> Dict[str, int]:
+        """
+        {product_id: проданное количество} по заказам со статусом status
+        first_only=True — учитывается только первая позиция товара в заказе
+        """
+        code = self.status_code(status)
+        order_status = self.order_status
+        mask = [order_status[k] == code for k in self.item_order]
+        items = compress(zip(self.item_product, self.item_qty, self.item_order), mask)
+        sums = [0] * len(self.product_ids)
+        seen = [False] * len(self.product_ids)
+        first = []
+        in_order, current = set(), -1
+        for p, q, k in items:
+            if first_only:
+                if k != current:
+                    in_order, current = set(), k
+                if p in in_order:
+                    continue
+                in_order.add(p)
+            if not seen[p]:
+                seen[p] = True
+                first.append(p)
+            sums[p] += q
+        return {self.product_ids[p]: sums[p] for p in first}
+
+    def product_categories(
+        self, products: Iterable[Product]
+    ) -> Tuple[Tuple[str, ...], array]:
+        """
+        Кодирование категорий: (category_ids, код категории на код товара)
+        Товары, которых нет в каталоге, получают код -1
+        """
+        categories = _Codes()
+        by_product = {p.id: categories(p.category_id) for p in products}
+        codes = array("l", (by_product.get(pid, -1) for pid in self.product_ids))
+        return tuple(categories.values), codes
+
+
+def encode_orders(
+    orders: Iterable[Order], base: Optional[EncodedOrders] = None
+) -> EncodedOrders:
+    """
+    Кодирует заказы в колонки за один проход
+    base — уже закодированное начало: его колонки копируются, коды
+    сохраняются, новые значения получают следующие коды (как при полном проходе)
+    """
+    if base is None:
+        users, products, statuses = _Codes(), _Codes(), _Codes()
+        order_user, order_total, order_status = array("l"), array("q"), array("l")
+        item_offsets = array("q", [0])
+        item_product, item_qty, item_order = array("l"), array("q"), array("l")
+    else:
+        users = _Codes.resume(base.user_ids, base.user_index)
+        products = _Codes.resume(base.product_ids, base.product_index)
+        statuses = _Codes.resume(
+            base.statuses, {s: i for i, s in enumerate(base.statuses)}
+        )
+        order_user, order_total, order_status = (
+            array(col.typecode, col)
+            for col in (base.order_user, base.order_total, base.order_status)
+        )
+        item_offsets, item_product, item_qty, item_order = (
+            array(col.typecode, col)
+            for col in (
+                base.item_offsets,
+                base.item_product,
+                base.item_qty,
+                base.item_order,
+            )
+        )
+
+    for k, o in enumerate(orders, len(order_total)):
+        order_user.append(users(o.user_id))
+        order_total.append(o.total)
+        order_status.append(statuses(o.status))
+        for pid, qty in o.items:
+            item_product.append(products(pid))
+            item_qty.append(qty)
+            item_order.append(k)
+        item_offsets.append(len(item_qty))
+
+    return EncodedOrders(
+        user_ids=tuple(users.values),
+        product_ids=tuple(products.values),
+        statuses=tuple(statuses.values),
+        user_index=users.index,
+        product_index=products.index,
+        order_user=order_user,
+        order_total=order_total,
+        order_status=order_status,
+        item_offsets=item_offsets,
+        item_product=item_product,
+        item_qty=item_qty,
+        item_order=item_order,
+    )
+
+
+class OrderTable(VersionedTuple):
+    """
+    Кортеж заказов, который лениво строит и кэширует колоночные представления
+    Везде, где ожидается Tuple[Order, ...], работает как обычный кортеж;
+    отчёты используют колонки, если получили OrderTable
+    """
+
+    def __reduce__(self):
+        # Кэшированные колонки не сериализуются (st.cache_data, пулы процессов)
+        return (self.__class__, (tuple(self),))
+
+    @cached_property
+    def encoded(self) -> EncodedOrders:
+        return encode_orders(self)
+
+    @cached_property
+    def time_keys(self) -> TimeKeys:
+        return build_time_keys(self)
+
+    @cached_property
+    def time_index(self) -> TimeIndex:
+        return build_time_index(self)
+
+    def extend(self, new_orders: Iterable[Order]) -> "OrderTable":
+        """
+        Новая таблица с дописанными заказами. Построенные колонки (encoded,
+        time_keys) дописываются по новым заказам, индекс времени переносится
+        без пересортировки, если новые заказы идут по времени
+        """
+        new_orders = tuple(new_orders)
+        table = OrderTable(self + new_orders)
+        built = vars(self)
+        if "encoded" in built:
+            table.encoded = built["encoded"].extended(new_orders)
+        if "time_keys" in built:
+            table.time_keys = built["time_keys"].extended(new_orders)
+        index = built.get("time_index")
+        if index is not None:
+            index = index.extended(new_orders)
+            if index is not None:
+                table.time_index = index
+        return table
+
+
+def as_order_table(orders: Iterable[Order]) -> OrderTable:
+    """Оборачивает заказы в OrderTable (без копирования, если это уже она)"""
+    return orders if isinstance(orders, OrderTable) else OrderTable(orders)
@@ -0,0 +1,258 @@
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Callable, Iterable, Optional
+from .versioning import VersionedTuple
+
+# Дисковый кэш отчётов (SQLite): результаты переживают рестарт приложения.
+#
+# Ключ — sha256 от (модуль.имя отчёта, версия кода, аргументы), где наборы
+# данных входят отпечатком содержимого (VersionedTuple.fingerprint). Секции
+# SeedDataset получают отпечаток от хеша seed-файла сразу, без обхода
+# заказов, поэтому после рестарта на тех же данных ключи совпадают.
+# Другой seed — другие ключи; старые записи вытесняются по размеру.
+#
+# Остальные аргументы канонизируются (множества и словари — в порядке
+# сортировки, а не хеш-порядке процесса) и сериализуются pickle. Если
+# аргумент не сериализуется (lambda, блокировка), отчёт считается без кэша.
+#
+# Версия кода: хеш байткода самого отчёта (code_version) и общая версия
+# кэша (version=, например source_version() пакета): после деплоя с
+# изменённым отчётом, загрузчиком или вспомогательной функцией ключи
+# меняются, и старые результаты больше не отдаются.
+#
+# База в режиме WAL: несколько процессов читают одновременно, запись
+# ждёт блокировку не дольше busy_timeout. Если записать не удалось (база
+# занята), отчёт просто не кэшируется. Вытеснение — по давности
+# обращения, пока суммарный размер записей больше max_bytes.
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT = 5.0  # секунд
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key      TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_accessed ON reports (accessed);
+"""
+
+
+def _sorted_parts(parts) -> tuple:
+    # Порядок по сериализованному виду: одинаков во всех процессах
+    return tuple(sorted(parts, key=lambda part: pickle.dumps(part, protocol=4)))
+
+
+def persistent_key(value):
+    """Ключ аргумента, стабильный между процессами"""
+    if isinstance(value, VersionedTuple):
+        return ("data", value.fingerprint)
+    fingerprint = getattr(value, "fingerprint", None)
+    if isinstance(fingerprint, str):
+        return ("data", fingerprint)
+    if isinstance(value, (set, frozenset)):
+        return ("set", _sorted_parts(map(persistent_key, value)))
+    if isinstance(value, dict):
+        items = ((persistent_key(k), persistent_key(v)) for k, v in value.items())
+        return ("dict", _sorted_parts(items))
+    if type(value) in (tuple, list):
+        return (type(value).__name__, tuple(map(persistent_key, value)))
+    return value
+
+
+def report_name(report: Callable) -> str:
+    return f"{report.__module__}.{report.__qualname__}"
+
+
+def _code_digest(code, digest) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if inspect.iscode(const):  # вложенные функции и lambda
+            _code_digest(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def code_version(report: Callable) -> str:
+    """Хеш байткода отчёта (для обёрток — исходной функции)"""
+    code = getattr(inspect.unwrap(report), "__code__", None)
+    if code is None:
+        return ""
+    digest = hashlib.sha256()
+    _code_digest(code, digest)
+    return digest.hexdigest()[:16]
+
+
+def source_version(paths: Iterable[str]) -> str:
+    """Хеш исходников (*.py в каталогах paths) — версия кода для деплоя"""
+    digest = hashlib.sha256()
+    for root in paths:
+        for directory, _, files in sorted(os.walk(root)):
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    with open(os.path.join(directory, name), "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class DiskReportCache:
+    """Кэш результатов отчётов в файле SQLite, общий для процессов"""
+
+    def __init__(
+        self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, version: str = ""
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version  # общая версия кода, входит в каждый ключ
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.uncacheable = 0
+
+    def key(self, report: Callable, *args, **kwargs) -> str:
+        """
+        Ключ вызова (sha256)
+        TypeError — аргументы не сериализуются и не могут войти в ключ
+        """
+        try:
+            parts = (
+                report_name(report),
+                self.version,
+                code_version(report),
+                tuple(map(persistent_key, args)),
+            )
+            if kwargs:
+                parts += tuple(
+                    (name, persistent_key(v)) for name, v in sorted(kwargs.items())
+                )
+            blob = pickle.dumps(parts, protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError) as exc:
+            raise TypeError(
+                f"{report_name(report)}: аргументы не входят в ключ: {exc}"
+            ) from exc
+        return hashlib.sha256(blob).hexdigest()
+
+    def lookup(self, key: str):
+        """(True, значение) из кэша или (False, None)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM reports WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            try:
+                self.conn.execute(
+                    "UPDATE reports SET accessed = ? WHERE key = ?", (time.time(), key)
+                )
+            except sqlite3.OperationalError:
+                pass  # база занята записью — давность обновится в другой раз
+        return True, pickle.loads(row[0])
+
+    def store(self, key: str, name: str, value) -> bool:
+        """Сохраняет результат; False — не поместился или база занята"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+        now = time.time()
+        with self._lock:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, name, blob, len(blob), now, now),
+                )
+                self._evict()
+                self.conn.execute("COMMIT")
+            except sqlite3.OperationalError:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                return False
+        return True
+
+    def _evict(self) -> None:
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM reports"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM reports ORDER BY accessed")
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM reports WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def get(self, report: Callable, *args, **kwargs):
+        """Результат report(*args, **kwargs) с диска или вычисленный и сохранённый"""
+        try:
+            key = self.key(report, *args, **kwargs)
+        except TypeError:
+            # Аргументы не сериализуются — считаем без кэша
+            self.uncacheable += 1
+            return report(*args, **kwargs)
+        found, value = self.lookup(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = report(*args, **kwargs)
+        self.store(key, report_name(report), value)
+        return value
+
+    def cached(self, report: Callable) -> Callable:
+        """Декоратор: отчёт через дисковый кэш"""
+
+        @wraps(report)
+        def wrapper(*args, **kwargs):
+            return self.get(report, *args, **kwargs)
+
+        return wrapper
+
+    def invalidate(self, report: Optional[Callable] = None) -> int:
+        """Удаляет записи отчёта (или все записи); возвращает их число"""
+        with self._lock:
+            if report is None:
+                cursor = self.conn.execute("DELETE FROM reports")
+            else:
+                cursor = self.conn.execute(
+                    "DELETE FROM reports WHERE name = ?", (report_name(report),)
+                )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "uncacheable": self.uncacheable,
+        }
+
+    def close(self) -> None:
+        self.conn.close()
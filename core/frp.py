@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Callable, Tuple
 from .domain import Event
+from .heavy_hitters import SpaceSaving
+from .report_cache import EVENT_DEPENDENCIES, ReportCache
 import uuid
 from datetime import datetime
 
@@ -147,6 +149,39 @@ def handle_remove_from_cart(event: Event, state: dict) -> dict:
     }
 
 
+def heavy_hitters_handler(
+    sketch: SpaceSaving,
+    key_field: str = "user_id",
+    weight_field: str = "total",
+    k: int = 10,
+    state_key: str = "top_customers",
+) -> Callable[[Event, dict], dict]:
+    """
+    Обработчик CHECKOUT с приближённым топ-K по потоку событий
+    Скетч живёт вне состояния (ограниченная память); в состояние кладётся
+    неизменяемый снимок топа: ((ключ, оценка, ошибка), ...)
+    """
+
+    def handle(event: Event, state: dict) -> dict:
+        sketch.update(event.payload.get(key_field), event.payload.get(weight_field, 0))
+        return {**state, state_key: tuple(sketch.top(k))}
+
+    return handle
+
+
+def report_cache_handler(cache: ReportCache) -> Callable[[Event, dict], dict]:
+    """
+    Обработчик, сбрасывающий кэшированные отчёты, которые зависят от данных
+    события (EVENT_DEPENDENCIES); состояние не меняется
+    """
+
+    def handle(event: Event, state: dict) -> dict:
+        cache.invalidate_event(event.name)
+        return state
+
+    return handle
+
+
 # ============ Вспомогательные функции ============
 
 
@@ -162,6 +197,21 @@ def create_shop_event_bus() -> EventBus:
     return bus
 
 
+def with_top_customers(bus: EventBus, epsilon: float = 0.001, k: int = 10) -> EventBus:
+    """Шина, которая дополнительно ведёт топ-K покупателей по CHECKOUT"""
+    return bus.subscribe(
+        "CHECKOUT", heavy_hitters_handler(SpaceSaving.from_error(epsilon), k=k)
+    )
+
+
+def with_report_cache(bus: EventBus, cache: ReportCache) -> EventBus:
+    """Шина, которая инвалидирует кэш отчётов по событиям, меняющим данные"""
+    handler = report_cache_handler(cache)
+    for event_name in EVENT_DEPENDENCIES:
+        bus = bus.subscribe(event_name, handler)
+    return bus
+
+
 def initial_state() -> dict:
     """Начальное состояние приложения"""
     return {
@@ -0,0 +1,252 @@
+import heapq
+import math
+import random
+from hashlib import blake2b
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from .domain import Order
+
+# Приближённый топ-K по бесконечному потоку с ограниченной памятью.
+#
+# SpaceSaving (Metwally et al.) — m счётчиков; оценка count завышена не
+# более чем на N / m (N — суммарный вес потока), и любой ключ с весом
+# больше N / m гарантированно присутствует в таблице.
+# CountMinSketch — матрица depth x width; оценка завышена не более чем на
+# epsilon * N с вероятностью 1 - delta. CountMinTopK добавляет к нему
+# кандидатов топ-K (сами ключи скетч не хранит). Ключи хешируются blake2b,
+# а не hash() (тот солится в каждом процессе): скетчи с одним seed,
+# собранные в разных воркерах и запусках, совпадают и сливаются сложением.
+
+
+class SpaceSaving:
+    """Взвешенный Space-Saving с m = capacity счётчиками"""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity должна быть >= 1")
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+        # Куча (count на момент вставки, порядковый номер, ключ): счётчики
+        # только растут, поэтому устаревшая вершина просто перекладывается
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._seq = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> "SpaceSaving":
+        """Таблица, в которой завышение не больше epsilon * N"""
+        return cls(math.ceil(1 / epsilon))
+
+    def update(self, key: Hashable, weight: int = 1) -> None:
+        self.total += weight
+        counts = self.counts
+        if key in counts:
+            counts[key] += weight
+            return
+        if len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0
+            self._push(weight, key)
+            return
+
+        heap = self._heap
+        while True:
+            count, _, victim = heap[0]
+            current = counts[victim]
+            if current == count:
+                break
+            heapq.heapreplace(heap, (current, self._next_seq(), victim))
+
+        # Вытесняем минимальный счётчик: новый ключ наследует его как ошибку
+        del counts[victim]
+        del self.errors[victim]
+        counts[key] = count + weight
+        self.errors[key] = count
+        heapq.heapreplace(heap, (count + weight, self._next_seq(), key))
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _push(self, count: int, key: Hashable) -> None:
+        heapq.heappush(self._heap, (count, self._next_seq(), key))
+
+    def update_many(self, pairs: Iterable[Tuple[Hashable, int]]) -> "SpaceSaving":
+        counts, update = self.counts, self.update
+        for key, weight in pairs:
+            # Попадание в отслеживаемый ключ — самый частый случай, без вызова
+            if key in counts:
+                counts[key] += weight
+                self.total += weight
+            else:
+                update(key, weight)
+        return self
+
+    @property
+    def max_error(self) -> float:
+        """Гарантированная граница завышения: N / m"""
+        return self.total / self.capacity
+
+    def estimate(self, key: Hashable) -> int:
+        """Оценка сверху (0 — ключ не отслеживается, его вес <= N / m)"""
+        return self.counts.get(key, 0)
+
+    def top(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        """
+        Топ-K: (ключ, оценка, ошибка)
+        Истинный вес лежит в [оценка - ошибка, оценка]
+        """
+        ranked = heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+
+def _hash64(key: Hashable) -> int:
+    """Стабильный между процессами 64-битный хеш (строки — по UTF-8)"""
+    data = key.encode() if isinstance(key, str) else repr(key).encode()
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "big")
+
+
+class CountMinSketch:
+    """Count-Min: оценка веса ключа сверху, память width * depth"""
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, width: int, depth: int, seed: int = 0):
+        self.width, self.depth = width, depth
+        self.rows = [[0] * width for _ in range(depth)]
+        rng = random.Random(seed)
+        self._hashes = [
+            (rng.randrange(1, self._PRIME), rng.randrange(self._PRIME))
+            for _ in range(depth)
+        ]
+        self.total = 0
+
+    @classmethod
+    def from_error(
+        cls, epsilon: float, delta: float = 0.01, seed: int = 0
+    ) -> "CountMinSketch":
+        """Завышение <= epsilon * N с вероятностью >= 1 - delta"""
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), seed)
+
+    def _cells(self, key: Hashable):
+        h, p, w = _hash64(key), self._PRIME, self.width
+        return [((a * h + b) % p) % w for a, b in self._hashes]
+
+    def update(self, key: Hashable, weight: int = 1) -> int:
+        """Добавляет вес и возвращает новую оценку ключа"""
+        self.total += weight
+        h, p, w = _hash64(key), self._PRIME, self.width
+        estimates = []
+        for row, (a, b) in zip(self.rows, self._hashes):
+            cell = ((a * h + b) % p) % w
+            row[cell] += weight
+            estimates.append(row[cell])
+        return min(estimates)
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Добавляет скетч другого шарда (те же width, depth и seed)"""
+        if (other.width, other.depth, other._hashes) != (
+            self.width,
+            self.depth,
+            self._hashes,
+        ):
+            raise ValueError("Скетчи с разными параметрами нельзя слить")
+        for row, other_row in zip(self.rows, other.rows):
+            for cell, count in enumerate(other_row):
+                row[cell] += count
+        self.total += other.total
+        return self
+
+    @property
+    def max_error(self) -> float:
+        """Граница завышения epsilon * N (с вероятностью 1 - delta)"""
+        return math.e / self.width * self.total
+
+
+class CountMinTopK:
+    """Count-Min + k кандидатов с наибольшей оценкой"""
+
+    def __init__(self, k: int, sketch: CountMinSketch):
+        self.k = k
+        self.sketch = sketch
+        self.candidates: Dict[Hashable, int] = {}
+        self._floor = 0  # наименьшая оценка среди кандидатов (при полном наборе)
+
+    @classmethod
+    def from_error(
+        cls, k: int, epsilon: float, delta: float = 0.01, seed: int = 0
+    ) -> "CountMinTopK":
+        return cls(k, CountMinSketch.from_error(epsilon, delta, seed))
+
+    def update(self, key: Hashable, weight: int = 1) -> None:
+        estimate = self.sketch.update(key, weight)
+        candidates = self.candidates
+        if key in candidates or len(candidates) < self.k:
+            candidates[key] = estimate
+        elif estimate > self._floor:
+            del candidates[min(candidates, key=candidates.get)]
+            candidates[key] = estimate
+        else:
+            return
+        if len(candidates) == self.k:
+            self._floor = min(candidates.values())
+
+    def update_many(self, pairs: Iterable[Tuple[Hashable, int]]) -> "CountMinTopK":
+        for key, weight in pairs:
+            self.update(key, weight)
+        return self
+
+    @property
+    def max_error(self) -> float:
+        return self.sketch.max_error
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Топ кандидатов: (ключ, оценка сверху по текущему скетчу)"""
+        estimates = [(key, self.sketch.estimate(key)) for key in self.candidates]
+        return sorted(estimates, key=lambda kv: kv[1], reverse=True)[: k or self.k]
+
+
+# ============ Потоки заказов ============
+
+
+def product_qty_stream(
+    orders: Iterable[Order], status: Optional[str] = "paid"
+) -> Iterable[Tuple[str, int]]:
+    """(product_id, qty) по позициям заказов; status=None — все заказы"""
+    for order in orders:
+        if status is None or order.status == status:
+            yield from order.items
+
+
+def user_total_stream(
+    orders: Iterable[Order], status: Optional[str] = "paid"
+) -> Iterable[Tuple[str, int]]:
+    """(user_id, total) по заказам; status=None — все заказы"""
+    for order in orders:
+        if status is None or order.status == status:
+            yield order.user_id, order.total
+
+
+def stream_top_products(
+    orders: Iterable[Order], k: int = 10, epsilon: float = 0.001
+) -> List[Tuple[str, int, int]]:
+    """
+    Приближённые бестселлеры за один проход: (product_id, qty, ошибка)
+    Память — ceil(1 / epsilon) счётчиков при любом числе товаров
+    """
+    sketch = SpaceSaving.from_error(epsilon).update_many(product_qty_stream(orders))
+    return sketch.top(k)
+
+
+def stream_top_customers(
+    orders: Iterable[Order],
+    k: int = 10,
+    epsilon: float = 0.001,
+    status: Optional[str] = "paid",
+) -> List[Tuple[str, int, int]]:
+    """Приближённый топ покупателей по сумме: (user_id, total, ошибка)"""
+    sketch = SpaceSaving.from_error(epsilon)
+    return sketch.update_many(user_total_stream(orders, status)).top(k)
@@ -0,0 +1,92 @@
+import glob
+import gzip
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Optional, Tuple
+from .domain import Order
+from .transforms import _intern, _to_order
+
+# Параллельная загрузка заказов из шардов JSONL (по одному заказу на строку).
+# Каждый шард разбирается в отдельном процессе тем же _to_order, что и в
+# load_seed; результаты склеиваются в Tuple[Order, ...] для OrderService.
+
+
+def _order_ts(order: Order) -> str:
+    return order.ts
+
+
+def _open_shard(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def parse_shard(path: str, sort_by_ts: bool = False) -> Tuple[Order, ...]:
+    """Разбирает один шард JSONL (пустые строки пропускаются)"""
+    with _open_shard(path) as f:
+        orders = tuple(_to_order(json.loads(line)) for line in f if line.strip())
+    return tuple(sorted(orders, key=_order_ts)) if sort_by_ts else orders
+
+
+def _parse_shard_rows(path: str, sort_by_ts: bool = False) -> Tuple[tuple, ...]:
+    """
+    Вариант parse_shard для воркеров: возвращает кортежи полей вместо Order —
+    они передаются между процессами в несколько раз дешевле датаклассов
+    """
+    return tuple(
+        (o.id, o.user_id, o.items, o.total, o.ts, o.status)
+        for o in parse_shard(path, sort_by_ts)
+    )
+
+
+def _row_to_order(row: tuple) -> Order:
+    # Строки из воркера — новые объекты: интернируются, как в _to_order
+    order_id, user_id, items, total, ts, status = row
+    return Order(
+        order_id,
+        _intern(user_id),
+        tuple((_intern(pid), qty) for pid, qty in items),
+        total,
+        ts,
+        _intern(status),
+    )
+
+
+def _rows_to_orders(rows: Tuple[tuple, ...]) -> Tuple[Order, ...]:
+    return tuple(map(_row_to_order, rows))
+
+
+def list_shards(directory: str, pattern: str = "*.jsonl*") -> Tuple[str, ...]:
+    """Пути шардов в лексикографическом порядке (для дневных файлов — по дате)"""
+    return tuple(sorted(glob.glob(os.path.join(directory, pattern))))
+
+
+def load_order_shards(
+    directory: str,
+    pattern: str = "*.jsonl*",
+    workers: Optional[int] = None,
+    sort_by_ts: bool = False,
+) -> Tuple[Order, ...]:
+    """
+    Загружает все шарды каталога в пуле процессов
+    workers=None — по числу ядер, workers=1 — без пула (в текущем процессе)
+    sort_by_ts=True — шарды сортируются в воркерах, затем сливаются heapq.merge
+    (устойчиво: при равных ts порядок шардов и строк сохраняется)
+    """
+    paths = list_shards(directory, pattern)
+
+    if workers == 1 or len(paths) <= 1:
+        parts = tuple(parse_shard(path, sort_by_ts) for path in paths)
+    else:
+        max_workers = min(workers or os.cpu_count() or 1, len(paths))
+        parse_rows = partial(_parse_shard_rows, sort_by_ts=sort_by_ts)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parts = tuple(map(_rows_to_orders, pool.map(parse_rows, paths)))
+
+    if sort_by_ts:
+        return tuple(heapq.merge(*parts, key=_order_ts))
+    return tuple(chain.from_iterable(parts))
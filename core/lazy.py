@@ -1,10 +1,15 @@
 from typing import Iterator, Iterable
 from collections import defaultdict
 from .domain import Order
+from .dataset import OrderTable
 
 
 ## ленивый генератор, возвращает заказы созданные в указанный день (ГГГГ-ММ-ДД)
+## для OrderTable — бинарный поиск по индексу времени и срез
 def iter_orders_by_day(orders: Iterable[Order], day: str) -> Iterator[Order]:
+    if isinstance(orders, OrderTable):
+        yield from orders.time_index.select(orders, day)
+        return
     for order in orders:
         if order.ts.startswith(day):
             yield order
@@ -0,0 +1,137 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, Tuple
+from .domain import Order
+from .ranges import prefix_range as string_range
+
+# Индекс заказов, отсортированных по ts, со смещениями дней.
+#
+#   ts          — метки времени в порядке сортировки
+#   order       — исходные позиции заказов в этом порядке (None — заказы уже
+#                 отсортированы, позиция = номер)
+#   day_keys    — различные ts[:10] по возрастанию
+#   day_offsets — заказы дня day_keys[i] занимают [day_offsets[i], day_offsets[i+1])
+#
+# Выборка за день / период / по префиксу — бинарный поиск и непрерывный
+# срез, O(log n + k) вместо полного прохода со startswith. Выборка
+# возвращается в исходном порядке заказов, как при фильтрации.
+
+
+def _is_sorted(values: Sequence[str]) -> bool:
+    return all(a <= b for a, b in zip(values, islice(values, 1, None)))
+
+
+def _day_offsets(ts: Sequence[str], start: int = 0) -> Tuple[List[str], array]:
+    """Различные дни отсортированных ts и смещения их начал (+ конец)"""
+    day_keys, offsets = [], array("q")
+    for i, t in enumerate(ts, start):
+        day = t[:10]
+        if not day_keys or day != day_keys[-1]:
+            day_keys.append(day)
+            offsets.append(i)
+    offsets.append(start + len(ts))
+    return day_keys, offsets
+
+
+@dataclass(frozen=True)
+class TimeIndex:
+    ts: Tuple[str, ...]
+    order: Optional[array]
+    day_keys: Tuple[str, ...]
+    day_offsets: array
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    # ============ Диапазоны в порядке сортировки ============
+
+    def day_range(self, day: str) -> Tuple[int, int]:
+        i = bisect_left(self.day_keys, day)
+        if i == len(self.day_keys) or self.day_keys[i] != day:
+            return 0, 0
+        return self.day_offsets[i], self.day_offsets[i + 1]
+
+    def period_range(self, start_day: str, end_day: str) -> Tuple[int, int]:
+        """Дни d с start_day <= d <= end_day (строковое сравнение ts[:10])"""
+        lo = bisect_left(self.day_keys, start_day)
+        hi = bisect_right(self.day_keys, end_day)
+        if lo >= hi:
+            return 0, 0
+        return self.day_offsets[lo], self.day_offsets[hi]
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Заказы с ts.startswith(prefix)"""
+        if len(prefix) == 10:
+            return self.day_range(prefix)
+        low, high = string_range(prefix)
+        return bisect_left(self.ts, low), bisect_left(self.ts, high)
+
+    # ============ Выборки в исходном порядке ============
+
+    def positions(self, lo: int, hi: int) -> Sequence[int]:
+        """Исходные позиции заказов среза [lo, hi), по возрастанию"""
+        if self.order is None:
+            return range(lo, hi)
+        return sorted(self.order[lo:hi])
+
+    def take(self, orders: Sequence[Order], lo: int, hi: int) -> Tuple[Order, ...]:
+        if self.order is None:
+            return tuple(orders[lo:hi])
+        return tuple(orders[i] for i in self.positions(lo, hi))
+
+    def select(self, orders: Sequence[Order], prefix: str) -> Tuple[Order, ...]:
+        """Как tuple(o for o in orders if o.ts.startswith(prefix))"""
+        return self.take(orders, *self.prefix_range(prefix))
+
+    def select_period(
+        self, orders: Sequence[Order], start_day: str, end_day: str
+    ) -> Tuple[Order, ...]:
+        """Заказы с start_day <= ts[:10] <= end_day в исходном порядке"""
+        return self.take(orders, *self.period_range(start_day, end_day))
+
+    # ============ Дозапись ============
+
+    def extended(self, new_orders: Iterable[Order]) -> Optional["TimeIndex"]:
+        """
+        Индекс после дозаписи заказов без пересортировки — если и старые,
+        и новые заказы идут по времени (журнал заказов). Иначе None
+        """
+        new_ts = tuple(o.ts for o in new_orders)
+        if (
+            self.order is not None
+            or not _is_sorted(new_ts)
+            or (self.ts and new_ts and new_ts[0] < self.ts[-1])
+        ):
+            return None
+        if not new_ts:
+            return self
+        n = len(self.ts)
+        tail_keys, tail_offsets = _day_offsets(new_ts, n)
+        day_keys, offsets = list(self.day_keys), array("q", self.day_offsets[:-1])
+        if day_keys and tail_keys[0] == day_keys[-1]:
+            # Новые заказы продолжают последний день индекса
+            tail_keys, tail_offsets = tail_keys[1:], tail_offsets[1:]
+        day_keys.extend(tail_keys)
+        offsets.extend(tail_offsets)
+        return TimeIndex(
+            ts=self.ts + new_ts,
+            order=None,
+            day_keys=tuple(day_keys),
+            day_offsets=offsets,
+        )
+
+
+def build_time_index(orders: Sequence[Order]) -> TimeIndex:
+    """Сортирует заказы по ts (устойчиво) и строит смещения дней"""
+    ts = [o.ts for o in orders]
+    if _is_sorted(ts):
+        order = None
+    else:
+        order = array("q", sorted(range(len(ts)), key=ts.__getitem__))
+        ts = [ts[i] for i in order]
+    day_keys, offsets = _day_offsets(ts)
+    return TimeIndex(
+        ts=tuple(ts), order=order, day_keys=tuple(day_keys), day_offsets=offsets
+    )
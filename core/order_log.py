@@ -0,0 +1,117 @@
+import json
+import os
+import time
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from .domain import Order
+from .transforms import _to_order
+
+# Append-only журнал заказов в формате JSONL и «хвостовой» читатель,
+# который подтягивает новые заказы в живой OrderService без перезагрузки seed.
+# Смещение (в байтах) последней прочитанной полной строки — high-water mark:
+# по нему отчёты знают, какую часть журнала они отражают.
+
+
+def order_to_record(order: Order) -> dict:
+    """Order -> dict в формате seed.json (обратное к _to_order)"""
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "items": [list(item) for item in order.items],
+        "total": order.total,
+        "ts": order.ts,
+        "status": order.status,
+    }
+
+
+def _encode_line(order: Order) -> bytes:
+    return (
+        json.dumps(order_to_record(order), separators=(",", ":"), ensure_ascii=False)
+        + "\n"
+    ).encode("utf-8")
+
+
+class OrderLog:
+    """
+    Писатель журнала: строки только дописываются в конец файла
+    Пакет заказов пишется одним write, поэтому читатель видит его целиком
+    или не видит вовсе (неполная последняя строка игнорируется)
+    Файл открывается на время одной дозаписи — писатель не держит дескриптор
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, orders: Iterable[Order]) -> int:
+        """Дописывает заказы и возвращает новый размер журнала в байтах"""
+        with open(self.path, "ab") as f:
+            f.write(b"".join(map(_encode_line, orders)))
+            return f.tell()
+
+    def close(self) -> None:
+        """Оставлен для совместимости: открытого файла нет"""
+
+    def __enter__(self) -> "OrderLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class OrderLogFollower:
+    """Читает журнал с сохранённого смещения (high-water mark)"""
+
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        self.offset = offset
+
+    @property
+    def high_water_mark(self) -> int:
+        return self.offset
+
+    def poll(self, max_bytes: int = -1) -> Tuple[Order, ...]:
+        """
+        Возвращает заказы, дописанные после текущего смещения
+        Читаются только полные строки; смещение сдвигается за последнюю из них
+        """
+        if not os.path.exists(self.path):
+            return ()
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.offset:
+                raise ValueError(
+                    f"{self.path}: журнал короче high-water mark "
+                    f"({size} < {self.offset}), журнал не append-only"
+                )
+            f.seek(self.offset)
+            data = f.read(max_bytes)
+
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return ()
+        self.offset += end
+        return tuple(
+            _to_order(json.loads(line)) for line in data[:end].splitlines() if line
+        )
+
+    def sync(self, service) -> int:
+        """Дописывает новые заказы в OrderService, возвращает их количество"""
+        new_orders = self.poll()
+        if new_orders:
+            service.append(new_orders, log_offset=self.offset)
+        return len(new_orders)
+
+    def follow(
+        self,
+        service,
+        interval: float = 0.05,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[int]:
+        """
+        Бесконечно синхронизирует сервис с журналом
+        Возвращает (yield) high-water mark после каждого непустого шага
+        """
+        while stop is None or not stop():
+            if self.sync(service):
+                yield self.offset
+            else:
+                time.sleep(interval)
@@ -0,0 +1,150 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from .domain import Order
+from .dataset import OrderTable
+
+# Пул процессов для CPU-агрегаций async_ops.
+#
+# Корутины async_ops считают в одном потоке: asyncio.gather чередует их,
+# но не распараллеливает. OrderPool запускает ProcessPoolExecutor, в
+# каждый воркер которого заказы передаются один раз — через initializer.
+# На Linux (fork) воркеры получают кортеж заказов и уже построенный
+# индекс времени из памяти родителя без сериализации (copy-on-write);
+# при spawn заказы сериализуются один раз на воркер. Задачи пула передают
+# только диапазоны [lo, hi) и списки id, а возвращают частичные суммы —
+# их сливает вызывающая корутина. Данные в воркерах только читаются.
+# fork небезопасен, когда в процессе уже работают другие потоки (например,
+# прогрев отчётов): ребёнок может унаследовать захваченную ими блокировку.
+# Тогда пул запускается через forkserver/spawn — ценой сериализации заказов.
+
+_shared: Dict[str, Tuple[Order, ...]] = {}
+
+
+def _init_worker(orders: Tuple[Order, ...]) -> None:
+    _shared["orders"] = orders
+
+
+def _default_context():
+    """fork, если он есть и процесс однопоточный; иначе forkserver/spawn"""
+    methods = multiprocessing.get_all_start_methods()
+    if threading.active_count() == 1 and "fork" in methods:
+        return multiprocessing.get_context("fork")
+    for method in ("forkserver", "spawn"):
+        if method in methods:
+            return multiprocessing.get_context(method)
+    return None
+
+
+class OrderPool:
+    """Пул процессов с общими (только для чтения) заказами"""
+
+    def __init__(self, orders: Sequence[Order], workers: Optional[int] = None):
+        self.orders = orders
+        self.workers = workers or os.cpu_count() or 1
+        if isinstance(orders, OrderTable):
+            # Строится до fork — воркеры получают его готовым (при spawn
+            # индекс строится в воркере заново при первом обращении)
+            _ = orders.time_index
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_default_context(),
+            initializer=_init_worker,
+            initargs=(orders,),
+        )
+
+    def __enter__(self) -> "OrderPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+    def check(self, orders: Sequence[Order]) -> None:
+        """Пул считает по своим заказам — другие данные передавать нельзя"""
+        if orders is not self.orders:
+            raise ValueError("OrderPool создан для другого набора заказов")
+
+    def ranges(self, step: int = 1) -> List[Tuple[int, int]]:
+        """Диапазоны заказов по одному на воркер (границы кратны step)"""
+        n = len(self.orders)
+        size = -(-n // self.workers)  # округление вверх
+        size = max(step, -(-size // step) * step)
+        return [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+
+    async def map(self, fn, args: Sequence[tuple]) -> list:
+        """Выполняет fn(*a) для каждого a в воркерах; результаты по порядку"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(self.executor, fn, *a) for a in args)
+        )
+
+
+# ============ Задачи воркеров ============
+# Выполняются в процессах пула и читают заказы из _shared
+
+
+def day_sales(days: Sequence[str]) -> List[Tuple[str, int]]:
+    """Сумма оплаченных заказов по каждому дню"""
+    orders = _shared["orders"]
+    index = orders.time_index if isinstance(orders, OrderTable) else None
+    result = []
+    for day in days:
+        if index is not None:
+            day_orders = index.select(orders, day)
+        else:
+            day_orders = (o for o in orders if o.ts.startswith(day))
+        result.append((day, sum(o.total for o in day_orders if o.status == "paid")))
+    return result
+
+
+def user_stats(lo: int, hi: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """({user_id: число}, {user_id: сумма}) оплаченных заказов [lo, hi)"""
+    counts: Dict[str, int] = {}
+    totals: Dict[str, int] = {}
+    for o in _shared["orders"][lo:hi]:
+        if o.status == "paid":
+            counts[o.user_id] = counts.get(o.user_id, 0) + 1
+            totals[o.user_id] = totals.get(o.user_id, 0) + o.total
+    return counts, totals
+
+
+def product_qty(lo: int, hi: int, product_ids: frozenset) -> Dict[str, int]:
+    """Проданное количество товаров (первая позиция товара в заказе)"""
+    qty: Dict[str, int] = {}
+    for o in _shared["orders"][lo:hi]:
+        if o.status != "paid":
+            continue
+        seen = set()
+        for pid, q in o.items:
+            if pid in product_ids and pid not in seen:
+                seen.add(pid)
+                qty[pid] = qty.get(pid, 0) + q
+    return qty
+
+
+def batch_stats(lo: int, hi: int, batch_size: int) -> Dict[str, int]:
+    """Статистика пакетов заказов [lo, hi) (lo кратно batch_size)"""
+    orders = _shared["orders"][lo:hi]
+    paid = [o for o in orders if o.status == "paid"]
+    return {
+        "total": len(orders),
+        "paid": len(paid),
+        "refunded": sum(o.status == "refunded" for o in orders),
+        "revenue": sum(o.total for o in paid),
+        "batches": -(-len(orders) // batch_size),
+    }
+
+
+def merge_counts(parts: Sequence[Dict[str, int]]) -> Dict[str, int]:
+    """Сумма частичных словарей; ключи — в порядке первого появления"""
+    merged: Dict[str, int] = {}
+    for part in parts:
+        for key, value in part.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
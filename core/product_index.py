@@ -0,0 +1,80 @@
+from array import array
+from functools import cached_property
+from typing import Dict, Iterable, Optional, Tuple
+from .domain import Product
+from .versioning import VersionedTuple
+
+# Индекс каталога: товар по id и товары по категории за O(1).
+#
+# ProductTable — кортеж товаров (как OrderTable для заказов), который один
+# раз лениво строит ProductIndex. Каталог неизменяем, поэтому новая версия
+# каталога — новая таблица со своим индексом. product_index() принимает
+# таблицу, готовый индекс или обычный кортеж (индекс строится на вызов).
+
+
+class ProductIndex:
+    """Поиск товаров каталога по id и по категории"""
+
+    def __init__(self, products: Iterable[Product]):
+        self.products = products if isinstance(products, tuple) else tuple(products)
+        by_id: Dict[str, Product] = {}
+        by_category: Dict[str, array] = {}
+        for i, p in enumerate(self.products):
+            by_id.setdefault(p.id, p)  # как next(...): первый товар с этим id
+            positions = by_category.get(p.category_id)
+            if positions is None:
+                positions = by_category[p.category_id] = array("q")
+            positions.append(i)
+        self.by_id = by_id
+        self._by_category = by_category
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self.by_id
+
+    def get(self, pid: str) -> Optional[Product]:
+        return self.by_id.get(pid)
+
+    def price(self, pid: str) -> Optional[int]:
+        product = self.by_id.get(pid)
+        return product.price if product is not None else None
+
+    def in_category(self, category_id: str) -> Tuple[Product, ...]:
+        """Товары одной категории (без подкатегорий) в порядке каталога"""
+        products = self.products
+        return tuple(products[i] for i in self._by_category.get(category_id, ()))
+
+    def in_categories(self, category_ids: Iterable[str]) -> Tuple[Product, ...]:
+        """Товары набора категорий в порядке каталога"""
+        by_category = self._by_category
+        positions = sorted(i for c in set(category_ids) for i in by_category.get(c, ()))
+        products = self.products
+        return tuple(products[i] for i in positions)
+
+
+class ProductTable(VersionedTuple):
+    """Кортеж товаров с лениво построенным ProductIndex"""
+
+    def __reduce__(self):
+        # Индекс не сериализуется (st.cache_data, пулы процессов)
+        return (self.__class__, (tuple(self),))
+
+    @cached_property
+    def index(self) -> ProductIndex:
+        return ProductIndex(self)
+
+
+def as_product_table(products: Iterable[Product]) -> ProductTable:
+    """Оборачивает товары в ProductTable (без копирования, если это уже она)"""
+    return products if isinstance(products, ProductTable) else ProductTable(products)
+
+
+def product_index(products: Iterable[Product]) -> ProductIndex:
+    """Индекс каталога: из кэша ProductTable или построенный заново"""
+    if isinstance(products, ProductIndex):
+        return products
+    if isinstance(products, ProductTable):
+        return products.index
+    return ProductIndex(products)
@@ -0,0 +1,15 @@
+from typing import Tuple
+
+# Префиксный поиск по отсортированным строкам (ts, id).
+#
+# Все строки, начинающиеся с prefix, лежат в полуинтервале
+# [prefix, prefix + MAX_CHAR): по нему ищут и индекс SQLite (ts >= ? AND
+# ts < ?), и бинарный поиск по отсортированным ts в памяти (TimeIndex).
+
+# Верхняя граница для префиксного поиска: наибольший символ Unicode
+MAX_CHAR = "\U0010ffff"
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """Полуинтервал строк с данным префиксом (для индексного поиска)"""
+    return prefix, prefix + MAX_CHAR
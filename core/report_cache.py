@@ -0,0 +1,189 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, Tuple
+from .versioning import cache_key
+
+# Общий кэш отчётов: бюджет памяти, LRU-вытеснение, TTL, инвалидация по
+# зависимостям.
+#
+# Каждая запись помечена данными, от которых зависит отчёт ("orders",
+# "products", "users", "carts"). Новые заказы (OrderService.append) и
+# события FRP (CHECKOUT, REFUND, ...) сбрасывают ровно записи с
+# затронутыми зависимостями — см. EVENT_DEPENDENCIES и frp.with_report_cache.
+# Ключ записи — отчёт и аргументы; OrderTable/ProductTable входят в ключ
+# версией (versioning.cache_key), а не хешем всех заказов.
+# Кэш потокобезопасен и рассчитан на один экземпляр на процесс (общий для
+# всех сессий Streamlit). Результаты отдаются как есть — их нельзя менять.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0  # секунд
+DEFAULT_DEPENDENCIES = ("orders",)
+
+# Событие FRP -> данные, которые оно меняет
+EVENT_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "CHECKOUT": ("orders",),
+    "REFUND": ("orders",),
+    "ADD_TO_CART": ("carts",),
+    "REMOVE": ("carts",),
+}
+
+
+def deep_sizeof(value, seen=None) -> int:
+    """Приблизительный размер результата в байтах (контейнеры рекурсивно)"""
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(
+            deep_sizeof(getattr(value, name), seen)
+            for name in value.__slots__
+            if hasattr(value, name)
+        )
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "deps")
+
+    def __init__(self, value, size: int, expires: float, deps: FrozenSet[str]):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.deps = deps
+
+
+class ReportCache:
+    """LRU + TTL кэш отчётов с бюджетом памяти и счётчиками попаданий"""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Счётчик инвалидаций по зависимостям: отчёт, посчитанный до
+        # инвалидации, не попадает в кэш после неё
+        self._generations: Dict[str, int] = {}
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self.evictions = self.expirations = self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        report: Callable,
+        *args,
+        deps: Iterable[str] = DEFAULT_DEPENDENCIES,
+        **kwargs,
+    ):
+        """Результат report(*args, **kwargs) из кэша или вычисленный заново"""
+        key = (report.__module__, report.__qualname__) + tuple(map(cache_key, args))
+        if kwargs:
+            key += tuple((name, cache_key(v)) for name, v in sorted(kwargs.items()))
+        deps = frozenset(deps)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation(deps)
+
+        # Отчёт считается вне блокировки: другие сессии не ждут
+        value = report(*args, **kwargs)
+        size = deep_sizeof(value)
+        if size > self.max_bytes:
+            return value  # не помещается в бюджет — не кэшируем
+
+        with self._lock:
+            if self._generation(deps) != generation:
+                return value  # данные изменились, пока отчёт считался
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, size, self.clock() + self.ttl, deps)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def cached(self, *deps: str) -> Callable:
+        """Декоратор: отчёт, результаты которого идут через этот кэш"""
+        deps = deps or DEFAULT_DEPENDENCIES
+
+        def decorator(report: Callable) -> Callable:
+            @wraps(report)
+            def wrapper(*args, **kwargs):
+                return self.get(report, *args, deps=deps, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _drop(self, key: Hashable) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def _generation(self, deps: FrozenSet[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(dep, 0) for dep in sorted(deps))
+
+    # ============ Инвалидация ============
+
+    def invalidate(self, *deps: str) -> int:
+        """Сбрасывает записи, зависящие от любых из deps; возвращает их число"""
+        wanted = set(deps)
+        with self._lock:
+            for dep in wanted:
+                self._generations[dep] = self._generations.get(dep, 0) + 1
+            stale = [key for key, e in self._entries.items() if e.deps & wanted]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def invalidate_event(self, event_name: str) -> int:
+        """Инвалидация по событию FRP (см. EVENT_DEPENDENCIES)"""
+        return self.invalidate(*EVENT_DEPENDENCIES.get(event_name, ()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Счётчики для мониторинга (и страницы приложения)"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,191 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .domain import Order, Product, User
+
+# Предагрегированный куб продаж из трёх таблиц ячеек:
+#   заказы          — день x статус x тариф пользователя
+#   наборы категорий — paid-заказы по день x тариф x набор категорий заказа
+#                      (нужны, чтобы заказ с несколькими категориями
+#                      поддерева считался в отчёте по категории один раз)
+#   позиции         — paid-позиции по день x категория x тариф
+#
+# Куб строится один раз при загрузке и дополняется новыми заказами
+# (add_orders). Отчёты AnalyticsService по периодам, сводке, категориям и
+# тарифам сервиса с подключённым кубом (OrderService(cube=...)) читают только
+# ячейки куба — время пропорционально числу ячеек, а не заказов.
+# Результаты совпадают с отчётами по сырым заказам (report.sales_by_period,
+# report.sales_summary, AnalyticsService.category_sales_report).
+# Куб не потокобезопасен сам по себе: OrderService дописывает и читает его
+# под одним замком (append / read_cube).
+
+UNKNOWN_TIER = "unknown"
+
+# (день, статус, тариф) -> [число заказов, сумма total]
+OrderKey = Tuple[str, str, str]
+# (день, тариф, категории заказа) -> число paid-заказов
+BasketKey = Tuple[str, str, FrozenSet[str]]
+# (день, категория, тариф) -> [единиц товара, выручка qty * price]
+ItemKey = Tuple[str, str, str]
+
+
+class RollupCube:
+    """Куб продаж с инкрементальным обновлением"""
+
+    def __init__(self, products: Iterable[Product] = (), users: Iterable[User] = ()):
+        self.product_info: Dict[str, Tuple[str, int]] = {
+            p.id: (p.category_id, p.price) for p in products
+        }
+        self.user_tier: Dict[str, str] = {u.id: u.tier for u in users}
+        self.order_cells: Dict[OrderKey, List[int]] = {}
+        self.basket_cells: Dict[BasketKey, int] = {}
+        self.item_cells: Dict[ItemKey, List[int]] = {}
+        # Номер первого paid-заказа дня (по тарифу) — порядок ключей периода
+        self.first_paid: Dict[Tuple[str, str], int] = {}
+        self.order_count = 0
+
+    @classmethod
+    def build(
+        cls,
+        orders: Iterable[Order],
+        products: Iterable[Product],
+        users: Iterable[User],
+    ) -> "RollupCube":
+        return cls(products, users).add_orders(orders)
+
+    def add_orders(self, orders: Iterable[Order]) -> "RollupCube":
+        """Инкрементально добавляет заказы в ячейки"""
+        product_info, user_tier = self.product_info, self.user_tier
+        order_cells, item_cells = self.order_cells, self.item_cells
+        basket_cells = self.basket_cells
+        seq = self.order_count
+
+        for order in orders:
+            day = order.ts[:10]
+            tier = user_tier.get(order.user_id, UNKNOWN_TIER)
+            paid = order.status == "paid"
+            categories = set()
+
+            for pid, qty in order.items:
+                info = product_info.get(pid)
+                if info is None:
+                    continue
+                category_id, price = info
+                categories.add(category_id)
+                if paid:
+                    cell = item_cells.get((day, category_id, tier))
+                    if cell is None:
+                        item_cells[(day, category_id, tier)] = [qty, qty * price]
+                    else:
+                        cell[0] += qty
+                        cell[1] += qty * price
+
+            key = (day, order.status, tier)
+            cell = order_cells.get(key)
+            if cell is None:
+                order_cells[key] = [1, order.total]
+            else:
+                cell[0] += 1
+                cell[1] += order.total
+            if paid:
+                basket = (day, tier, frozenset(categories))
+                basket_cells[basket] = basket_cells.get(basket, 0) + 1
+                self.first_paid.setdefault((day, tier), seq)
+            seq += 1
+
+        self.order_count = seq
+        return self
+
+    def __len__(self) -> int:
+        """Число ячеек куба"""
+        return len(self.order_cells) + len(self.basket_cells) + len(self.item_cells)
+
+    # ============ Отчёты из куба ============
+
+    def sales_by_period(
+        self, start_date: str, end_date: str, tier: Optional[str] = None
+    ) -> Dict[str, int]:
+        """Как report.sales_by_period: {date: выручка paid}, опционально по тарифу"""
+        sums: Dict[str, int] = {}
+        for (day, status, tr), (_, revenue) in self.order_cells.items():
+            if (
+                status == "paid"
+                and (tier is None or tr == tier)
+                and start_date <= day <= end_date
+            ):
+                sums[day] = sums.get(day, 0) + revenue
+
+        first_seen: Dict[str, int] = {}
+        for (day, tr), seq in self.first_paid.items():
+            if day in sums and (tier is None or tr == tier):
+                first_seen[day] = min(seq, first_seen.get(day, seq))
+        return {day: sums[day] for day in sorted(sums, key=first_seen.get)}
+
+    def sales_summary(self, tier: Optional[str] = None) -> dict:
+        """Как report.sales_summary (опционально по тарифу)"""
+        counts: Dict[str, int] = {}
+        totals: Dict[str, int] = {}
+        for (_, status, tr), (count, revenue) in self.order_cells.items():
+            if tier is None or tr == tier:
+                counts[status] = counts.get(status, 0) + count
+                totals[status] = totals.get(status, 0) + revenue
+
+        paid = counts.get("paid", 0)
+        total_paid = totals.get("paid", 0)
+        total_refunded = totals.get("refunded", 0)
+        return {
+            "total_orders": sum(counts.values()),
+            "paid_orders": paid,
+            "refunded_orders": counts.get("refunded", 0),
+            "cancelled_orders": counts.get("cancelled", 0),
+            "total_revenue": total_paid,
+            "total_refunded": total_refunded,
+            "net_revenue": total_paid - total_refunded,
+            "average_order_value": total_paid / paid if paid else 0.0,
+        }
+
+    def category_sales(
+        self,
+        category_ids: Iterable[str],
+        tier: Optional[str] = None,
+        start_day: str = "",
+        end_day: Optional[str] = None,
+    ) -> dict:
+        """
+        Paid-продажи набора категорий: заказы с хотя бы одной позицией из
+        них, единицы и выручка по позициям (qty * price)
+        """
+        wanted = frozenset(category_ids)
+        orders_count = sum(
+            count
+            for (day, tr, categories), count in self.basket_cells.items()
+            if categories & wanted
+            and (tier is None or tr == tier)
+            and start_day <= day
+            and (end_day is None or day <= end_day)
+        )
+        units = revenue = 0
+        for (day, category_id, tr), (qty, amount) in self.item_cells.items():
+            if (
+                category_id in wanted
+                and (tier is None or tr == tier)
+                and start_day <= day
+                and (end_day is None or day <= end_day)
+            ):
+                units += qty
+                revenue += amount
+        return {"orders_count": orders_count, "units": units, "total_sales": revenue}
+
+    def tier_sales(
+        self, start_day: str = "", end_day: Optional[str] = None
+    ) -> Dict[str, dict]:
+        """{тариф: {"orders": ..., "revenue": ...}} по paid-заказам"""
+        result: Dict[str, dict] = {}
+        for (day, status, tier), (count, revenue) in self.order_cells.items():
+            if (
+                status == "paid"
+                and start_day <= day
+                and (end_day is None or day <= end_day)
+            ):
+                row = result.setdefault(tier, {"orders": 0, "revenue": 0})
+                row["orders"] += count
+                row["revenue"] += revenue
+        return result
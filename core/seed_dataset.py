@@ -0,0 +1,125 @@
+import threading
+from functools import cached_property
+from typing import Iterator, Optional, Tuple
+from .domain import Category, User
+from .dataset import OrderTable
+from .product_index import ProductTable
+from .transforms import _to_category, _to_product, _to_user, _to_order
+from .seed_stream import iter_section
+from .snapshot import SeedSnapshot, file_digest, open_snapshot, load_with_snapshot
+from .versioning import VersionedTuple
+
+SECTIONS = ("categories", "products", "users", "orders")
+
+# Тип каждой секции: все несут версию и отпечаток (versioning.py)
+SECTION_TYPES = {
+    "categories": VersionedTuple,
+    "products": ProductTable,
+    "users": VersionedTuple,
+    "orders": OrderTable,
+}
+
+
+class SeedDataset:
+    """
+    Ленивый доступ к секциям seed: каждая секция материализуется при первом
+    обращении, поэтому страница каталога не платит за разбор всех заказов
+
+    С snapshot: секции читаются из mmap-снимка по отдельности (если снимок
+    устарел — при первом обращении он перестраивается из JSON целиком)
+    Без snapshot: секция читается потоково из JSON (iter_section)
+
+    Отпечаток секции — sha256 seed-файла и имя секции: ключи дискового
+    кэша отчётов не требуют обхода заказов
+
+    Секции и снимок загружаются под блокировкой: поток прогрева и поток
+    страницы получают одну и ту же таблицу (одну версию для кэшей)
+    """
+
+    def __init__(self, path: str, snapshot: Optional[str] = None):
+        self.path = path
+        self.snapshot_path = snapshot
+        self._lock = threading.RLock()
+
+    @cached_property
+    def _snapshot(self) -> Optional[SeedSnapshot]:
+        with self._lock:
+            if "_snapshot" in self.__dict__:  # открыт другим потоком
+                return self.__dict__["_snapshot"]
+            snap = self.__dict__["_snapshot"] = self._open_snapshot()
+            return snap
+
+    def _open_snapshot(self) -> Optional[SeedSnapshot]:
+        if self.snapshot_path is None:
+            return None
+        snap = open_snapshot(self.snapshot_path, self.path)
+        if snap is None:
+            # Снимок устарел: полная загрузка заполняет все секции сразу
+            seed = load_with_snapshot(self.path, self.snapshot_path)
+            snap = open_snapshot(self.snapshot_path, self.path)
+            digest = snap.source.get("sha256") if snap is not None else None
+            digest = digest or file_digest(self.path)
+            for name, section in zip(SECTIONS, seed):
+                self.__dict__[name] = self._stamp(name, section, digest)
+        return snap
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """sha256 seed-файла (из заголовка актуального снимка — без чтения JSON)"""
+        snap = self._snapshot
+        digest = snap.source.get("sha256") if snap is not None else None
+        return digest or file_digest(self.path)
+
+    def _stamp(self, name: str, section, digest: Optional[str] = None):
+        """Секция нужного типа с отпечатком, выведенным из отпечатка seed"""
+        cls = SECTION_TYPES[name]
+        if not isinstance(section, cls):
+            section = cls(section)
+        section.__dict__["fingerprint"] = f"{digest or self.fingerprint}:{name}"
+        return section
+
+    def _section(self, name: str, convert):
+        """Секция, материализованная ровно один раз"""
+        with self._lock:
+            section = self.__dict__.get(name)
+            if section is not None:  # загружена другим потоком или при перестроении
+                return section
+            snap = self._snapshot
+            section = self.__dict__.get(name)
+            if section is None:
+                if snap is not None:
+                    raw = getattr(snap, f"load_{name}")()
+                else:
+                    raw = tuple(map(convert, iter_section(self.path, name)))
+                section = self.__dict__[name] = self._stamp(name, raw)
+            return section
+
+    @cached_property
+    def categories(self) -> Tuple[Category, ...]:
+        return self._section("categories", _to_category)
+
+    @cached_property
+    def products(self) -> ProductTable:
+        return self._section("products", _to_product)
+
+    @cached_property
+    def users(self) -> Tuple[User, ...]:
+        return self._section("users", _to_user)
+
+    @cached_property
+    def orders(self) -> OrderTable:
+        return self._section("orders", _to_order)
+
+    def loaded_sections(self) -> Tuple[str, ...]:
+        """Какие секции уже материализованы"""
+        return tuple(name for name in SECTIONS if name in self.__dict__)
+
+    def count(self, section: str) -> int:
+        """Размер секции; из заголовка снимка — без материализации"""
+        if section not in self.__dict__ and self._snapshot is not None:
+            return self._snapshot.count(section)
+        return len(getattr(self, section))
+
+    def __iter__(self) -> Iterator[tuple]:
+        """categories, products, users, orders = dataset (как у load_seed)"""
+        return (getattr(self, name) for name in SECTIONS)
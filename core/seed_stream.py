@@ -0,0 +1,174 @@
+import json
+from typing import Iterator, Tuple, TextIO
+from .domain import Category, Product, User, Order
+from .dataset import OrderTable
+from .product_index import ProductTable
+from .transforms import _to_category, _to_product, _to_user, _to_order
+
+# Потоковый разбор seed.json: документ читается кусками, а записи секций
+# (categories / products / users / orders) декодируются по одной.
+# В памяти одновременно находятся только текущий кусок файла и одна запись.
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+# После числа должен идти разделитель: иначе число обрезано границей куска
+_NUMBER_END = _WHITESPACE + ",]}:"
+_decoder = json.JSONDecoder()
+
+_CONVERTERS = {
+    "categories": _to_category,
+    "products": _to_product,
+    "users": _to_user,
+    "orders": _to_order,
+}
+
+
+class _ChunkReader:
+    """Буферизованное чтение JSON-значений из текстового файла"""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Дочитывает следующий кусок, отбрасывая уже разобранную часть буфера"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Следующий значимый символ (пробелы пропускаются), "" в конце файла"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        """Забирает один структурный символ из множества expected"""
+        ch = self.peek()
+        if not ch or ch not in expected:
+            raise ValueError(f"Ожидался один из {expected!r}, получено {ch or 'EOF'!r}")
+        self.pos += 1
+        return ch
+
+    def _number_cut(self, end: int) -> bool:
+        if self.buf[self.pos] in '{["tfn':
+            return end == len(self.buf)
+        return end == len(self.buf) or self.buf[end] not in _NUMBER_END
+
+    def value(self):
+        """Декодирует одно JSON-значение, дочитывая файл при необходимости"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Число на границе куска могло быть обрезано ("12." + "5", "1" + "e3")
+            # — дочитываем, пока за ним не появится разделитель или конец файла
+            if self._number_cut(end) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_seed(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, dict]]:
+    """
+    Лениво обходит seed.json за один проход
+    Возвращает пары (имя секции, сырая запись) в порядке документа
+    Значения верхнего уровня, не являющиеся массивами, пропускаются
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _ChunkReader(f, chunk_size)
+        reader.take("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            section = reader.value()
+            reader.take(":")
+
+            if reader.peek() == "[":
+                reader.take("[")
+                if reader.peek() == "]":
+                    reader.take("]")
+                else:
+                    while True:
+                        yield section, reader.value()
+                        if reader.take(",]") == "]":
+                            break
+            else:
+                reader.value()
+
+            if reader.take(",}") == "}":
+                return
+
+
+def iter_section(
+    path: str, section: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[dict]:
+    """Лениво возвращает сырые записи одной секции seed.json"""
+    seen = False
+    for name, record in iter_seed(path, chunk_size):
+        if name == section:
+            seen = True
+            yield record
+        elif seen:
+            return
+
+
+def iter_orders(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Order]:
+    """Лениво возвращает заказы без материализации всего документа"""
+    return map(_to_order, iter_section(path, "orders", chunk_size))
+
+
+def iter_order_batches(
+    path: str, batch_size: int = 10_000, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[Order, ...]]:
+    """Заказы пакетами фиксированного размера (ограниченная память на шаг)"""
+    batch = []
+    for order in iter_orders(path, chunk_size):
+        batch.append(order)
+        if len(batch) >= batch_size:
+            yield tuple(batch)
+            batch = []
+    if batch:
+        yield tuple(batch)
+
+
+def load_seed_streaming(
+    path: str, chunk_size: int = CHUNK_SIZE
+) -> Tuple[
+    Tuple[Category, ...], Tuple[Product, ...], Tuple[User, ...], Tuple[Order, ...]
+]:
+    """
+    Аналог load_seed, который не держит в памяти дерево JSON целиком:
+    каждая запись сразу превращается в доменный объект
+    """
+    sections = {name: [] for name in _CONVERTERS}
+    for name, record in iter_seed(path, chunk_size):
+        convert = _CONVERTERS.get(name)
+        if convert is not None:
+            sections[name].append(convert(record))
+
+    return (
+        tuple(sections["categories"]),
+        ProductTable(sections["products"]),
+        tuple(sections["users"]),
+        OrderTable(sections["orders"]),
+    )
@@ -1,10 +1,27 @@
-from functools import reduce
-from typing import Tuple
+import threading
+from functools import cached_property, reduce
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
 from core.domain import Category, Product, Order
 from core.transforms import total_sales
-from core.recursion import flatten_categories, collect_products_recursive
+from core.category_index import CategoryIndex
 from core.lazy import iter_orders_by_day, lazy_top_customers
 from core.compose import pipe
+from core.ranges import prefix_range
+from core.storage import SqliteStore
+from core.dataset import OrderTable, as_order_table
+from core.product_index import as_product_table, product_index
+from core.transient import TransientDict, transient_reduce
+from core.rollup import RollupCube
+from core.report_cache import ReportCache
+from core.versioning import VersionedTuple
+
+T = TypeVar("T")
+
+# Тарифы пользователей знает только куб: заказы хранят лишь user_id
+TIER_NEEDS_CUBE = (
+    "Отчёты по тарифам требуют куба продаж: OrderService(orders, cube=...)"
+)
 
 
 class CatalogService:
@@ -12,31 +29,93 @@ class CatalogService:
 
     def __init__(self, categories: Tuple[Category, ...], products: Tuple[Product, ...]):
         self.categories = categories
-        self.products = products
+        self.products = as_product_table(products)
+
+    @cached_property
+    def tree(self) -> CategoryIndex:
+        """Индекс дерева категорий (строится один раз)"""
+        return CategoryIndex(self.categories, self.products)
 
     def products_by_category(self, root_id: str) -> Tuple[Product, ...]:
         """Возвращает все товары категории и её подкатегорий"""
-        return collect_products_recursive(self.categories, self.products, root_id)
+        return self.tree.products_under(root_id)
 
     def filter_products(self, predicate) -> Tuple[Product, ...]:
         """Фильтрует товары по предикату"""
         return tuple(filter(predicate, self.products))
 
     def get_category_tree(self, root_id: str) -> Tuple[Category, ...]:
-        """Возвращает дерево категорий от корня"""
-        return flatten_categories(self.categories, root_id)
+        """Возвращает дерево категорий от корня (обход в глубину, root первым)"""
+        return self.tree.subtree(root_id)
 
 
 class OrderService:
     """Фасад для работы с заказами"""
 
-    def __init__(self, orders: Tuple[Order, ...]):
-        self.orders = orders
+    def __init__(
+        self,
+        orders: Tuple[Order, ...],
+        cube: Optional[RollupCube] = None,
+        cache: Optional[ReportCache] = None,
+    ):
+        # OrderTable: выборки по дням идут через индекс времени (time_index)
+        self._table = as_order_table(orders)
+        # Дописанные пакеты копятся сегментами и сливаются в таблицу одним
+        # extend при следующем чтении orders: дозапись — O(пакета), а не O(n)
+        self._pending: List[Tuple[Order, ...]] = []
+        self._count = len(self._table)
+        self._lock = threading.Lock()
+        self.log_offset = 0
+        self.cube = cube  # куб продаж, поддерживается вместе с заказами
+        self.cache = cache  # кэш отчётов: новые заказы сбрасывают записи "orders"
+
+    @property
+    def orders(self) -> OrderTable:
+        """Все заказы (дописанные сегменты сливаются при первом чтении)"""
+        with self._lock:
+            if self._pending:
+                new_orders = tuple(chain.from_iterable(self._pending))
+                self._table = self._table.extend(new_orders)
+                self._pending = []
+            return self._table
+
+    def order_count(self) -> int:
+        """Число заказов без слияния сегментов"""
+        return self._count
+
+    def append(
+        self, new_orders: Iterable[Order], log_offset: Optional[int] = None
+    ) -> int:
+        """
+        Дописывает новые заказы в живой сервис (без перезагрузки seed)
+        log_offset — high-water mark журнала заказов, который отражают данные
+        """
+        new_orders = tuple(new_orders)
+        with self._lock:
+            if self.cube is not None:
+                self.cube.add_orders(new_orders)
+            if new_orders:
+                self._pending.append(new_orders)
+            self._count += len(new_orders)
+        if self.cache is not None:
+            self.cache.invalidate("orders")
+        if log_offset is not None:
+            self.log_offset = log_offset
+        return self._count
+
+    def read_cube(self, read: Callable[[RollupCube], T]) -> Optional[T]:
+        """Чтение куба под замком дозаписи (None — куб не подключён)"""
+        with self._lock:
+            return None if self.cube is None else read(self.cube)
 
     def orders_by_day(self, day: str) -> Tuple[Order, ...]:
         """Заказы за день (материализация ленивого генератора)"""
         return tuple(iter_orders_by_day(self.orders, day))
 
+    def orders_by_period(self, start_day: str, end_day: str) -> Tuple[Order, ...]:
+        """Заказы за дни start_day..end_day включительно (срез индекса времени)"""
+        return self.orders.time_index.select_period(self.orders, start_day, end_day)
+
     def top_customers(self, k: int = 5) -> Tuple[Tuple[str, int], ...]:
         """Топ-K покупателей (материализация)"""
         return tuple(lazy_top_customers(self.orders, k))
@@ -50,6 +129,106 @@ class OrderService:
         return total_sales(self.paid_orders())
 
 
+class SqliteCatalogService(CatalogService):
+    """Каталог поверх SqliteStore: фильтры выполняются в SQL"""
+
+    def __init__(self, store: SqliteStore):
+        self.store = store
+
+    @property
+    def categories(self) -> Tuple[Category, ...]:
+        return self.store.categories()
+
+    @property
+    def products(self) -> Tuple[Product, ...]:
+        return self.store.products()
+
+    @cached_property
+    def tree(self) -> CategoryIndex:
+        # Товары поддеревьев выбираются SQL-запросом — в индексе только дерево
+        return CategoryIndex(self.categories)
+
+    def products_by_category(self, root_id: str) -> Tuple[Product, ...]:
+        """Товары поддерева категорий (рекурсивный CTE + индекс по category_id)"""
+        cat_ids = self.store.subtree_category_ids(root_id)
+        if not cat_ids:
+            return ()
+        marks = ", ".join("?" * len(cat_ids))
+        return self.store.products(f"p.category_id IN ({marks})", cat_ids)
+
+    def filter_products(self, predicate) -> Tuple[Product, ...]:
+        """
+        Предикаты by_category / by_price_range / by_tag выполняются в SQL,
+        произвольные функции — проверкой в Python
+        """
+        sql = getattr(predicate, "sql", None)
+        if sql is not None:
+            return self.store.products(*sql)
+        return tuple(filter(predicate, self.products))
+
+
+class SqliteOrderService(OrderService):
+    """Заказы поверх SqliteStore: выборки по дню/статусу используют индексы"""
+
+    def __init__(
+        self,
+        store: SqliteStore,
+        cube: Optional[RollupCube] = None,
+        cache: Optional[ReportCache] = None,
+    ):
+        self.store = store
+        self._lock = threading.Lock()
+        self.log_offset = 0
+        self.cube = cube
+        self.cache = cache
+
+    def append(
+        self, new_orders: Iterable[Order], log_offset: Optional[int] = None
+    ) -> int:
+        new_orders = tuple(new_orders)
+        with self._lock:
+            if self.cube is not None:
+                self.cube.add_orders(new_orders)
+            self.store.append_orders(new_orders)
+        if self.cache is not None:
+            self.cache.invalidate("orders")
+        if log_offset is not None:
+            self.log_offset = log_offset
+        return self.store.order_count()
+
+    def order_count(self) -> int:
+        return self.store.order_count()
+
+    @property
+    def orders(self) -> Tuple[Order, ...]:
+        """Полная материализация (для отчётов, которым нужна вся история)"""
+        return self.store.orders()
+
+    def orders_by_day(self, day: str) -> Tuple[Order, ...]:
+        return self.store.orders("o.ts >= ? AND o.ts < ?", prefix_range(day))
+
+    def orders_by_period(self, start_day: str, end_day: str) -> Tuple[Order, ...]:
+        return self.store.orders(
+            "o.ts >= ? AND o.ts < ?", (start_day, prefix_range(end_day)[1])
+        )
+
+    def top_customers(self, k: int = 5) -> Tuple[Tuple[str, int], ...]:
+        rows = self.store.query(
+            "SELECT user_id, SUM(total) AS spent FROM orders GROUP BY user_id"
+            " ORDER BY spent DESC, MIN(seq) LIMIT ?",
+            (k,),
+        )
+        return tuple((uid, spent) for uid, spent in rows)
+
+    def paid_orders(self) -> Tuple[Order, ...]:
+        return self.store.orders("o.status = ?", ("paid",))
+
+    def total_revenue(self) -> int:
+        return self.store.scalar(
+            "SELECT COALESCE(SUM(total), 0) FROM orders WHERE status = 'paid'"
+        )
+
+
 class AnalyticsService:
     """Аналитический фасад"""
 
@@ -57,6 +236,15 @@ class AnalyticsService:
         self.catalog = catalog_service
         self.orders = order_service
 
+    @property
+    def fingerprint(self) -> str:
+        """Отпечаток данных сервиса — ключ его отчётов в дисковом кэше"""
+        parts = (self.catalog.categories, self.catalog.products, self.orders.orders)
+        return "|".join(
+            (p if isinstance(p, VersionedTuple) else VersionedTuple(p)).fingerprint
+            for p in parts
+        )
+
     def daily_report(self, day: str) -> dict:
         """
         Дневной отчёт через композицию чистых функций
@@ -84,7 +272,19 @@ class AnalyticsService:
     def category_sales_report(self, category_id: str) -> dict:
         """Отчёт по продажам категории"""
         category_products = self.catalog.products_by_category(category_id)
+        # Ответ из ячеек куба по категориям товаров поддерева
+        category_ids = {p.category_id for p in category_products}
+        sales = self.orders.read_cube(lambda cube: cube.category_sales(category_ids))
+        if sales is not None:
+            return {
+                "category_id": category_id,
+                "products_count": len(category_products),
+                "orders_count": sales["orders_count"],
+                "total_sales": sales["total_sales"],
+            }
+
         product_ids = {p.id for p in category_products}
+        index = product_index(category_products)
 
         def has_category_products(order: Order) -> bool:
             return any(pid in product_ids for pid, _ in order.items)
@@ -95,9 +295,7 @@ class AnalyticsService:
 
         def category_total(order: Order) -> int:
             return sum(
-                qty * next((p.price for p in category_products if p.id == pid), 0)
-                for pid, qty in order.items
-                if pid in product_ids
+                qty * index.price(pid) for pid, qty in order.items if pid in product_ids
             )
 
         total = reduce(lambda acc, o: acc + category_total(o), relevant_orders, 0)
@@ -109,17 +307,55 @@ class AnalyticsService:
             "total_sales": total,
         }
 
+    # ============ Отчёты из куба продаж ============
+    # С подключённым кубом (OrderService(cube=...)) отчёты читают его ячейки,
+    # без куба — считаются по заказам функциями report.py (тот же результат)
+
+    def sales_by_period_report(
+        self, start_day: str, end_day: str, tier: Optional[str] = None
+    ) -> dict:
+        """Выручка paid по дням периода (опционально — по тарифу)"""
+        result = self.orders.read_cube(
+            lambda cube: cube.sales_by_period(start_day, end_day, tier)
+        )
+        if result is not None:
+            return result
+        if tier is not None:
+            raise ValueError(TIER_NEEDS_CUBE)
+        from Analytics_Service.report import sales_by_period
+
+        return sales_by_period(self.orders.orders, start_day, end_day)
+
+    def sales_summary_report(self, tier: Optional[str] = None) -> dict:
+        """Сводка продаж (опционально — по тарифу)"""
+        result = self.orders.read_cube(lambda cube: cube.sales_summary(tier))
+        if result is not None:
+            return result
+        if tier is not None:
+            raise ValueError(TIER_NEEDS_CUBE)
+        from Analytics_Service.report import sales_summary
+
+        return sales_summary(self.orders.orders)
+
+    def tier_sales_report(
+        self, start_day: str = "", end_day: Optional[str] = None
+    ) -> Dict[str, dict]:
+        """{тариф: {"orders": ..., "revenue": ...}} по paid-заказам периода"""
+        result = self.orders.read_cube(lambda cube: cube.tier_sales(start_day, end_day))
+        if result is None:
+            raise ValueError(TIER_NEEDS_CUBE)
+        return result
+
     def user_retention_report(self) -> dict:
         """Отчёт по повторным покупкам"""
 
-        # Группируем заказы по пользователям через reduce
-        def group_by_user(acc: dict, order: Order) -> dict:
+        # Группируем заказы по пользователям через reduce (транзиент — O(n))
+        def group_by_user(acc: TransientDict, order: Order) -> TransientDict:
             if order.status != "paid":
                 return acc
-            user_orders = acc.get(order.user_id, [])
-            return {**acc, order.user_id: user_orders + [order]}
+            return acc.append(order.user_id, order)
 
-        user_orders = reduce(group_by_user, self.orders.orders, {})
+        user_orders = transient_reduce(group_by_user, self.orders.orders)
 
         total_users = len(user_orders)
         repeat_customers = sum(
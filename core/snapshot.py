@@ -0,0 +1,377 @@
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, Optional, Tuple
+from .domain import Category, Product, User, Order
+from .dataset import OrderTable
+from .product_index import ProductTable
+
+# Бинарный колоночный снимок seed-данных.
+#
+# Формат файла:
+#   MAGIC (8 байт) | длина заголовка (8 байт, little-endian) | заголовок JSON
+#   | колонки, каждая выровнена на 8 байт
+#
+# Все строки (id, названия, статусы, теги) хранятся один раз в словаре строк,
+# колонки ссылаются на них индексами. Числа — колонки фиксированной ширины,
+# позиции товаров заказов — смещения (CSR) + колонки product/qty.
+# Файл открывается через mmap, поэтому несколько процессов делят одни страницы.
+
+MAGIC = b"SHOPSNP1"
+FORMAT_VERSION = 1
+_ALIGN = 8
+
+Seed = Tuple[
+    Tuple[Category, ...], Tuple[Product, ...], Tuple[User, ...], Tuple[Order, ...]
+]
+
+
+# ============ Отпечаток исходного JSON ============
+
+
+def file_digest(path: str) -> str:
+    """sha256 файла (читается кусками)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(path: str, with_digest: bool = True) -> dict:
+    """Размер, mtime и (опционально) хэш исходного файла"""
+    st = os.stat(path)
+    fingerprint = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if with_digest:
+        fingerprint["sha256"] = file_digest(path)
+    return fingerprint
+
+
+# ============ Запись ============
+
+
+class _StringTable:
+    """Словарь строк: строка -> индекс"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.values = []
+
+    def code(self, value: str) -> int:
+        found = self.index.get(value)
+        if found is None:
+            found = self.index[value] = len(self.values)
+            self.values.append(value)
+        return found
+
+
+def _nullable(code, value: Optional[str]) -> int:
+    """Индекс строки или -1 для None (колонки со знаком, typecode "i")"""
+    return -1 if value is None else code(value)
+
+
+def _encode_columns(seed: Seed) -> Tuple[Dict[str, array], int]:
+    categories, products, users, orders = seed
+    strings = _StringTable()
+    code = strings.code
+
+    columns = {
+        "category_id": array("I", (code(c.id) for c in categories)),
+        "category_name": array("I", (code(c.name) for c in categories)),
+        "category_parent": array(
+            "i", (_nullable(code, c.parent_id) for c in categories)
+        ),
+        "product_id": array("I", (code(p.id) for p in products)),
+        "product_title": array("I", (code(p.title) for p in products)),
+        "product_price": array("q", (p.price for p in products)),
+        "product_category": array(
+            "i", (_nullable(code, p.category_id) for p in products)
+        ),
+        "tag_offsets": array("Q", [0]),
+        "tag_values": array("I"),
+        "user_id": array("I", (code(u.id) for u in users)),
+        "user_name": array("I", (code(u.name) for u in users)),
+        "user_tier": array("i", (_nullable(code, u.tier) for u in users)),
+        "order_id": array("I"),
+        "order_user": array("I"),
+        "order_total": array("q"),
+        "order_status": array("I"),
+        "item_offsets": array("Q", [0]),
+        "item_product": array("I"),
+        "item_qty": array("q"),
+    }
+
+    for p in products:
+        columns["tag_values"].extend(code(t) for t in p.tags)
+        columns["tag_offsets"].append(len(columns["tag_values"]))
+
+    for o in orders:
+        columns["order_id"].append(code(o.id))
+        columns["order_user"].append(code(o.user_id))
+        columns["order_total"].append(o.total)
+        columns["order_status"].append(code(o.status))
+        for pid, qty in o.items:
+            columns["item_product"].append(code(pid))
+            columns["item_qty"].append(qty)
+        columns["item_offsets"].append(len(columns["item_qty"]))
+
+    # Временные метки — ASCII фиксированной ширины (дополняются нулевыми байтами)
+    ts_width = max((len(o.ts.encode("utf-8")) for o in orders), default=0)
+    columns["order_ts"] = array(
+        "B", b"".join(o.ts.encode("utf-8").ljust(ts_width, b"\0") for o in orders)
+    )
+
+    encoded = [s.encode("utf-8") for s in strings.values]
+    offsets = array("Q", [0])
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    columns["string_offsets"] = offsets
+    columns["string_data"] = array("B", b"".join(encoded))
+    return columns, ts_width
+
+
+def write_snapshot(path: str, seed: Seed, source: Optional[dict] = None) -> None:
+    """
+    Записывает снимок атомарно (через временный файл и os.replace),
+    чтобы параллельные процессы никогда не видели недописанный файл
+    """
+    columns, ts_width = _encode_columns(seed)
+    categories, products, users, orders = seed
+
+    layout = {}
+    offset = 0
+    for name, col in columns.items():
+        nbytes = len(col) * col.itemsize
+        layout[name] = [col.typecode, offset, len(col)]
+        offset += nbytes + (-nbytes % _ALIGN)
+
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "source": source or {},
+            "counts": {
+                "categories": len(categories),
+                "products": len(products),
+                "users": len(users),
+                "orders": len(orders),
+            },
+            "ts_width": ts_width,
+            "columns": layout,
+        }
+    ).encode("utf-8")
+    prefix = MAGIC + len(header).to_bytes(8, "little") + header
+    prefix += b"\0" * (-len(prefix) % _ALIGN)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(prefix)
+        for col in columns.values():
+            data = col.tobytes()
+            f.write(data)
+            f.write(b"\0" * (-len(data) % _ALIGN))
+    os.replace(tmp, path)
+
+
+# ============ Чтение ============
+
+
+class SeedSnapshot:
+    """
+    Снимок, открытый через mmap
+    Колонки доступны как memoryview без копирования (snapshot.column("order_total")),
+    доменные объекты собираются по требованию (snapshot.load())
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: не является снимком seed")
+
+        header_len = int.from_bytes(self._mmap[8:16], "little")
+        self.header = json.loads(self._mmap[16 : 16 + header_len])
+        start = 16 + header_len
+        self._data_start = start + (-start % _ALIGN)
+        self._view = memoryview(self._mmap)
+        self._strings = None
+
+    @property
+    def source(self) -> dict:
+        return self.header.get("source", {})
+
+    def column(self, name: str) -> memoryview:
+        """Колонка как типизированный memoryview поверх mmap"""
+        typecode, offset, count = self.header["columns"][name]
+        start = self._data_start + offset
+        nbytes = count * array(typecode).itemsize
+        return self._view[start : start + nbytes].cast(typecode)
+
+    def strings(self) -> Tuple[str, ...]:
+        """Словарь строк (декодируется один раз)"""
+        if self._strings is None:
+            offsets = self.column("string_offsets")
+            data = self.column("string_data")
+            self._strings = tuple(
+                str(data[offsets[i] : offsets[i + 1]], "utf-8")
+                for i in range(len(offsets) - 1)
+            )
+        return self._strings
+
+    def load_categories(self) -> Tuple[Category, ...]:
+        s, col = self.strings(), self.column
+        return tuple(
+            Category(id=s[i], name=s[n], parent_id=None if par < 0 else s[par])
+            for i, n, par in zip(
+                col("category_id"), col("category_name"), col("category_parent")
+            )
+        )
+
+    def load_products(self) -> ProductTable:
+        s, col = self.strings(), self.column
+        tag_offsets, tag_values = col("tag_offsets"), col("tag_values")
+        return ProductTable(
+            Product(
+                id=s[i],
+                title=s[t],
+                price=price,
+                category_id=None if c < 0 else s[c],
+                tags=tuple(
+                    s[v] for v in tag_values[tag_offsets[k] : tag_offsets[k + 1]]
+                ),
+            )
+            for k, (i, t, price, c) in enumerate(
+                zip(
+                    col("product_id"),
+                    col("product_title"),
+                    col("product_price"),
+                    col("product_category"),
+                )
+            )
+        )
+
+    def load_users(self) -> Tuple[User, ...]:
+        s, col = self.strings(), self.column
+        return tuple(
+            User(id=s[i], name=s[n], tier=None if t < 0 else s[t])
+            for i, n, t in zip(col("user_id"), col("user_name"), col("user_tier"))
+        )
+
+    def load_orders(self) -> OrderTable:
+        s, col = self.strings(), self.column
+        item_offsets = col("item_offsets").tolist()
+        item_product = col("item_product").tolist()
+        item_qty = col("item_qty").tolist()
+        ts_width = self.header["ts_width"]
+        ts_bytes = col("order_ts").tobytes()
+
+        def order_items(k: int) -> tuple:
+            lo, hi = item_offsets[k], item_offsets[k + 1]
+            return tuple(zip(map(s.__getitem__, item_product[lo:hi]), item_qty[lo:hi]))
+
+        return OrderTable(
+            Order(
+                id=s[i],
+                user_id=s[u],
+                items=order_items(k),
+                total=total,
+                ts=ts_bytes[k * ts_width : (k + 1) * ts_width]
+                .rstrip(b"\0")
+                .decode("utf-8"),
+                status=s[st],
+            )
+            for k, (i, u, total, st) in enumerate(
+                zip(
+                    col("order_id").tolist(),
+                    col("order_user").tolist(),
+                    col("order_total").tolist(),
+                    col("order_status").tolist(),
+                )
+            )
+        )
+
+    def load(self) -> Seed:
+        """Собирает кортежи доменных объектов из колонок"""
+        return (
+            self.load_categories(),
+            self.load_products(),
+            self.load_users(),
+            self.load_orders(),
+        )
+
+    def count(self, section: str) -> int:
+        """Число записей секции без материализации"""
+        return self.header["counts"][section]
+
+    def close(self) -> None:
+        """Освобождает mmap (если колонки ещё используются — это сделает GC)"""
+        try:
+            if getattr(self, "_view", None) is not None:
+                self._view.release()
+                self._view = None
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def open_snapshot(
+    path: str, source_path: Optional[str] = None
+) -> Optional[SeedSnapshot]:
+    """
+    Открывает снимок, если он существует и соответствует исходному JSON
+    Проверка: размер + mtime; если совпал только размер — сверяется sha256
+    Возвращает None, если снимок нужно перестроить
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        snap = SeedSnapshot(path)
+    except (ValueError, OSError):
+        return None
+
+    header = snap.header
+    if (
+        header.get("version") != FORMAT_VERSION
+        or header.get("byteorder") != sys.byteorder
+    ):
+        snap.close()
+        return None
+    if source_path is None:
+        return snap
+
+    stored = snap.source
+    current = source_fingerprint(source_path, with_digest=False)
+    if stored.get("size") != current["size"]:
+        snap.close()
+        return None
+    if stored.get("mtime_ns") != current["mtime_ns"] and stored.get(
+        "sha256"
+    ) != file_digest(source_path):
+        snap.close()
+        return None
+    return snap
+
+
+def load_with_snapshot(json_path: str, snapshot_path: str) -> Seed:
+    """
+    Загружает seed из снимка, если он актуален, иначе разбирает JSON
+    (потоково) и записывает снимок для следующих запусков
+    """
+    snap = open_snapshot(snapshot_path, json_path)
+    if snap is not None:
+        try:
+            return snap.load()
+        finally:
+            snap.close()
+
+    from .seed_stream import load_seed_streaming
+
+    source = source_fingerprint(json_path)
+    seed = load_seed_streaming(json_path)
+    write_snapshot(snapshot_path, seed, source)
+    return seed
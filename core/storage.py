@@ -0,0 +1,232 @@
+import json
+import sqlite3
+from datetime import datetime
+from itertools import groupby
+from typing import Iterable, Iterator, Optional, Tuple
+from .domain import Category, Product, User, Order
+from .timekeys import NO_VALUE, _parse_hour
+
+# Хранилище на SQLite (stdlib): заказы живут на диске, а фильтры и
+# группировки выполняются в SQL, без загрузки всей истории в память.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    parent_id TEXT
+);
+CREATE TABLE IF NOT EXISTS products (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    category_id TEXT NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS product_tags (
+    product_seq INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    tier TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS order_items (
+    seq INTEGER PRIMARY KEY,
+    order_seq INTEGER NOT NULL,
+    product_id TEXT NOT NULL,
+    qty INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_ts ON orders (ts);
+CREATE INDEX IF NOT EXISTS idx_orders_user ON orders (user_id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products (category_id);
+CREATE INDEX IF NOT EXISTS idx_product_tags ON product_tags (tag, product_seq);
+CREATE INDEX IF NOT EXISTS idx_items_order ON order_items (order_seq);
+CREATE INDEX IF NOT EXISTS idx_items_product ON order_items (product_id);
+"""
+
+_ORDER_COLUMNS = "o.seq, o.id, o.user_id, o.total, o.ts, o.status"
+
+
+# ============ Функции SQL для разбора ts ============
+# Разбор ts теми же функциями, что в report.py / timekeys.py: часы и дни
+# недели в SQL совпадают с Python и на битых строках (NULL — заказ пропускается)
+
+
+def _sql_hour(ts: str) -> Optional[int]:
+    hour = _parse_hour(ts)
+    return None if hour == NO_VALUE else hour
+
+
+def _sql_weekday(ts: str) -> Optional[int]:
+    try:
+        return datetime.fromisoformat(ts).weekday()
+    except (TypeError, ValueError):
+        return None
+
+
+class SqliteStore:
+    """
+    Репозиторий категорий, товаров, пользователей и заказов в SQLite
+    path=":memory:" — база в памяти (для тестов)
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.create_function("ts_hour", 1, _sql_hour, deterministic=True)
+        self.conn.create_function("ts_weekday", 1, _sql_weekday, deterministic=True)
+        self.conn.executescript(SCHEMA)
+
+    # ============ Запись ============
+
+    def ingest(
+        self,
+        categories: Iterable[Category] = (),
+        products: Iterable[Product] = (),
+        users: Iterable[User] = (),
+        orders: Iterable[Order] = (),
+    ) -> None:
+        """Добавляет данные одной транзакцией"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO categories (id, name, parent_id) VALUES (?, ?, ?)",
+                ((c.id, c.name, c.parent_id) for c in categories),
+            )
+            for p in products:
+                cur = self.conn.execute(
+                    "INSERT INTO products (id, title, price, category_id, tags)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (p.id, p.title, p.price, p.category_id, json.dumps(list(p.tags))),
+                )
+                self.conn.executemany(
+                    "INSERT INTO product_tags (product_seq, tag) VALUES (?, ?)",
+                    ((cur.lastrowid, tag) for tag in p.tags),
+                )
+            self.conn.executemany(
+                "INSERT INTO users (id, name, tier) VALUES (?, ?, ?)",
+                ((u.id, u.name, u.tier) for u in users),
+            )
+            self._insert_orders(orders)
+
+    def append_orders(self, orders: Iterable[Order]) -> None:
+        """Дописывает новые заказы"""
+        with self.conn:
+            self._insert_orders(orders)
+
+    def _insert_orders(self, orders: Iterable[Order]) -> None:
+        for o in orders:
+            cur = self.conn.execute(
+                "INSERT INTO orders (id, user_id, total, ts, status)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (o.id, o.user_id, o.total, o.ts, o.status),
+            )
+            self.conn.executemany(
+                "INSERT INTO order_items (order_seq, product_id, qty) VALUES (?, ?, ?)",
+                ((cur.lastrowid, pid, qty) for pid, qty in o.items),
+            )
+
+    # ============ Чтение ============
+
+    def query(self, sql: str, params: tuple = ()) -> list:
+        return self.conn.execute(sql, params).fetchall()
+
+    def iter_query(self, sql: str, params: tuple = ()) -> Iterator[tuple]:
+        """Строки результата по мере чтения курсора (без fetchall)"""
+        return iter(self.conn.execute(sql, params))
+
+    def scalar(self, sql: str, params: tuple = ()):
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def categories(self) -> Tuple[Category, ...]:
+        rows = self.query("SELECT id, name, parent_id FROM categories ORDER BY seq")
+        return tuple(Category(id=i, name=n, parent_id=par) for i, n, par in rows)
+
+    def products(self, where: str = "1", params: tuple = ()) -> Tuple[Product, ...]:
+        rows = self.query(
+            "SELECT id, title, price, category_id, tags FROM products p"
+            f" WHERE {where} ORDER BY seq",
+            params,
+        )
+        return tuple(
+            Product(
+                id=i, title=t, price=price, category_id=c, tags=tuple(json.loads(tags))
+            )
+            for i, t, price, c, tags in rows
+        )
+
+    def users(self) -> Tuple[User, ...]:
+        rows = self.query("SELECT id, name, tier FROM users ORDER BY seq")
+        return tuple(User(id=i, name=n, tier=t) for i, n, t in rows)
+
+    def iter_orders(self, where: str = "1", params: tuple = ()) -> Iterator[Order]:
+        """
+        Лениво собирает заказы по условию на таблицу orders (алиас o)
+        Порядок — порядок вставки
+        """
+        cursor = self.conn.execute(
+            f"SELECT {_ORDER_COLUMNS}, i.product_id, i.qty FROM orders o"
+            " LEFT JOIN order_items i ON i.order_seq = o.seq"
+            f" WHERE {where} ORDER BY o.seq, i.seq",
+            params,
+        )
+        for _, rows in groupby(cursor, key=lambda r: r[0]):
+            rows = tuple(rows)
+            _, oid, user_id, total, ts, status = rows[0][:6]
+            yield Order(
+                id=oid,
+                user_id=user_id,
+                items=tuple((r[6], r[7]) for r in rows if r[6] is not None),
+                total=total,
+                ts=ts,
+                status=status,
+            )
+
+    def orders(self, where: str = "1", params: tuple = ()) -> Tuple[Order, ...]:
+        return tuple(self.iter_orders(where, params))
+
+    def order_count(self) -> int:
+        return self.scalar("SELECT COUNT(*) FROM orders")
+
+    def subtree_category_ids(self, root_id: str) -> Tuple[str, ...]:
+        """Категория и все её потомки (рекурсивный CTE)"""
+        rows = self.query(
+            """
+            WITH RECURSIVE subtree(id) AS (
+                SELECT id FROM categories WHERE id = ?
+                UNION
+                SELECT c.id FROM categories c JOIN subtree s ON c.parent_id = s.id
+            )
+            SELECT id FROM subtree
+            """,
+            (root_id,),
+        )
+        return tuple(r[0] for r in rows)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def store_from_seed(
+    seed: Tuple[
+        Tuple[Category, ...], Tuple[Product, ...], Tuple[User, ...], Tuple[Order, ...]
+    ],
+    path: str = ":memory:",
+    store: Optional[SqliteStore] = None,
+) -> SqliteStore:
+    """Создаёт хранилище и загружает в него результат load_seed"""
+    store = store or SqliteStore(path)
+    store.ingest(*seed)
+    return store
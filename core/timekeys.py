@@ -0,0 +1,102 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+from .domain import Order
+
+# Временные ключи заказов, разобранные из Order.ts один раз.
+#
+# Отчёты по часам / дням недели / периодам больше не разбирают ISO-строки
+# на каждом вызове, а читают готовые колонки. Выборки заказов за день и
+# по префиксу — через индекс времени (order_index.TimeIndex).
+# Разбор повторяет прежнюю логику отчётов один в один:
+#   day     — ts[:10] (как в sales_by_period и startswith(day))
+#   hour    — int(ts[11:13]), NO_VALUE при ошибке (как в sales_by_hour)
+#   weekday — datetime.fromisoformat(ts).weekday(), NO_VALUE при ошибке
+
+NO_VALUE = -(2**31)
+
+
+@dataclass(frozen=True)
+class TimeKeys:
+    """Колонки временных ключей, выровненные с порядком заказов"""
+
+    day_keys: Tuple[str, ...]  # отсортированные различные ts[:10]
+    order_day: array  # индекс в day_keys на заказ
+    epoch: array  # секунды Unix (наивные ts считаются UTC), NO_VALUE при ошибке
+    day_ordinal: array  # date.toordinal(), NO_VALUE при ошибке
+    hour: array
+    weekday: array  # 0 = понедельник
+
+    def day_codes(self, start_day: str, end_day: str) -> range:
+        """Коды дней d с start_day <= d <= end_day (строковое сравнение)"""
+        return range(
+            bisect_left(self.day_keys, start_day), bisect_right(self.day_keys, end_day)
+        )
+
+    def extended(self, new_orders: Iterable[Order]) -> "TimeKeys":
+        """Ключи с дописанными заказами: разбираются только новые ts"""
+        return build_time_keys(new_orders, base=self)
+
+
+def _parse_hour(ts: str) -> int:
+    try:
+        return int(ts[11:13])
+    except (ValueError, IndexError):
+        return NO_VALUE
+
+
+def build_time_keys(
+    orders: Iterable[Order], base: Optional[TimeKeys] = None
+) -> TimeKeys:
+    """
+    Разбирает ts всех заказов за один проход
+    base — ключи уже разобранного начала: колонки копируются, коды дней
+    перенумеровываются, только если новый день встал раньше существующих
+    """
+    days = []
+    if base is None:
+        epoch, day_ordinal = array("q"), array("l")
+        hour, weekday = array("l"), array("l")
+    else:
+        epoch, day_ordinal, hour, weekday = (
+            array(col.typecode, col)
+            for col in (base.epoch, base.day_ordinal, base.hour, base.weekday)
+        )
+
+    for o in orders:
+        ts = o.ts
+        days.append(ts[:10])
+        hour.append(_parse_hour(ts))
+        try:
+            dt = datetime.fromisoformat(ts)
+        except ValueError:
+            epoch.append(NO_VALUE)
+            day_ordinal.append(NO_VALUE)
+            weekday.append(NO_VALUE)
+            continue
+        aware = dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+        epoch.append(int(aware.timestamp()))
+        day_ordinal.append(dt.toordinal())
+        weekday.append(dt.weekday())
+
+    old_keys = () if base is None else base.day_keys
+    day_keys = tuple(sorted(set(old_keys).union(days)))
+    day_index = {d: i for i, d in enumerate(day_keys)}
+    if base is None:
+        order_day = array("l")
+    elif day_keys[: len(old_keys)] == old_keys:
+        order_day = array("l", base.order_day)
+    else:
+        remap = [day_index[d] for d in old_keys]
+        order_day = array("l", map(remap.__getitem__, base.order_day))
+    order_day.extend(day_index[d] for d in days)
+    return TimeKeys(
+        day_keys=day_keys,
+        order_day=order_day,
+        epoch=epoch,
+        day_ordinal=day_ordinal,
+        hour=hour,
+        weekday=weekday,
+    )
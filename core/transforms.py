@@ -1,42 +1,78 @@
 import json
+import sys
 import uuid
-from functools import reduce, lru_cache
-from typing import Tuple, Callable
+from functools import reduce
+from typing import Tuple, Callable, Optional
 from .ftypes import Maybe, Either
 from .domain import Cart, Order, Product, User, Category
+from .dataset import OrderTable
+from .product_index import ProductTable, product_index
+from .versioning import versioned_cache
+
+# Повторяющиеся строки (id товаров и пользователей, статусы, категории, теги)
+# интернируются: все заказы ссылаются на один объект строки вместо копий
+
+
+def _intern(value):
+    """Интернирует строку; остальные значения (например None) — как есть"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _to_category(c: dict) -> Category:
+    return Category(**c)
+
+
+def _to_product(p: dict) -> Product:
+    return Product(
+        id=_intern(p["id"]),
+        title=p["title"],
+        price=p["price"],
+        category_id=_intern(p["category_id"]),
+        tags=tuple(map(_intern, p.get("tags", []))),
+    )
+
+
+def _to_user(u: dict) -> User:
+    return User(id=_intern(u["id"]), name=u["name"], tier=_intern(u["tier"]))
+
+
+def _to_order(o: dict) -> Order:
+    items = tuple(
+        (sys.intern(str(item[0])), int(item[1])) for item in o.get("items", [])
+    )
+    return Order(
+        id=str(o.get("id", uuid.uuid4())),
+        user_id=sys.intern(str(o.get("user_id"))),
+        items=items,
+        total=int(o.get("total", 0)),
+        ts=str(o.get("ts", "")),
+        status=sys.intern(str(o.get("status", "paid"))),
+    )
 
 
 def load_seed(
     path: str,
+    snapshot: Optional[str] = None,
 ) -> Tuple[
     Tuple[Category, ...], Tuple[Product, ...], Tuple[User, ...], Tuple[Order, ...]
 ]:
-    """Загружает seed.json и возвращает кортежи иммутабельных данных"""
+    """
+    Загружает seed.json и возвращает кортежи иммутабельных данных
+    snapshot: путь к бинарному снимку — если он актуален, JSON не разбирается,
+    иначе снимок (пере)создаётся после загрузки
+    """
+    if snapshot is not None:
+        from .snapshot import load_with_snapshot
+
+        return load_with_snapshot(path, snapshot)
+
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    categories = tuple(map(lambda c: Category(**c), data.get("categories", [])))
-
-    def _to_product(p):
-        p2 = dict(p)
-        p2["tags"] = tuple(p2.get("tags", []))
-        return Product(**p2)
-
-    products = tuple(map(_to_product, data.get("products", [])))
-    users = tuple(map(lambda u: User(**u), data.get("users", [])))
-
-    def _to_order(o):
-        items = tuple((str(item[0]), int(item[1])) for item in o.get("items", []))
-        return Order(
-            id=str(o.get("id", uuid.uuid4())),
-            user_id=str(o.get("user_id")),
-            items=items,
-            total=int(o.get("total", 0)),
-            ts=str(o.get("ts", "")),
-            status=str(o.get("status", "paid")),
-        )
-
-    orders = tuple(map(_to_order, data.get("orders", [])))
+    categories = tuple(map(_to_category, data.get("categories", [])))
+    products = ProductTable(map(_to_product, data.get("products", [])))
+    users = tuple(map(_to_user, data.get("users", [])))
+    orders = OrderTable(map(_to_order, data.get("orders", [])))
     return categories, products, users, orders
 
 
@@ -79,8 +115,10 @@ def checkout(cart: Cart, ts: str, products: Tuple[Product, ...]) -> Either[dict,
     Right(Order) при успехе
     """
 
+    index = product_index(products)
+
     def get_price(pid: str) -> Maybe[int]:
-        found = next((p.price for p in products if p.id == pid), None)
+        found = index.price(pid)
         return Maybe.some(found) if found is not None else Maybe.nothing()
 
     # Вычисляем total через fold с проверкой каждого товара
@@ -127,19 +165,37 @@ def total_sales(orders: Tuple[Order, ...]) -> int:
 # ============ Замыкания-фильтры (HOF) ============
 
 
+def _with_sql(predicate: Callable, clause: str, params: tuple) -> Callable:
+    """
+    Прикрепляет к предикату эквивалентное SQL-условие над products (алиас p),
+    чтобы SQLite-хранилище могло выполнить фильтр в базе
+    """
+    predicate.sql = (clause, params)
+    return predicate
+
+
 def by_category(cat_id: str) -> Callable[[Product], bool]:
     """Фильтр по категории"""
-    return lambda p: p.category_id == cat_id
+    return _with_sql(lambda p: p.category_id == cat_id, "p.category_id = ?", (cat_id,))
 
 
 def by_price_range(min_price: int, max_price: int) -> Callable[[Product], bool]:
     """Фильтр по диапазону цен"""
-    return lambda p: min_price <= p.price <= max_price
+    return _with_sql(
+        lambda p: min_price <= p.price <= max_price,
+        "p.price BETWEEN ? AND ?",
+        (min_price, max_price),
+    )
 
 
 def by_tag(tag: str) -> Callable[[Product], bool]:
     """Фильтр по наличию тега"""
-    return lambda p: tag in p.tags
+    return _with_sql(
+        lambda p: tag in p.tags,
+        "EXISTS (SELECT 1 FROM product_tags t"
+        " WHERE t.product_seq = p.seq AND t.tag = ?)",
+        (tag,),
+    )
 
 
 def by_user_tier(tier: str) -> Callable[[User], bool]:
@@ -150,13 +206,14 @@ def by_user_tier(tier: str) -> Callable[[User], bool]:
 # ============ Мемоизация (Лаба 3) ============
 
 
-@lru_cache
+@versioned_cache(maxsize=128)
 def top_products(
     orders: Tuple[Order, ...], products: Tuple[Product, ...], k: int = 10
 ) -> Tuple[Product, ...]:
     """
     Топ-K товаров по продажам (только paid заказы)
-    Кэшируется через lru_cache
+    Кэшируется через versioned_cache: для OrderTable/ProductTable ключ —
+    их версии, а не хеш всех заказов и товаров
     """
 
     # Агрегация продаж через reduce
@@ -171,7 +228,7 @@ def top_products(
     product_sales = reduce(accumulate_sales, orders, {})
 
     # Сортировка и выбор топ-K
-    ranked_ids = sorted(product_sales, key=product_sales.get, reverse=True)[:k]
+    ranked_ids = set(sorted(product_sales, key=product_sales.get, reverse=True)[:k])
     return tuple(p for p in products if p.id in ranked_ids)
 
 
@@ -179,8 +236,8 @@ def top_products(
 
 
 def safe_product(products: Tuple[Product, ...], pid: str) -> Maybe[Product]:
-    """Безопасный поиск продукта по ID"""
-    found = next((p for p in products if p.id == pid), None)
+    """Безопасный поиск продукта по ID (O(1) для ProductTable)"""
+    found = product_index(products).get(pid)
     return Maybe.some(found) if found is not None else Maybe.nothing()
 
 
@@ -0,0 +1,75 @@
+from functools import reduce
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+# Транзиентные аккумуляторы для свёрток через reduce.
+#
+# Шаг вида `return {**acc, key: ...}` копирует весь словарь, и свёртка по n
+# элементам с k различными ключами стоит O(n * k). Транзиент — изменяемый
+# словарь, который существует только внутри одной свёртки: шаги меняют его
+# на месте и возвращают его же, а наружу отдаётся обычный dict через
+# persistent(). Снаружи функция остаётся чистой, внутри — O(n).
+
+
+class TransientDict:
+    """
+    Изменяемый словарь-аккумулятор для одной свёртки
+    После persistent() транзиент закрыт — дальнейшие изменения запрещены
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, initial: Optional[Dict] = None):
+        # Копия: исходный словарь вызывающего не меняется
+        self._data = dict(initial) if initial else {}
+
+    def _target(self) -> dict:
+        if self._data is None:
+            raise RuntimeError("Транзиент уже превращён в persistent-словарь")
+        return self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._target().get(key, default)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._target()
+
+    def __len__(self) -> int:
+        return len(self._target())
+
+    def assoc(self, key: Hashable, value: Any) -> "TransientDict":
+        """acc[key] = value (аналог {**acc, key: value})"""
+        self._target()[key] = value
+        return self
+
+    def add(self, key: Hashable, amount: Any = 1) -> "TransientDict":
+        """acc[key] += amount (аналог {**acc, key: acc.get(key, 0) + amount})"""
+        data = self._target()
+        data[key] = data.get(key, 0) + amount
+        return self
+
+    def append(self, key: Hashable, value: Any) -> "TransientDict":
+        """Добавляет value в список по ключу (аналог acc.get(key, []) + [value])"""
+        data = self._target()
+        bucket = data.get(key)
+        if bucket is None:
+            data[key] = [value]
+        else:
+            bucket.append(value)
+        return self
+
+    def persistent(self) -> dict:
+        """Итоговый словарь; транзиент после этого закрывается"""
+        data, self._data = self._target(), None
+        return data
+
+
+def transient_reduce(
+    step: Callable[[TransientDict, Any], TransientDict],
+    items: Iterable,
+    initial: Optional[Dict] = None,
+) -> dict:
+    """
+    reduce по транзиентному словарю: step(acc, item) меняет acc и возвращает его
+    Возвращает обычный dict с тем же порядком ключей, что и {**acc, ...}-свёртка
+    """
+    return reduce(step, items, TransientDict(initial)).persistent()
@@ -0,0 +1,99 @@
+import itertools
+import threading
+from collections import OrderedDict, namedtuple
+from functools import cached_property, wraps
+from hashlib import blake2b
+from typing import Callable, Hashable
+
+# Версии наборов данных для кэширования отчётов.
+#
+# functools.lru_cache строит ключ из самих аргументов: каждый вызов с
+# кортежем из 1M заказов хеширует все заказы (и вложенные позиции) —
+# O(n) ещё до попадания в кэш. VersionedTuple (база OrderTable и
+# ProductTable) несёт дешёвую версию:
+#   version     — номер, выданный таблице при первом обращении; таблицы
+#                 неизменяемы, новая версия данных — новая таблица
+#   fingerprint — хеш содержимого (blake2b), один раз за O(n); совпадает
+#                 у таблиц с одинаковыми данными, в том числе между процессами
+# versioned_cache ключует вызовы по версиям таких аргументов (остальные
+# аргументы — как есть) и хранит не больше maxsize результатов (LRU).
+
+_versions = itertools.count(1)
+
+
+class VersionedTuple(tuple):
+    """Кортеж с номером версии, отпечатком содержимого и кэшированным хешем"""
+
+    @cached_property
+    def version(self) -> int:
+        return next(_versions)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        digest = blake2b(digest_size=16)
+        for item in self:
+            digest.update(repr(item).encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def __hash__(self) -> int:
+        # Хеш содержимого считается один раз (кортеж неизменяем)
+        cached = self.__dict__.get("_hash")
+        if cached is None:
+            cached = self.__dict__["_hash"] = super().__hash__()
+        return cached
+
+
+def cache_key(value) -> Hashable:
+    """Ключ аргумента: версия для VersionedTuple, иначе само значение"""
+    if isinstance(value, VersionedTuple):
+        return (type(value).__name__, value.version)
+    return value
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def versioned_cache(maxsize: int = 128) -> Callable:
+    """
+    LRU-кэш отчётов с ключом по версиям наборов данных
+    Попадание — O(число аргументов), независимо от размера данных
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = tuple(map(cache_key, args))
+            if kwargs:
+                key += tuple((name, cache_key(v)) for name, v in sorted(kwargs.items()))
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return cache[key]
+                stats["misses"] += 1
+
+            result = fn(*args, **kwargs)
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        def cache_info() -> CacheInfo:
+            return CacheInfo(stats["hits"], stats["misses"], maxsize, len(cache))
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                stats["hits"] = stats["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+# Фоновый прогрев тяжёлых отчётов при старте приложения.
+#
+# Warmup получает задачи (имя, функция без аргументов) и выполняет их по
+# очереди в фоновом потоке-демоне. Задача считает отчёт через общий кэш
+# (ReportCache / DiskReportCache), поэтому результат хранит кэш, а не
+# Warmup: инвалидация и TTL работают как обычно. get(name):
+#   задача в очереди   — выполняется сразу в вызывающем потоке (поток
+#                        прогрева её пропустит)
+#   задача выполняется — ждёт окончания, затем читает результат из кэша
+#   задача выполнена   — читает результат из кэша (при промахе — считает)
+# Ошибка задачи сохраняется в задаче и не останавливает прогрев остальных.
+# get() после ошибки прогрева считает отчёт сам (как по запросу): успех
+# очищает ошибку, исключение поднимается, только если не удался и этот
+# вызов. progress() — для индикатора на страницах.
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+class _Task:
+    __slots__ = ("name", "fn", "state", "seconds", "error", "finished")
+
+    def __init__(self, name: str, fn: Callable):
+        self.name = name
+        self.fn = fn
+        self.state = PENDING
+        self.seconds = 0.0
+        self.error: Optional[BaseException] = None
+        self.finished = threading.Event()
+
+
+class Warmup:
+    """Фоновый прогрев отчётов для одной версии данных"""
+
+    def __init__(
+        self,
+        tasks: Iterable[Tuple[str, Callable]],
+        version: Union[str, Callable[[], str], None] = None,
+    ):
+        # Отпечаток данных, для которых идёт прогрев; функция вызывается
+        # лениво (в потоке прогрева), чтобы не загружать данные при создании
+        self._version = version
+        self._tasks: Dict[str, _Task] = {name: _Task(name, fn) for name, fn in tasks}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        if callable(self._version):
+            self._version = self._version()
+        return self._version
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "Warmup":
+        """Запускает поток прогрева (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="report-warmup", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _claim(self, task: _Task) -> bool:
+        with self._lock:
+            if task.state != PENDING:
+                return False
+            task.state = RUNNING
+            return True
+
+    def _execute(self, task: _Task):
+        """Выполняет задачу; ошибка сохраняется в task.error"""
+        start = time.perf_counter()
+        try:
+            value = task.fn()
+            task.state = DONE
+            return value
+        except Exception as exc:
+            task.error, task.state = exc, FAILED
+        finally:
+            task.seconds = time.perf_counter() - start
+            task.finished.set()
+
+    def _run(self) -> None:
+        _ = self.version
+        for task in self._tasks.values():
+            if self._claim(task):
+                self._execute(task)
+
+    # ============ Чтение результатов ============
+
+    def get(self, name: str):
+        """Результат задачи: прогретый, дождавшийся или посчитанный сейчас"""
+        task = self._tasks[name]
+        if self._claim(task):
+            value = self._execute(task)
+            if task.error is not None:
+                raise task.error  # посчитано в этом вызове — повторять незачем
+            return value
+        task.finished.wait()
+        if task.error is None:
+            # Прогретый результат живёт в кэше: повторный вызов — попадание
+            return task.fn()
+        # Прогрев не удался — считаем по запросу; ошибка не «залипает»
+        value = task.fn()
+        with self._lock:
+            task.error, task.state = None, DONE
+        return value
+
+    def ready(self, name: str) -> bool:
+        return self._tasks[name].finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт окончания прогрева; True — все задачи завершены"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for task in self._tasks.values():
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not task.finished.wait(left):
+                return False
+        return True
+
+    @property
+    def finished(self) -> bool:
+        return all(task.finished.is_set() for task in self._tasks.values())
+
+    def progress(self) -> Tuple[int, int]:
+        """(завершено задач, всего задач)"""
+        done = sum(task.finished.is_set() for task in self._tasks.values())
+        return done, len(self._tasks)
+
+    def current(self) -> Optional[str]:
+        """Имя выполняемой задачи (None — ничего не выполняется)"""
+        return next(
+            (task.name for task in self._tasks.values() if task.state == RUNNING),
+            None,
+        )
+
+    def stats(self) -> Dict[str, dict]:
+        """Состояние и время каждой задачи (для страницы приложения)"""
+        return {
+            task.name: {
+                "state": task.state,
+                "seconds": task.seconds,
+                "error": repr(task.error) if task.error is not None else None,
+            }
+            for task in self._tasks.values()
+        }
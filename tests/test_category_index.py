@@ -0,0 +1,67 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.domain import Category, Product
+from core.category_index import CategoryIndex
+from core.recursion import flatten_categories, collect_products_recursive
+from core.service import CatalogService
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+# r -> (a, b), a -> x, b -> (y, z); o — отдельный корень; q <-> w — цикл
+TREE = (
+    Category("r", "Root"),
+    Category("a", "A", "r"),
+    Category("b", "B", "r"),
+    Category("x", "X", "a"),
+    Category("y", "Y", "b"),
+    Category("z", "Z", "b"),
+    Category("o", "Other"),
+    Category("q", "Q", "w"),
+    Category("w", "W", "q"),
+)
+GOODS = tuple(
+    Product(f"p{i}", f"P{i}", 100 * i, cid, ()) for i, cid in enumerate("zxarbyoqzax")
+)
+index = CategoryIndex(TREE, GOODS)
+
+
+def test_subtree_is_depth_first_interval():
+    assert index.subtree_ids("r") == ("r", "a", "x", "b", "y", "z")
+    assert index.subtree_ids("b") == ("b", "y", "z")
+    assert index.subtree_ids("missing") == ()
+    assert len(index) == len(TREE)
+    for c in TREE[:7]:  # flatten_categories не завершается на цикле q <-> w
+        assert set(index.subtree(c.id)) == set(flatten_categories(TREE[:7], c.id))
+    assert index.subtree_ids("q") == ("q", "w")
+
+
+def test_is_descendant_matches_subtree():
+    for root in TREE:
+        under = set(index.subtree_ids(root.id))
+        for c in TREE:
+            assert index.is_descendant(c.id, root.id) == (c.id in under)
+    assert not index.is_descendant("missing", "r")
+
+
+def test_products_under_match_recursive_collect():
+    for c in TREE[:7]:
+        assert index.products_under(c.id) == collect_products_recursive(
+            TREE[:7], GOODS, c.id
+        )
+    assert {p.id for p in index.products_under("q")} == {"p7"} | {
+        p.id for p in GOODS if p.category_id == "w"
+    }
+
+
+def test_catalog_service_on_seed():
+    catalog = CatalogService(categories, products)
+    for c in categories:
+        assert catalog.products_by_category(c.id) == collect_products_recursive(
+            categories, products, c.id
+        )
+        assert set(catalog.get_category_tree(c.id)) == set(
+            flatten_categories(categories, c.id)
+        )
@@ -0,0 +1,90 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import pickle
+from core.domain import Order
+from core.transforms import load_seed
+from core.dataset import OrderTable, encode_orders
+from core.timekeys import build_time_keys
+from core import async_ops
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+plain = tuple(orders)
+
+# u2 сначала встречается в refunded-заказе: порядок ключей должен учитывать только paid
+tricky = (
+    Order("o1", "u2", (("p2", 1),), 500, "2025-01-01T10:00:00", "refunded"),
+    Order("o2", "u1", (("p1", 2), ("p1", 1)), 300, "2025-01-01T11:00:00", "paid"),
+    Order("o3", "u2", (("p2", 3),), 300, "2025-01-02T12:00:00", "paid"),
+    Order("o4", "u1", (), 100, "2025-01-02T13:00:00", "cancelled"),
+)
+
+
+def test_load_seed_returns_order_table():
+    assert isinstance(orders, OrderTable)
+    assert orders == plain
+    assert orders.encoded is orders.encoded  # кодирование кэшируется
+
+
+def test_encoding_is_dense_and_csr_packed():
+    enc = encode_orders(tricky)
+    assert enc.user_ids == ("u2", "u1") and enc.product_ids == ("p2", "p1")
+    assert list(enc.item_offsets) == [0, 1, 3, 4, 4]
+    assert list(enc.item_product) == [0, 1, 1, 0]
+    assert list(enc.item_order) == [0, 1, 1, 2]
+
+
+def test_encoded_aggregations_keep_first_paid_order():
+    enc = encode_orders(tricky)
+    assert list(enc.sum_by_user().items()) == [("u1", 300), ("u2", 300)]
+    assert enc.count_by_user("cancelled") == {"u1": 1}
+    assert list(enc.qty_by_product().items()) == [("p1", 3), ("p2", 3)]
+    assert enc.qty_by_product(first_only=True) == {"p1": 2, "p2": 3}
+    assert enc.sum_by_user("unknown") == {}
+
+
+def test_reports_identical_on_order_table():
+    for data in (plain, tricky):
+        table = OrderTable(data)
+        assert report.bestsellers_report(table, products) == report.bestsellers_report(
+            data, products
+        )
+        assert list(report.customer_lifetime_value(table).items()) == list(
+            report.customer_lifetime_value(data).items()
+        )
+        assert report.top_customers_report(table) == report.top_customers_report(data)
+        assert report.retention_rate(table) == report.retention_rate(data)
+
+
+def test_async_ops_identical_on_order_table():
+    user_ids = [u.id for u in users]
+    for fn, args in (
+        (async_ops.sales_by_user_async, (user_ids,)),
+        (async_ops.product_performance_async, (products,)),
+        (async_ops.customer_segmentation_async, (users,)),
+    ):
+        assert asyncio.run(fn(orders, *args)) == asyncio.run(fn(list(plain), *args))
+
+
+def test_pickle_drops_cached_columns():
+    _ = orders.encoded
+    restored = pickle.loads(pickle.dumps(orders))
+    assert isinstance(restored, OrderTable) and restored == orders
+    assert "encoded" not in restored.__dict__
+
+
+def test_extend_carries_columns_incrementally():
+    late, early = plain[len(plain) // 2 :], plain[: len(plain) // 2]
+    for head, tail in [(early, late), (late, early), (plain, tricky)]:
+        table = OrderTable(head)
+        _ = table.encoded, table.time_keys
+        extended = table.extend(tail)
+        # Колонки перенесены без пересчёта и совпадают с полным построением
+        assert {"encoded", "time_keys"} <= set(vars(extended))
+        assert extended.encoded == encode_orders(head + tail)
+        assert extended.time_keys == build_time_keys(head + tail)
+        assert table.encoded == encode_orders(head)  # исходные колонки не тронуты
+    assert "encoded" not in vars(OrderTable(tricky).extend(tricky))
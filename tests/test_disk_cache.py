@@ -0,0 +1,177 @@
+import sys
+import os
+import json
+import subprocess
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.seed_dataset import SeedDataset
+from core.disk_cache import DiskReportCache, source_version
+from core.async_ops import run_async_pipeline
+from core.service import AnalyticsService, CatalogService, OrderService
+from Analytics_Service.report import comprehensive_report, sales_summary
+
+SEED = "data/seed.json"
+categories, products, users, orders = load_seed(SEED)
+
+
+def counting(report):
+    calls = []
+
+    def wrapped(*args, **kwargs):
+        calls.append(args)
+        return report(*args, **kwargs)
+
+    wrapped.__qualname__ = report.__qualname__ + "_counting"
+    return wrapped, calls
+
+
+def test_warm_restart_hits_same_seed(tmp_path):
+    path = str(tmp_path / "reports.sqlite")
+    report, calls = counting(comprehensive_report)
+
+    data = SeedDataset(SEED)
+    cold = DiskReportCache(path).get(report, data.orders, data.products, data.users)
+    assert cold == comprehensive_report(orders, products, users)
+
+    # "Рестарт": новый набор данных и новое соединение — ключ тот же
+    data = SeedDataset(SEED, snapshot=str(tmp_path / "seed.snapshot"))
+    cache = DiskReportCache(path)
+    warm = cache.get(report, data.orders, data.products, data.users)
+    assert warm == cold and len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 0)
+    # Отпечаток секции выведен из sha256 seed, а не из обхода заказов
+    assert data.orders.fingerprint == f"{data.fingerprint}:orders"
+
+
+def test_other_seed_gets_other_keys(tmp_path):
+    other = tmp_path / "seed.json"
+    with open(SEED, encoding="utf-8") as f:
+        raw = json.load(f)
+    raw["orders"] = raw["orders"][:-1]
+    other.write_text(json.dumps(raw), encoding="utf-8")
+
+    cache = DiskReportCache(str(tmp_path / "reports.sqlite"))
+    a, b = SeedDataset(SEED), SeedDataset(str(other))
+    assert cache.key(sales_summary, a.orders) != cache.key(sales_summary, b.orders)
+    assert cache.get(sales_summary, b.orders) == sales_summary(orders[:-1])
+    assert cache.get(sales_summary, a.orders) == sales_summary(orders)
+
+
+def test_concurrent_reader_and_invalidate(tmp_path):
+    path = str(tmp_path / "reports.sqlite")
+    writer, reader = DiskReportCache(path), DiskReportCache(path)
+    writer.get(sales_summary, orders)
+    writer.get(run_async_pipeline, orders, products, users)
+    assert reader.lookup(writer.key(sales_summary, orders)) == (
+        True,
+        sales_summary(orders),
+    )
+    assert reader.stats()["entries"] == 2
+
+    assert reader.invalidate(sales_summary) == 1
+    assert writer.lookup(writer.key(sales_summary, orders)) == (False, None)
+    assert writer.invalidate() == 1 and writer.stats()["entries"] == 0
+
+
+def test_size_eviction_drops_least_recently_accessed(tmp_path):
+    path = str(tmp_path / "reports.sqlite")
+    probe = DiskReportCache(path)
+    probe.get(sales_summary, orders[:10])
+    one = probe.stats()["bytes"]
+    probe.invalidate()
+
+    cache = DiskReportCache(path, max_bytes=2 * one + one // 2)
+    a, b, c = orders[:10], orders[:20], orders[:30]
+    cache.get(sales_summary, a), cache.get(sales_summary, b)
+    cache.get(sales_summary, a)  # a — недавно прочитанная
+    cache.get(sales_summary, c)  # вытесняет b
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+    assert cache.lookup(cache.key(sales_summary, b)) == (False, None)
+    assert cache.lookup(cache.key(sales_summary, a))[0]
+
+    # Результат больше бюджета не сохраняется
+    tiny = DiskReportCache(str(tmp_path / "tiny.sqlite"), max_bytes=10)
+    assert tiny.get(sales_summary, a) == sales_summary(a)
+    assert tiny.stats()["entries"] == 0
+
+
+def test_service_reports_keyed_by_data(tmp_path):
+    cache = DiskReportCache(str(tmp_path / "reports.sqlite"))
+    service = AnalyticsService(
+        CatalogService(categories, products), OrderService(orders[:50])
+    )
+    report = cache.cached(AnalyticsService.user_retention_report)
+    first = report(service)
+    assert report(service) == first and cache.hits == 1
+
+    service.orders.append(orders[50:])  # новые заказы — новый отпечаток
+    assert report(service) == service.user_retention_report()
+    assert cache.misses == 2
+
+
+def test_key_changes_with_code_and_cache_version(tmp_path):
+    path = str(tmp_path / "reports.sqlite")
+
+    def old(orders):
+        return len(orders)
+
+    def new(orders):
+        return len(orders) * 2
+
+    new.__qualname__ = old.__qualname__  # тот же отчёт после деплоя
+    cache = DiskReportCache(path)
+    assert cache.key(old, orders) == cache.key(old, orders)
+    assert cache.key(old, orders) != cache.key(new, orders)
+    assert cache.get(old, orders) == len(orders)
+    assert cache.get(new, orders) == 2 * len(orders)
+
+    redeployed = DiskReportCache(path, version="v2")
+    assert redeployed.key(old, orders) != cache.key(old, orders)
+    assert redeployed.lookup(redeployed.key(old, orders)) == (False, None)
+    assert source_version(["core"]) == source_version(["core"]) != ""
+
+
+KEY_OF_SET = """
+import sys
+sys.path.insert(0, {root!r})
+from core.disk_cache import DiskReportCache
+from Analytics_Service.report import sales_summary
+cache = DiskReportCache({path!r})
+ids = {{f"u{{i}}" for i in range(50)}}
+print(cache.key(sales_summary, frozenset(ids), tags=set(ids), by={{"b": 2, "a": ids}}))
+"""
+
+
+def test_set_arguments_key_is_stable_across_processes(tmp_path):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    script = KEY_OF_SET.format(root=root, path=str(tmp_path / "reports.sqlite"))
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(keys) == 1  # хеш-порядок множеств не влияет на ключ
+
+
+def test_unpicklable_arguments_skip_cache(tmp_path):
+    cache = DiskReportCache(str(tmp_path / "reports.sqlite"))
+
+    def apply(fn, lock):
+        with lock:
+            return fn(orders)
+
+    assert cache.get(apply, len, threading.Lock()) == len(orders)
+    assert cache.get(apply, lambda o: 1, threading.Lock()) == 1
+    report = cache.cached(apply)
+    assert report(len, threading.Lock()) == len(orders)
+    stats = cache.stats()
+    assert stats["uncacheable"] == 3 and stats["entries"] == 0
@@ -0,0 +1,99 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import csv
+import gzip
+import json
+import pytest
+from core.transforms import load_seed
+from core.storage import store_from_seed
+from Analytics_Service import report, sql_report
+from Analytics_Service.export import (
+    ReportTable,
+    export_comprehensive,
+    export_report,
+    export_table,
+)
+
+seed = load_seed("data/seed.json")
+categories, products, users, orders = seed
+
+
+def read_csv(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def read_jsonl(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("name", ["ltv.csv", "ltv.csv.gz"])
+def test_ltv_csv(tmp_path, name):
+    ltv = report.customer_lifetime_value(orders)
+    path = str(tmp_path / name)
+    assert export_report(ltv, path, ("user_id", "total_spent")) == len(ltv)
+    header, *rows = read_csv(path)
+    assert header == ["user_id", "total_spent"]
+    assert {u: int(v) for u, v in rows} == ltv
+
+
+@pytest.mark.parametrize("name", ["best.jsonl", "best.jsonl.gz"])
+def test_bestsellers_jsonl(tmp_path, name):
+    best = report.bestsellers_report(orders, products, k=5)
+    path = str(tmp_path / name)
+    assert export_report(best, path) == len(best)
+    assert read_jsonl(path) == best
+
+
+def test_rows_are_consumed_lazily(tmp_path):
+    def rows():
+        for i in range(3):
+            yield (f"u{i}", i)
+
+    table = ReportTable(("user_id", "total_spent"), rows())
+    assert export_table(table, str(tmp_path / "out.jsonl")) == 3
+    assert read_jsonl(str(tmp_path / "out.jsonl"))[2] == {
+        "user_id": "u2",
+        "total_spent": 2,
+    }
+
+
+def test_percent_in_column_names(tmp_path):
+    rows = [("a", 0.5, "100%"), ("b", 1.0, "%s")]
+    table = ReportTable(("user_id", "share %", "%(x)s %d"), iter(rows))
+    assert export_table(table, str(tmp_path / "out.jsonl")) == 2
+    assert read_jsonl(str(tmp_path / "out.jsonl")) == [
+        {"user_id": u, "share %": share, "%(x)s %d": label} for u, share, label in rows
+    ]
+
+
+def test_sql_cursor_export_matches_report(tmp_path):
+    store = store_from_seed(seed)
+    path = str(tmp_path / "ltv.jsonl")
+    table = ReportTable(
+        ("user_id", "total_spent"), sql_report.iter_customer_lifetime_value(store)
+    )
+    export_table(table, path)
+    store.close()
+    assert {r["user_id"]: r["total_spent"] for r in read_jsonl(path)} == (
+        report.customer_lifetime_value(orders)
+    )
+
+
+def test_export_comprehensive(tmp_path):
+    full = report.comprehensive_report(orders, products, users)
+    paths = export_comprehensive(full, str(tmp_path), fmt="jsonl", compress=True)
+    assert set(paths) == set(full)
+    assert read_jsonl(paths["bestsellers"]) == full["bestsellers"]
+    hourly = read_jsonl(paths["hourly_pattern"])
+    assert {r["hour"]: r["total_sales"] for r in hourly} == full["hourly_pattern"]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_report({}, str(tmp_path / "out.xml"))
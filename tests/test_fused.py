@@ -0,0 +1,64 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from core.transforms import load_seed
+from core.domain import Order
+from core.dataset import OrderTable
+from Analytics_Service import report
+from Analytics_Service.fused import accumulate, fused_report
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+# Заказы с краевыми случаями: битые ts, неизвестный товар, ничьи в топах
+odd_orders = tuple(orders) + (
+    Order("x1", "u001", (("p001", 3), ("p001", 1)), 500, "bad-ts", "paid"),
+    Order("x2", "u_new", (("p_missing", 50),), 700, "2025-10-21T1", "paid"),
+    Order("x3", "u_new", (), 700, "2025-10-21T23:59:00", "refunded"),
+    Order("x4", "u002", (("p002", 2),), 100, "2025-10-21", "cancelled"),
+)
+
+
+def composed(orders, products, k=5):
+    return {
+        "sales": report.sales_summary(orders),
+        "bestsellers": report.bestsellers_report(orders, products, k=k),
+        "top_customers": report.top_customers_report(orders, k=k),
+        "retention": report.retention_rate(orders),
+        "hourly_pattern": report.sales_by_hour(orders),
+        "weekday_pattern": report.sales_by_weekday(orders),
+    }
+
+
+@pytest.mark.parametrize("data", [tuple(orders), odd_orders])
+def test_fused_matches_composed_reports(data):
+    expected = composed(data, products)
+    result = report.comprehensive_report(data, products, users)
+    assert result == expected
+    # Порядок ключей тоже совпадает
+    assert [list(v) for v in result.values() if isinstance(v, dict)] == [
+        list(v) for v in expected.values() if isinstance(v, dict)
+    ]
+
+
+def test_fused_uses_cached_columns():
+    table = OrderTable(odd_orders)
+    cold = fused_report(table, products)
+    _ = table.encoded, table.time_keys
+    warm = fused_report(table, products)
+    assert cold == warm == composed(odd_orders, products)
+    assert list(warm["weekday_pattern"]) == list(cold["weekday_pattern"])
+
+
+@pytest.mark.parametrize("size", [1, 7, 25])
+def test_chunk_accumulators_merge(size):
+    chunks = [odd_orders[i : i + size] for i in range(0, len(odd_orders), size)]
+    acc = accumulate(())
+    for chunk in chunks:
+        acc.merge(accumulate(chunk))
+    assert acc.report(products, k=5) == composed(odd_orders, products)
+
+
+def test_empty_orders():
+    assert fused_report((), products) == composed((), products)
@@ -0,0 +1,148 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import random
+import subprocess
+from collections import Counter
+import pytest
+from core.transforms import load_seed, top_products
+from core.heavy_hitters import (
+    SpaceSaving,
+    CountMinSketch,
+    CountMinTopK,
+    stream_top_products,
+    stream_top_customers,
+)
+from core.frp import (
+    apply_events,
+    create_event,
+    create_shop_event_bus,
+    initial_state,
+    with_top_customers,
+)
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def zipf_stream(n: int, n_keys: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(n_keys)]
+    keys = rng.choices(range(n_keys), weights=weights, k=n)
+    return [(f"k{key}", rng.randint(1, 5)) for key in keys]
+
+
+def test_space_saving_error_bounds():
+    stream = zipf_stream(50_000, 5_000)
+    exact = Counter()
+    for key, weight in stream:
+        exact[key] += weight
+    sketch = SpaceSaving(200).update_many(stream)
+
+    assert len(sketch.counts) == 200
+    for key, count, error in sketch.top(50):
+        assert count - error <= exact[key] <= count
+        assert error <= sketch.max_error
+    # Все ключи тяжелее N / m обязаны отслеживаться
+    for key, weight in exact.items():
+        if weight > sketch.max_error:
+            assert key in sketch.counts
+    assert [k for k, _, _ in sketch.top(5)] == [k for k, _ in exact.most_common(5)]
+
+
+def test_space_saving_is_exact_with_enough_counters():
+    stream = zipf_stream(5_000, 100)
+    exact = Counter()
+    for key, weight in stream:
+        exact[key] += weight
+    sketch = SpaceSaving(100).update_many(stream)
+    assert {k: c for k, c, _ in sketch.top(100)} == dict(exact)
+
+
+def test_count_min_overestimates_within_bound():
+    stream = zipf_stream(50_000, 5_000)
+    exact = Counter()
+    for key, weight in stream:
+        exact[key] += weight
+    cms = CountMinSketch.from_error(epsilon=0.001, delta=0.01)
+    for key, weight in stream:
+        cms.update(key, weight)
+    misses = sum(
+        1
+        for key, weight in exact.items()
+        if not weight <= cms.estimate(key) <= weight + cms.max_error
+    )
+    assert misses <= 0.01 * len(exact)
+
+    top = CountMinTopK.from_error(k=5, epsilon=0.001).update_many(stream)
+    assert [k for k, _ in top.top()] == [k for k, _ in exact.most_common(5)]
+
+
+SKETCH_ROWS = """
+import sys
+sys.path.insert(0, {root!r})
+from core.heavy_hitters import CountMinSketch
+cms = CountMinSketch(64, 3)
+for i in range(200):
+    cms.update(f"k{{i % 37}}", i)
+print(cms.rows)
+"""
+
+
+def test_count_min_is_stable_across_processes_and_merges():
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    rows = {
+        subprocess.run(
+            [sys.executable, "-c", SKETCH_ROWS.format(root=root)],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(rows) == 1  # hash() солится по процессу, blake2b — нет
+
+    stream = zipf_stream(5_000, 500)
+    whole = CountMinSketch(256, 4)
+    shards = [CountMinSketch(256, 4) for _ in range(3)]
+    for i, (key, weight) in enumerate(stream):
+        whole.update(key, weight)
+        shards[i % 3].update(key, weight)
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+    assert merged.rows == whole.rows and merged.total == whole.total
+    with pytest.raises(ValueError):
+        merged.merge(CountMinSketch(256, 4, seed=1))
+
+
+def test_stream_top_matches_exact_reports_on_seed():
+    best = report.bestsellers_report(orders, products, k=5)
+    approx = stream_top_products(iter(orders), k=5, epsilon=0.001)
+    assert [(p["product_id"], p["quantity_sold"]) for p in best] == [
+        (pid, qty) for pid, qty, _ in approx
+    ]
+    assert {p.id for p in top_products(orders, products, 5)} == {
+        pid for pid, _, _ in approx
+    }
+
+    customers = report.top_customers_report(orders, k=5)
+    approx = stream_top_customers(iter(orders), k=5)
+    assert [(c["user_id"], c["total_spent"]) for c in customers] == [
+        (uid, total) for uid, total, _ in approx
+    ]
+
+
+def test_checkout_stream_top_customers():
+    bus = with_top_customers(create_shop_event_bus(), epsilon=0.5, k=2)
+    events = tuple(
+        create_event("CHECKOUT", {"order_id": f"o{i}", "user_id": uid, "total": t})
+        for i, (uid, t) in enumerate(
+            [("u1", 100), ("u2", 50), ("u1", 100), ("u3", 10), ("u2", 10)]
+        )
+    )
+    state = apply_events(bus, events, initial_state())
+    assert state["total_revenue"] == 270
+    top = state["top_customers"]
+    assert top[0][0] == "u1" and top[0][1] - top[0][2] <= 200 <= top[0][1]
+    assert len(top) == 2
@@ -0,0 +1,90 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from dataclasses import replace
+from datetime import date, timedelta
+import pytest
+from core.transforms import load_seed
+from core.hll import HyperLogLog, ActiveBuyers, merged
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def test_hll_estimate_within_error():
+    sketch = HyperLogLog(12).update(f"u{i}" for i in range(100_000))
+    assert abs(sketch.count() - 100_000) <= 3 * sketch.relative_error * 100_000
+    small = HyperLogLog(12).update(["a", "b", "c", "a"])
+    assert small.count() == 3
+
+
+def test_hll_merge_is_union_and_roundtrips():
+    left = HyperLogLog(10).update(f"u{i}" for i in range(0, 6_000))
+    right = HyperLogLog(10).update(f"u{i}" for i in range(3_000, 9_000))
+    union = HyperLogLog(10).update(f"u{i}" for i in range(9_000))
+    assert merged([left, right], 10).registers == union.registers
+    assert HyperLogLog.from_bytes(union.to_bytes()).registers == union.registers
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(12))
+
+
+def exact_active(orders, day, window, category_id=None):
+    start = (date.fromisoformat(day) - timedelta(days=window - 1)).isoformat()
+    category_of = {p.id: p.category_id for p in products}
+    return len(
+        {
+            o.user_id
+            for o in orders
+            if o.status == "paid"
+            and start <= o.ts[:10] <= day
+            and (
+                category_id is None
+                or any(category_of.get(pid) == category_id for pid, _ in o.items)
+            )
+        }
+    )
+
+
+def test_active_buyers_match_exact_counts():
+    buyers = ActiveBuyers(products).add_orders(orders)
+    day = buyers.last_day()
+    for window in (1, 7, 30, 365):
+        assert buyers.active(day, window) == exact_active(orders, day, window)
+    for category_id in buyers.categories():
+        assert buyers.active(day, 365, category_id) == exact_active(
+            orders, day, 365, category_id
+        )
+
+
+def test_shards_merge_like_single_pass():
+    half = len(orders) // 2
+    single = ActiveBuyers(products).add_orders(orders)
+    shards = ActiveBuyers(products).add_orders(orders[:half])
+    shards.merge(ActiveBuyers(products).add_orders(orders[half:]))
+    assert single.days.keys() == shards.days.keys()
+    assert all(
+        single.days[d].registers == shards.days[d].registers for d in single.days
+    )
+
+
+def test_active_buyers_report():
+    result = report.active_buyers_report(orders, products)
+    assert result["retention"] == report.retention_rate(orders)
+    day = result["day"]
+    assert result["mau"] == exact_active(orders, day, 30)
+    assert result["dau"] <= result["wau"] <= result["mau"]
+    assert set(result["by_category"]) <= {c.id for c in categories}
+    empty = report.active_buyers_report((), products)
+    assert empty["day"] is None and empty["mau"] == 0
+
+
+def test_malformed_timestamps_are_skipped():
+    paid = next(o for o in orders if o.status == "paid")
+    broken = tuple(
+        replace(paid, id=f"bad{i}", ts=ts)
+        for i, ts in enumerate(("bad", "2025-13-40T10:00:00", "2025-W43-3", ""))
+    )
+    result = report.active_buyers_report(orders + broken, products)
+    assert result == report.active_buyers_report(orders, products)
+    assert report.active_buyers_report(broken, products)["day"] is None
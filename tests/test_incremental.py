@@ -0,0 +1,75 @@
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.domain import Order
+from core.dataset import OrderTable
+from Analytics_Service import report
+from Analytics_Service.incremental import ReportState
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+STATUSES = ("paid", "paid", "paid", "refunded", "cancelled", "pending")
+
+
+def assert_matches_batch(state: ReportState, history) -> None:
+    history = tuple(history)
+    assert state.sales_summary() == report.sales_summary(history)
+    ltv = state.customer_lifetime_value()
+    expected = report.customer_lifetime_value(history)
+    assert ltv == expected and list(ltv) == list(expected)
+    assert state.retention_rate() == report.retention_rate(history)
+    for k in (1, 3, 10, 1000):
+        assert state.top_customers_report(k) == report.top_customers_report(history, k)
+
+
+def test_matches_batch_on_seed_and_table():
+    state = ReportState(orders)
+    assert len(state) == len(orders)
+    assert_matches_batch(state, orders)
+    assert state.top_customers_report(5) == report.top_customers_report(
+        OrderTable(orders), 5
+    )
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_stream_of_orders_and_status_changes(seed):
+    """Свойство: после любой последовательности событий — как пакетный пересчёт"""
+    rng = random.Random(seed)
+    n_users = rng.randint(1, 12)
+    # Малый набор сумм — больше ничьих в топе покупателей
+    totals = [rng.choice((0, 100, 200, 300)) for _ in range(6)]
+    state, history = ReportState(), []
+
+    for step in range(rng.randint(1, 150)):
+        if history and rng.random() < 0.35:
+            i = rng.randrange(len(history))
+            status = rng.choice(STATUSES)
+            old = history[i]
+            history[i] = Order(
+                old.id, old.user_id, old.items, old.total, old.ts, status
+            )
+            state.change_status(old.id, status)
+        else:
+            order = Order(
+                id=f"o{step}",
+                user_id=f"u{rng.randrange(n_users)}",
+                items=(("p1", 1),),
+                total=rng.choice(totals),
+                ts="2025-01-01T00:00:00",
+                status=rng.choice(STATUSES),
+            )
+            history.append(order)
+            state.add_order(order)
+        if rng.random() < 0.2:
+            assert_matches_batch(state, history)
+    assert_matches_batch(state, history)
+
+
+def test_unknown_order_status_change():
+    with pytest.raises(KeyError):
+        ReportState().change_status("missing", "refunded")
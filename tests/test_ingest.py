@@ -0,0 +1,58 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import gzip
+import json
+import pytest
+from core.transforms import load_seed
+from core.ingest import load_order_shards, parse_shard
+
+with open("data/seed.json", encoding="utf-8") as f:
+    raw_orders = json.load(f)["orders"]
+orders = load_seed("data/seed.json")[3]
+
+
+@pytest.fixture
+def shard_dir(tmp_path):
+    """Заказы seed.json, разложенные по 4 шардам (последний — gzip)"""
+    for shard in range(4):
+        lines = "".join(json.dumps(o) + "\n" for o in raw_orders[shard::4])
+        if shard == 3:
+            with gzip.open(tmp_path / f"day-{shard}.jsonl.gz", "wt") as f:
+                f.write(lines)
+        else:
+            (tmp_path / f"day-{shard}.jsonl").write_text(lines + "\n")
+    return str(tmp_path)
+
+
+def test_parse_shard_reuses_seed_conversion(shard_dir):
+    parsed = parse_shard(os.path.join(shard_dir, "day-0.jsonl"))
+    assert parsed == orders[0::4]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_order_shards_merges_all_shards(shard_dir, workers):
+    loaded = load_order_shards(shard_dir, workers=workers)
+    assert isinstance(loaded, tuple)
+    assert sorted(loaded, key=lambda o: o.id) == sorted(orders, key=lambda o: o.id)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_order_shards_sorted_by_ts(shard_dir, workers):
+    loaded = load_order_shards(shard_dir, workers=workers, sort_by_ts=True)
+    assert [o.ts for o in loaded] == sorted(o.ts for o in orders)
+    assert set(loaded) == set(orders)
+
+
+def test_empty_directory(tmp_path):
+    assert load_order_shards(str(tmp_path)) == ()
+
+
+def test_parallel_ingest_interns_strings(shard_dir):
+    loaded = load_order_shards(shard_dir, workers=2)
+    by_user = {}
+    for o in loaded:
+        assert by_user.setdefault(o.user_id, o.user_id) is o.user_id
+        assert o.status is sys.intern(o.status)
+        assert all(pid is sys.intern(pid) for pid, _ in o.items)
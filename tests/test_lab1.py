@@ -5,6 +5,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core.domain import Cart, Order
 from core.transforms import (
+    _to_product,
+    _to_user,
     load_seed,
     add_to_cart,
     remove_from_cart,
@@ -73,3 +75,26 @@ def test_total_sales_reduce():
     total = total_sales((order1, order2))
     expected_total = (products[0].price * 1) + (products[1].price * 3)
     assert total == expected_total
+
+
+def test_domain_objects_are_compact():
+    """Объекты без __dict__, повторяющиеся id — один и тот же объект строки"""
+    assert not hasattr(orders[0], "__dict__")
+    assert not hasattr(products[0], "__dict__")
+
+    same_user = [o for o in orders if o.user_id == orders[0].user_id]
+    assert all(o.user_id is same_user[0].user_id for o in same_user)
+    assert all(o.status is orders[0].status for o in orders if o.status == "paid")
+
+
+def test_converters_keep_missing_values():
+    """None в необязательных полях остаётся None, а не строкой 'None'"""
+    user = _to_user({"id": "u_x", "name": "X", "tier": None})
+    assert user.tier is None
+    product = _to_product(
+        {"id": "p_x", "title": "X", "price": 1, "category_id": None, "tags": ["a"]}
+    )
+    assert product.category_id is None
+    assert product.tags == ("a",)
+    tier = "".join(users[0].tier)  # равная, но другая строка
+    assert _to_user({"id": "u_x", "name": "X", "tier": tier}).tier is users[0].tier
@@ -0,0 +1,59 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from core.transforms import load_seed, _to_order
+from core.domain import Order
+from core.dataset import OrderTable
+from Analytics_Service import report, backend, numpy_backend
+from benchmarks.synthetic import iter_synthetic_orders
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+odd_orders = tuple(orders) + (
+    Order("x1", "u001", (("p001", 3), ("p001", 1)), 500, "bad-ts", "paid"),
+    Order("x2", "u_new", (("p_missing", 50),), 700, "2025-10-21T-1:00", "paid"),
+    Order("x3", "u_new", (), 700, "2025-10-21T23:59:00", "refunded"),
+)
+synthetic = tuple(map(_to_order, iter_synthetic_orders(5_000, n_users=300)))
+huge = (
+    Order("h1", "u1", (("p1", 1),), 2**62, "2025-01-01T10:00:00", "paid"),
+    Order("h2", "u1", (("p1", 1),), 3, "2025-01-01T10:00:00", "paid"),
+)
+
+REPORTS = {
+    "sales_by_period": lambda o: report.sales_by_period(o, "2025-01-01", "2025-12-31"),
+    "sales_by_hour": report.sales_by_hour,
+    "sales_by_weekday": report.sales_by_weekday,
+    "customer_lifetime_value": report.customer_lifetime_value,
+    "bestsellers_report": lambda o: report.bestsellers_report(o, products, k=7),
+    "retention_rate": report.retention_rate,
+    "top_customers_report": report.top_customers_report,
+}
+
+
+@pytest.mark.skipif(not numpy_backend.AVAILABLE, reason="NumPy не установлен")
+@pytest.mark.parametrize("data", [orders, odd_orders, synthetic, huge, ()])
+@pytest.mark.parametrize("name", REPORTS)
+def test_numpy_backend_is_identical(name, data):
+    fn = REPORTS[name]
+    expected = fn(tuple(data))
+    with backend.use_backend("numpy"):
+        result = fn(OrderTable(data))
+    assert result == expected
+    assert repr(result) == repr(expected)  # порядок ключей и типы значений
+
+
+def test_numpy_falls_back_when_missing(monkeypatch):
+    monkeypatch.setattr(numpy_backend, "AVAILABLE", False)
+    with pytest.warns(UserWarning):
+        with backend.use_backend("numpy") as chosen:
+            assert chosen == "python" and not backend.numpy_enabled()
+            assert report.sales_by_hour(orders) == report.sales_by_hour(tuple(orders))
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        backend.set_backend("fortran")
+    assert backend.get_backend() in backend.BACKENDS
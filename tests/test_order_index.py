@@ -0,0 +1,71 @@
+import sys
+import os
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.dataset import OrderTable
+from core.order_index import build_time_index
+from core.service import OrderService
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+shuffled = list(orders)
+random.Random(7).shuffle(shuffled)
+shuffled = tuple(shuffled)
+
+PREFIXES = ["2025", "2025-03", "2025-03-15", "2025-03-15T1", "2030-01-01", ""]
+
+
+def test_select_matches_startswith_in_original_order():
+    for data in (orders, shuffled):
+        index = build_time_index(data)
+        assert list(index.ts) == sorted(o.ts for o in data)
+        for day in set(o.ts[:10] for o in data) | set(PREFIXES):
+            expected = tuple(o for o in data if o.ts.startswith(day))
+            assert index.select(data, day) == expected
+
+
+def test_period_matches_filter():
+    index = build_time_index(shuffled)
+    for start, end in [
+        ("2025-01-01", "2025-12-31"),
+        ("2025-03-01", "2025-06-30"),
+        ("2025-06-30", "2025-03-01"),
+        ("2025-05-05", "2025-05-05"),
+    ]:
+        expected = tuple(o for o in shuffled if start <= o.ts[:10] <= end)
+        assert index.select_period(shuffled, start, end) == expected
+
+
+def test_extended_index_matches_rebuild():
+    ordered = tuple(sorted(orders, key=lambda o: o.ts))
+    head, tail = ordered[: len(ordered) // 2], ordered[len(ordered) // 2 :]
+    index = build_time_index(head).extended(tail)
+    assert index == build_time_index(ordered)
+    # Запоздавший заказ — индекс строится заново, а не дописывается
+    assert build_time_index(tail).extended(head[:1]) is None
+
+
+def test_order_service_uses_index_after_append():
+    ordered = tuple(sorted(orders, key=lambda o: o.ts))
+    service = OrderService(ordered[:100])
+    service.orders_by_day(ordered[0].ts[:10])  # строит индекс
+    service.append(ordered[100:])
+    assert isinstance(service.orders, OrderTable)
+    assert "time_index" in vars(service.orders)
+    for day in set(o.ts[:10] for o in ordered):
+        assert service.orders_by_day(day) == tuple(
+            o for o in ordered if o.ts.startswith(day)
+        )
+    assert service.orders_by_period("2025-03-01", "2025-03-31") == tuple(
+        o for o in ordered if "2025-03-01" <= o.ts[:10] <= "2025-03-31"
+    )
+
+
+def test_sales_by_period_on_table_keeps_key_order():
+    table = OrderTable(shuffled)
+    for start, end in [("2025-01-01", "2025-12-31"), ("2025-03-01", "2025-06-30")]:
+        expected = report.sales_by_period(shuffled, start, end)
+        result = report.sales_by_period(table, start, end)
+        assert result == expected and list(result) == list(expected)
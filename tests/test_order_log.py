@@ -0,0 +1,76 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from core.transforms import load_seed
+from core.service import OrderService
+from core.order_log import OrderLog, OrderLogFollower
+
+orders = load_seed("data/seed.json")[3]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "orders.log.jsonl")
+
+
+def test_follower_appends_to_live_service(log_path):
+    svc = OrderService(orders[:10])
+    follower = OrderLogFollower(log_path)
+    assert follower.sync(svc) == 0  # журнала ещё нет
+
+    with OrderLog(log_path) as log:
+        end = log.append(orders[10:30])
+        assert follower.sync(svc) == 20
+        assert follower.high_water_mark == end == svc.log_offset
+
+        log.append(orders[30:])
+        assert follower.sync(svc) == len(orders) - 30
+
+    assert svc.orders == orders
+    assert svc.total_revenue() == OrderService(orders).total_revenue()
+
+
+def test_partial_line_is_not_consumed(log_path):
+    with OrderLog(log_path) as log:
+        end = log.append(orders[:2])
+    with open(log_path, "ab") as f:
+        f.write(b'{"id": "o_half", "user_id"')
+
+    follower = OrderLogFollower(log_path)
+    assert follower.poll() == orders[:2]
+    assert follower.offset == end
+    assert follower.poll() == ()
+
+
+def test_follower_resumes_from_offset(log_path):
+    with OrderLog(log_path) as log:
+        mark = log.append(orders[:5])
+        log.append(orders[5:8])
+    assert OrderLogFollower(log_path, offset=mark).poll() == orders[5:8]
+
+
+def test_truncated_log_is_rejected(log_path):
+    with OrderLog(log_path) as log:
+        log.append(orders[:5])
+    follower = OrderLogFollower(log_path)
+    follower.poll()
+    open(log_path, "wb").close()
+    with pytest.raises(ValueError):
+        follower.poll()
+
+
+def test_appended_segments_merge_on_read():
+    svc = OrderService(orders[:10])
+    before = svc.orders
+    _ = before.time_index  # индекс построен до дозаписи
+    for lo in range(10, len(orders), 7):
+        assert svc.append(orders[lo : lo + 7]) == min(lo + 7, len(orders))
+    assert svc.order_count() == len(orders)
+
+    merged = svc.orders
+    assert merged == orders and merged is svc.orders  # слияние один раз
+    assert merged.version != before.version
+    assert merged.time_index.select(merged, orders[-1].ts[:10])
+    assert svc.append(()) == len(orders) and svc.orders is merged
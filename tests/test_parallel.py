@@ -0,0 +1,75 @@
+import sys
+import os
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core import parallel
+from core.parallel import OrderPool
+from core import async_ops
+
+categories, products, users, orders = load_seed("data/seed.json")
+plain = tuple(orders)
+days = [o.ts[:10] for o in orders[:: max(1, len(orders) // 9)]] + ["1999-01-01"]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Три воркера: части заказов и дней не совпадают с границами пакетов
+    with OrderPool(orders, workers=3) as pool:
+        yield pool
+
+
+def calls():
+    user_ids = [u.id for u in users] + ["nobody"]
+    return (
+        (async_ops.sales_by_day_async, (days,), {}),
+        (async_ops.sales_by_user_async, (user_ids,), {}),
+        (async_ops.product_performance_async, (products,), {}),
+        (async_ops.customer_segmentation_async, (users,), {}),
+        (async_ops.batch_process_orders, (), {}),
+        (async_ops.batch_process_orders, (), {"batch_size": 7}),
+    )
+
+
+def test_pool_results_identical(pool):
+    for fn, args, kwargs in calls():
+        expected = asyncio.run(fn(plain, *args, **kwargs))
+        result = asyncio.run(fn(orders, *args, pool=pool, **kwargs))
+        assert result == expected, fn.__name__
+        if isinstance(result, dict):
+            assert list(result) == list(expected)  # и порядок ключей
+
+
+def test_pool_pipeline_identical(pool):
+    expected = async_ops.run_async_pipeline(orders, products, users)
+    assert async_ops.run_async_pipeline(orders, products, users, pool=pool) == expected
+
+
+def test_pool_over_plain_tuple():
+    with OrderPool(plain, workers=2) as pool:
+        result = asyncio.run(async_ops.sales_by_day_async(plain, days, pool=pool))
+        assert result == asyncio.run(async_ops.sales_by_day_async(orders, days))
+
+
+def test_pool_rejects_other_orders(pool):
+    with pytest.raises(ValueError):
+        asyncio.run(async_ops.batch_process_orders(orders[:10], pool=pool))
+    assert pool.ranges(10)[1][0] % 10 == 0
+    assert pool.ranges()[-1][1] == len(orders)
+
+
+def test_no_fork_while_other_threads_run(monkeypatch):
+    # Например, идёт прогрев отчётов: пул запускается без fork
+    monkeypatch.setattr(parallel.threading, "active_count", lambda: 2)
+    context = parallel._default_context()
+    assert context is None or context.get_start_method() != "fork"
+    with OrderPool(orders, workers=2) as pool:
+        result = asyncio.run(async_ops.sales_by_day_async(orders, days, pool=pool))
+        assert result == asyncio.run(async_ops.sales_by_day_async(plain, days))
+
+    monkeypatch.setattr(parallel.threading, "active_count", lambda: 1)
+    if "fork" in parallel.multiprocessing.get_all_start_methods():
+        assert parallel._default_context().get_start_method() == "fork"
@@ -0,0 +1,72 @@
+import sys
+import os
+import asyncio
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed, checkout, safe_product
+from core.domain import Cart, Product
+from core.product_index import ProductIndex, ProductTable, product_index
+from core.recursion import collect_products_recursive
+from core.service import CatalogService, OrderService, AnalyticsService
+from core.async_ops import product_performance_async
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def test_load_seed_returns_indexed_table():
+    assert isinstance(products, ProductTable)
+    assert product_index(products) is products.index
+    assert pickle.loads(pickle.dumps(products)) == products
+
+
+def test_lookup_by_id_and_category():
+    index = products.index
+    for p in products:
+        assert index.get(p.id) == p and index.price(p.id) == p.price
+    assert index.get("missing") is None and "missing" not in index
+    for c in categories:
+        assert index.in_category(c.id) == tuple(
+            p for p in products if p.category_id == c.id
+        )
+    ids = {c.id for c in categories[:3]}
+    assert index.in_categories(ids) == tuple(
+        p for p in products if p.category_id in ids
+    )
+
+
+def test_duplicate_id_resolves_to_first_like_linear_scan():
+    a = Product("p1", "A", 100, "c1", ())
+    b = Product("p1", "B", 200, "c1", ())
+    assert ProductIndex((a, b)).get("p1") is a
+
+
+def test_checkout_and_safe_product_match_plain_tuple():
+    cart = Cart("c1", "u1", tuple((p.id, 2) for p in products[:5]))
+    plain = tuple(products)
+    assert (
+        checkout(cart, "2025-01-01T00:00:00", products).get_or_else(None).total
+        == checkout(cart, "2025-01-01T00:00:00", plain).get_or_else(None).total
+        == sum(2 * p.price for p in products[:5])
+    )
+    missing = Cart("c2", "u1", (("missing", 1),))
+    assert checkout(missing, "2025-01-01T00:00:00", products).is_left
+    assert safe_product(products, products[0].id).get_or_else(None) == products[0]
+    assert safe_product(plain, "missing").is_none()
+
+
+def test_catalog_and_reports_use_index():
+    catalog = CatalogService(categories, tuple(products))
+    for c in categories:
+        assert catalog.products_by_category(c.id) == collect_products_recursive(
+            categories, products, c.id
+        )
+    analytics = AnalyticsService(catalog, OrderService(orders))
+    report = analytics.category_sales_report(categories[0].id)
+    assert report["products_count"] == len(
+        collect_products_recursive(categories, products, categories[0].id)
+    )
+
+    plain = asyncio.run(product_performance_async(tuple(orders), products))
+    table = asyncio.run(product_performance_async(orders, products))
+    assert plain == table
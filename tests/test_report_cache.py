@@ -0,0 +1,106 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.frp import create_event, create_shop_event_bus, initial_state
+from core.frp import with_report_cache
+from core.report_cache import ReportCache, deep_sizeof
+from core.service import OrderService
+from Analytics_Service.report import sales_summary, bestsellers_report
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counting(report):
+    calls = []
+
+    def wrapped(*args, **kwargs):
+        calls.append(args)
+        return report(*args, **kwargs)
+
+    wrapped.__qualname__ = report.__qualname__ + "_counting"
+    return wrapped, calls
+
+
+def test_hits_misses_and_ttl():
+    clock = FakeClock()
+    cache = ReportCache(ttl=10, clock=clock)
+    report, calls = counting(sales_summary)
+    assert (
+        cache.get(report, orders) == cache.get(report, orders) == sales_summary(orders)
+    )
+    assert len(calls) == 1
+    clock.now = 11
+    cache.get(report, orders)
+    assert len(calls) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+    assert stats["bytes"] == deep_sizeof(sales_summary(orders))
+
+
+def test_memory_budget_evicts_least_recently_used():
+    one = deep_sizeof(sales_summary(orders))
+    cache = ReportCache(max_bytes=2 * one)
+    a, b, c = orders[:10], orders[:20], orders[:30]
+    cache.get(sales_summary, a), cache.get(sales_summary, b)
+    cache.get(sales_summary, a)  # a — недавно использованная
+    cache.get(sales_summary, c)  # вытесняет b
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+    assert cache.bytes <= cache.max_bytes
+    misses = cache.misses
+    cache.get(sales_summary, a)
+    assert cache.misses == misses
+    # Результат больше бюджета не кэшируется
+    tiny = ReportCache(max_bytes=10)
+    tiny.get(sales_summary, a)
+    assert len(tiny) == 0 and tiny.bytes == 0
+
+
+def test_invalidation_by_dependencies_and_events():
+    cache = ReportCache()
+    cache.get(sales_summary, orders)
+    cache.get(bestsellers_report, orders, products, k=3, deps=("orders", "products"))
+    cart_report = cache.cached("carts")(lambda carts: len(carts))
+    cart_report(("c1",))
+    assert len(cache) == 3
+
+    bus = with_report_cache(create_shop_event_bus(), cache)
+    state = bus.publish(
+        create_event("ADD_TO_CART", {"cart_id": "c1", "product_id": "p1", "qty": 1}),
+        initial_state(),
+    )
+    assert len(cache) == 2 and state["active_carts"]  # корзины сброшены
+    bus.publish(create_event("REFUND", {"order_id": "o1", "amount": 1}), state)
+    assert len(cache) == 0 and cache.stats()["invalidations"] == 3
+
+    assert cache.invalidate("products") == 0
+
+
+def test_order_service_append_invalidates_and_rekeys():
+    cache = ReportCache()
+    service = OrderService(orders[:50], cache=cache)
+    before = cache.get(sales_summary, service.orders)
+    service.append(orders[50:])
+    assert len(cache) == 0
+    assert cache.get(sales_summary, service.orders) == sales_summary(orders)
+    assert before == sales_summary(orders[:50])
+
+
+def test_report_computed_during_invalidation_is_not_stored():
+    cache = ReportCache()
+
+    def racing_report(data):
+        cache.invalidate("orders")  # новые заказы пришли, пока отчёт считался
+        return len(data)
+
+    cache.get(racing_report, orders)
+    assert len(cache) == 0
@@ -0,0 +1,116 @@
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.rollup import RollupCube
+from core.service import CatalogService, OrderService, AnalyticsService
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+cube = RollupCube.build(orders, products, users)
+tier_of = {u.id: u.tier for u in users}
+
+
+def test_cube_is_smaller_than_orders_and_matches_reports():
+    assert 0 < len(cube.order_cells) <= len(orders)
+    assert (
+        sum(cube.basket_cells.values()) == report.sales_summary(orders)["paid_orders"]
+    )
+    assert cube.sales_summary() == report.sales_summary(orders)
+    for start, end in [("2025-01-01", "2025-12-31"), ("2025-03-01", "2025-06-30")]:
+        expected = report.sales_by_period(orders, start, end)
+        result = cube.sales_by_period(start, end)
+        assert result == expected and list(result) == list(expected)
+
+
+def test_tier_slices_match_filtered_orders():
+    for tier in set(tier_of.values()):
+        subset = tuple(o for o in orders if tier_of.get(o.user_id) == tier)
+        assert cube.sales_summary(tier) == report.sales_summary(subset)
+        assert list(cube.sales_by_period("2025-01-01", "2025-12-31", tier).items()) == (
+            list(report.sales_by_period(subset, "2025-01-01", "2025-12-31").items())
+        )
+    by_tier = cube.tier_sales()
+    assert sum(row["revenue"] for row in by_tier.values()) == (
+        report.sales_summary(orders)["total_revenue"]
+    )
+
+
+def test_category_sales_report_from_cube():
+    catalog = CatalogService(categories, products)
+    plain = AnalyticsService(catalog, OrderService(orders))
+    cubed = AnalyticsService(catalog, OrderService(orders, cube=cube))
+    for c in categories:
+        assert cubed.category_sales_report(c.id) == plain.category_sales_report(c.id)
+
+
+def test_incremental_append_matches_full_build():
+    half = len(orders) // 2
+    svc = OrderService(
+        orders[:half], cube=RollupCube.build(orders[:half], products, users)
+    )
+    svc.append(orders[half:])
+    assert svc.cube.order_cells == cube.order_cells
+    assert svc.cube.item_cells == cube.item_cells
+    assert list(svc.cube.sales_by_period("2025-01-01", "2025-12-31")) == list(
+        cube.sales_by_period("2025-01-01", "2025-12-31")
+    )
+
+
+def test_service_reports_read_cube():
+    catalog = CatalogService(categories, products)
+    plain = AnalyticsService(catalog, OrderService(orders))
+    cubed = AnalyticsService(catalog, OrderService(orders, cube=cube))
+    for start, end in [("2025-01-01", "2025-12-31"), ("2025-03-01", "2025-06-30")]:
+        expected = plain.sales_by_period_report(start, end)
+        assert expected == report.sales_by_period(orders, start, end)
+        result = cubed.sales_by_period_report(start, end)
+        assert result == expected and list(result) == list(expected)
+    assert cubed.sales_summary_report() == plain.sales_summary_report()
+    for tier in set(tier_of.values()):
+        assert cubed.sales_summary_report(tier) == cube.sales_summary(tier)
+    assert cubed.tier_sales_report() == cube.tier_sales()
+
+    # Без куба срез по тарифу не из чего посчитать
+    with pytest.raises(ValueError):
+        plain.sales_summary_report("vip")
+    with pytest.raises(ValueError):
+        plain.tier_sales_report()
+
+    # Отчёты читают куб, а не заказы сервиса
+    partial = RollupCube.build(orders[:10], products, users)
+    service = AnalyticsService(catalog, OrderService(orders, cube=partial))
+    assert service.sales_summary_report() == report.sales_summary(orders[:10])
+
+
+def test_concurrent_appends_and_cube_reads():
+    svc = OrderService((), cube=RollupCube(products, users))
+    analytics = AnalyticsService(CatalogService(categories, products), svc)
+    batches = [orders[i : i + 3] for i in range(0, len(orders), 3)]
+    errors = []
+
+    def writer(part):
+        for batch in part:
+            svc.append(batch)
+
+    def reader():
+        try:
+            for _ in range(200):
+                analytics.sales_by_period_report("2025-01-01", "2025-12-31")
+                analytics.tier_sales_report()
+        except RuntimeError as exc:  # dict changed size during iteration
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer, args=(batches[i::2],)) for i in (0, 1)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert svc.cube.order_count == len(orders) == svc.order_count()
+    assert svc.cube.order_cells == cube.order_cells
@@ -0,0 +1,74 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import shutil
+import threading
+import time
+from core.transforms import load_seed
+from core.dataset import OrderTable
+from core.seed_dataset import SeedDataset
+
+SEED = "data/seed.json"
+seed = load_seed(SEED)
+
+
+def test_sections_are_materialized_on_demand():
+    data = SeedDataset(SEED)
+    assert data.loaded_sections() == ()
+    assert data.products == seed[1]
+    assert data.loaded_sections() == ("products",)
+    assert data.count("categories") == len(seed[0])
+    assert "orders" not in data.loaded_sections()
+
+
+def test_unpacks_like_load_seed():
+    categories, products, users, orders = SeedDataset(SEED)
+    assert (categories, products, users, orders) == seed
+    assert isinstance(orders, OrderTable)
+
+
+def test_snapshot_counts_without_materializing(tmp_path):
+    snap = str(tmp_path / "seed.snapshot")
+    load_seed(SEED, snapshot=snap)
+
+    data = SeedDataset(SEED, snapshot=snap)
+    assert data.count("orders") == len(seed[3])
+    assert data.categories == seed[0]
+    assert data.loaded_sections() == ("categories",)
+    assert data.orders == seed[3]
+
+
+def test_stale_snapshot_is_rebuilt(tmp_path):
+    json_path, snap = str(tmp_path / "seed.json"), str(tmp_path / "seed.snapshot")
+    shutil.copy(SEED, json_path)
+    data = SeedDataset(json_path, snapshot=snap)
+    assert data.users == seed[2]
+    assert os.path.exists(snap)
+    assert tuple(SeedDataset(json_path, snapshot=snap)) == seed
+
+
+def test_concurrent_first_access_loads_section_once(monkeypatch):
+    import core.seed_dataset as seed_dataset
+
+    calls = []
+    iter_section = seed_dataset.iter_section
+
+    def slow_iter_section(path, section):
+        calls.append(section)
+        time.sleep(0.05)  # второй поток успевает обратиться к секции
+        return iter_section(path, section)
+
+    monkeypatch.setattr(seed_dataset, "iter_section", slow_iter_section)
+    data = SeedDataset(SEED)
+    tables = []
+    threads = [
+        threading.Thread(target=lambda: tables.append(data.orders)) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["orders"]
+    assert all(t is tables[0] for t in tables)
+    assert len({t.version for t in tables}) == 1
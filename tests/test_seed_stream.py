@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pytest
+from core.transforms import load_seed
+from core.seed_stream import (
+    iter_seed,
+    iter_section,
+    iter_orders,
+    iter_order_batches,
+    load_seed_streaming,
+)
+
+SEED = "data/seed.json"
+
+
+def test_streaming_loader_matches_load_seed():
+    assert load_seed_streaming(SEED) == load_seed(SEED)
+
+
+def test_tiny_chunks_split_numbers_and_strings():
+    """Куски по 7 символов рвут числа и строки на границах"""
+    assert load_seed_streaming(SEED, chunk_size=7) == load_seed(SEED)
+
+
+def test_iter_orders_is_lazy_and_ordered():
+    orders = load_seed(SEED)[3]
+    it = iter_orders(SEED)
+    assert next(it) == orders[0]
+    assert tuple(iter_orders(SEED, chunk_size=13)) == orders
+
+
+def test_iter_section_and_batches():
+    _, products, _, orders = load_seed(SEED)
+    assert len(list(iter_section(SEED, "products"))) == len(products)
+    batches = list(iter_order_batches(SEED, batch_size=25))
+    assert [len(b) for b in batches] == [25, 25, 10]
+    assert sum(batches, ()) == orders
+
+
+def test_empty_sections_and_scalars(tmp_path):
+    path = tmp_path / "seed.json"
+    path.write_text(
+        json.dumps({"version": 3, "categories": [], "meta": {"a": [1]}, "orders": []})
+    )
+    assert list(iter_seed(str(path))) == []
+    assert load_seed_streaming(str(path)) == ((), (), (), ())
+
+
+def test_truncated_document_raises(tmp_path):
+    path = tmp_path / "seed.json"
+    path.write_text('{"orders": [{"id": "o1", "total": 1')
+    with pytest.raises(ValueError):
+        list(iter_seed(str(path), chunk_size=4))
+
+
+def test_scalar_numbers_split_at_any_chunk_boundary(tmp_path):
+    path = tmp_path / "seed.json"
+    text = (
+        '{"version": 12.5, "scale": -1e3, "ratio":2.5E-2,'
+        ' "nums": [1.25, 3e2, -0.5, 7], "rate": 0.125 , "orders": [], "n": 10}'
+    )
+    path.write_text(text)
+    expected = [("nums", v) for v in json.loads(text)["nums"]]
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_seed(str(path), chunk_size=chunk_size)) == expected
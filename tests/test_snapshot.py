@@ -0,0 +1,74 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import shutil
+from core.transforms import load_seed
+from core.snapshot import SeedSnapshot, open_snapshot, write_snapshot
+
+SEED = "data/seed.json"
+
+
+def test_snapshot_roundtrip(tmp_path):
+    seed = load_seed(SEED)
+    path = str(tmp_path / "seed.snapshot")
+    write_snapshot(path, seed)
+
+    snap = SeedSnapshot(path)
+    assert snap.load() == seed
+    assert list(snap.column("order_total")) == [o.total for o in seed[3]]
+    snap.close()
+
+
+def test_load_seed_writes_then_reuses_snapshot(tmp_path):
+    snap_path = str(tmp_path / "seed.snapshot")
+    first = load_seed(SEED, snapshot=snap_path)
+    assert os.path.exists(snap_path)
+    mtime = os.stat(snap_path).st_mtime_ns
+
+    second = load_seed(SEED, snapshot=snap_path)
+    assert first == second == load_seed(SEED)
+    # Тип секций не зависит от того, был ли снимок тёплым
+    assert [type(x) for x in first] == [type(x) for x in second]
+    assert [type(x) for x in second] == [type(x) for x in load_seed(SEED)]
+    assert os.stat(snap_path).st_mtime_ns == mtime  # снимок не перезаписан
+
+
+def test_snapshot_invalidated_when_source_changes(tmp_path):
+    json_path = str(tmp_path / "seed.json")
+    snap_path = str(tmp_path / "seed.snapshot")
+    shutil.copy(SEED, json_path)
+    load_seed(json_path, snapshot=snap_path)
+
+    # Тот же размер и содержимое, другой mtime — снимок остаётся валидным по sha256
+    os.utime(json_path, ns=(1, 1))
+    snap = open_snapshot(snap_path, json_path)
+    assert snap is not None
+    snap.close()
+
+    with open(json_path, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert open_snapshot(snap_path, json_path) is None
+
+
+def test_open_snapshot_rejects_garbage(tmp_path):
+    path = tmp_path / "seed.snapshot"
+    path.write_bytes(b"not a snapshot at all")
+    assert open_snapshot(str(path)) is None
+
+
+def test_snapshot_keeps_missing_tier_and_category(tmp_path):
+    json_path = tmp_path / "seed.json"
+    snap_path = str(tmp_path / "seed.snapshot")
+    with open(SEED, encoding="utf-8") as f:
+        raw = json.load(f)
+    raw["users"][0]["tier"] = None
+    raw["products"][0]["category_id"] = None
+    json_path.write_text(json.dumps(raw), encoding="utf-8")
+
+    first = load_seed(str(json_path), snapshot=snap_path)  # запись снимка
+    second = load_seed(str(json_path), snapshot=snap_path)  # чтение снимка
+    assert first == second == load_seed(str(json_path))
+    assert second[2][0].tier is None and second[1][0].category_id is None
+    assert second[2][1].tier == first[2][1].tier
@@ -0,0 +1,104 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from dataclasses import replace
+from core.transforms import load_seed, by_category, by_price_range, by_tag
+from core.storage import store_from_seed
+from core.dataset import OrderTable
+from core.service import (
+    CatalogService,
+    OrderService,
+    AnalyticsService,
+    SqliteCatalogService,
+    SqliteOrderService,
+)
+from Analytics_Service import report, sql_report
+
+seed = load_seed("data/seed.json")
+categories, products, users, orders = seed
+
+
+@pytest.fixture(scope="module")
+def store():
+    s = store_from_seed(seed)
+    yield s
+    s.close()
+
+
+def test_store_roundtrip(store):
+    assert store.categories() == categories
+    assert store.products() == products
+    assert store.users() == users
+    assert store.orders() == orders
+
+
+def test_order_service_pushdown_matches_tuples(store):
+    mem, sql = OrderService(orders), SqliteOrderService(store)
+    day = orders[0].ts[:10]
+    assert sql.orders_by_day(day) == mem.orders_by_day(day)
+    assert sql.orders_by_day("1999-01-01") == ()
+    assert sql.paid_orders() == mem.paid_orders()
+    assert sql.total_revenue() == mem.total_revenue()
+    assert sql.top_customers(5) == mem.top_customers(5)
+
+
+def test_catalog_service_pushdown_matches_tuples(store):
+    mem, sql = CatalogService(categories, products), SqliteCatalogService(store)
+    for c in categories:
+        assert sql.products_by_category(c.id) == mem.products_by_category(c.id)
+    for pred in (by_category("c003"), by_price_range(50_000, 100_000), by_tag("new")):
+        assert sql.filter_products(pred) == mem.filter_products(pred)
+    assert sql.filter_products(lambda p: p.price > 150_000) == mem.filter_products(
+        lambda p: p.price > 150_000
+    )
+
+
+def test_analytics_service_over_sqlite(store):
+    mem = AnalyticsService(CatalogService(categories, products), OrderService(orders))
+    sql = AnalyticsService(SqliteCatalogService(store), SqliteOrderService(store))
+    assert sql.category_sales_report("c001") == mem.category_sales_report("c001")
+    assert sql.user_retention_report() == mem.user_retention_report()
+
+
+def test_sql_reports_match_python_reports(store):
+    assert sql_report.comprehensive_report(store) == report.comprehensive_report(
+        orders, products, users
+    )
+    assert sql_report.sales_by_period(
+        store, "2025-07-01", "2025-09-30"
+    ) == report.sales_by_period(orders, "2025-07-01", "2025-09-30")
+    assert sql_report.customer_lifetime_value(store) == report.customer_lifetime_value(
+        orders
+    )
+    assert sql_report.bestsellers_report(store, 10) == report.bestsellers_report(
+        orders, products, 10
+    )
+    assert list(sql_report.sales_by_weekday(store)) == list(
+        report.sales_by_weekday(orders)
+    )
+
+
+def test_sql_time_reports_match_on_messy_timestamps():
+    paid = next(o for o in orders if o.status == "paid")
+    messy = (
+        "2025-10-22T0x:00:00",
+        "2025-10-22T 9:00:00",
+        "2025-10-22T+9:00:00",
+        "2025-10-22",
+        "2025-10-22T10:00:00+05:00",
+        "bad",
+        "",
+    )
+    extra = tuple(replace(paid, id=f"m{i}", ts=ts) for i, ts in enumerate(messy))
+    data = orders + extra
+    store = store_from_seed((categories, products, users, data))
+    try:
+        for name in ("sales_by_hour", "sales_by_weekday"):
+            sql = getattr(sql_report, name)(store)
+            for variant in (data, OrderTable(data)):
+                expected = getattr(report, name)(variant)
+                assert sql == expected and list(sql) == list(expected), name
+    finally:
+        store.close()
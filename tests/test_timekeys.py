@@ -0,0 +1,66 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import pytest
+from core.domain import Order
+from core.transforms import load_seed
+from core.dataset import OrderTable
+from core.timekeys import NO_VALUE, build_time_keys
+from core.service import OrderService
+from core.async_ops import sales_by_day_async
+from Analytics_Service import report
+
+orders = load_seed("data/seed.json")[3]
+
+
+def _order(oid: str, ts: str, status: str = "paid", total: int = 100) -> Order:
+    return Order(oid, "u1", (), total, ts, status)
+
+
+# Нестандартные ts: только дата, часовой пояс, мусор, пустая строка
+odd = (
+    _order("o1", "2025-06-23T23:30:00+05:00"),
+    _order("o2", "2025-06-22"),
+    _order("o3", "garbage"),
+    _order("o4", "2025-06-22T07:15:00", total=50),
+    _order("o5", ""),
+    _order("o6", "2025-06-24T10:00:00", status="refunded"),
+)
+
+
+def test_time_keys_columns():
+    keys = build_time_keys(odd)
+    assert keys.day_keys == ("", "2025-06-22", "2025-06-23", "2025-06-24", "garbage")
+    assert list(keys.hour) == [23, NO_VALUE, NO_VALUE, 7, NO_VALUE, 10]
+    assert list(keys.weekday) == [0, 6, NO_VALUE, 6, NO_VALUE, 1]
+    assert keys.epoch[3] == 1750576500  # наивное время считается UTC
+    assert keys.day_codes("2025-06-22", "2025-06-23") == range(1, 3)
+
+
+@pytest.mark.parametrize("data", [tuple(orders), odd])
+def test_time_reports_identical_on_order_table(data):
+    table = OrderTable(data)
+    assert report.sales_by_hour(table) == report.sales_by_hour(data)
+    assert list(report.sales_by_weekday(table).items()) == list(
+        report.sales_by_weekday(data).items()
+    )
+    for start, end in (("2025-06-22", "2025-06-23"), ("", "z"), ("2025-08", "2025-09")):
+        assert list(report.sales_by_period(table, start, end).items()) == list(
+            report.sales_by_period(data, start, end).items()
+        )
+
+
+@pytest.mark.parametrize("day", ["2025-10-21", "2025-10", "2025", "", "2025-06-22T0"])
+def test_orders_by_day_uses_time_keys(day):
+    assert OrderService(orders).orders_by_day(day) == OrderService(
+        tuple(orders)
+    ).orders_by_day(day)
+
+
+def test_sales_by_day_async_on_order_table():
+    days = ["2025-06-22", "2025-10-21", "2025-10"]
+    assert asyncio.run(sales_by_day_async(orders, days)) == asyncio.run(
+        sales_by_day_async(list(orders), days)
+    )
@@ -0,0 +1,97 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from functools import lru_cache, reduce
+import pytest
+from core.transforms import load_seed
+from core.domain import Order
+from core import transient
+from core.transient import TransientDict, transient_reduce
+from core.service import AnalyticsService, CatalogService, OrderService
+from Analytics_Service import report
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def test_transient_reduce_matches_copying_fold():
+    def copying(acc, o):
+        return {**acc, o.user_id: acc.get(o.user_id, 0) + o.total}
+
+    expected = reduce(copying, orders, {})
+    result = transient_reduce(lambda acc, o: acc.add(o.user_id, o.total), orders)
+    assert result == expected and list(result) == list(expected)
+
+
+def test_transient_is_closed_after_persistent():
+    initial = {"a": 1}
+    acc = TransientDict(initial).add("a").append("b", 1).assoc("c", 3)
+    assert acc.persistent() == {"a": 2, "b": [1], "c": 3}
+    assert initial == {"a": 1}
+    with pytest.raises(RuntimeError):
+        acc.add("a")
+
+
+def test_plain_tuple_reports_unchanged():
+    # Обычный кортеж идёт через свёртки, OrderTable — через колонки
+    plain = tuple(orders)
+    assert report.customer_lifetime_value(plain) == report.customer_lifetime_value(
+        orders
+    )
+    assert report.bestsellers_report(plain, products) == report.bestsellers_report(
+        orders, products
+    )
+    assert report.top_customers_report(plain) == report.top_customers_report(orders)
+    assert report.retention_rate(plain) == report.retention_rate(orders)
+
+
+# ============ Масштабирование ============
+
+
+@lru_cache(maxsize=None)
+def make_orders(n: int):
+    # Ключей столько же порядка, сколько заказов: копирующая свёртка
+    # была бы квадратичной
+    return tuple(
+        Order(
+            f"o{i}",
+            f"u{i // 2}",
+            ((f"p{i // 3}", 1),),
+            100,
+            f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:00:00",
+            "paid",
+        )
+        for i in range(n)
+    )
+
+
+FOLDS = {
+    "customer_lifetime_value": report.customer_lifetime_value,
+    "bestsellers_report": lambda o: report.bestsellers_report(o, products),
+    "sales_by_hour": report.sales_by_hour,
+    "sales_by_period": lambda o: report.sales_by_period(o, "2025-01-01", "2025-12-31"),
+    "user_retention_report": lambda o: AnalyticsService(
+        CatalogService(categories, products), OrderService(o)
+    ).user_retention_report(),
+}
+
+
+@pytest.mark.parametrize("name", FOLDS)
+def test_folds_mutate_one_accumulator(name, monkeypatch):
+    # Вместо замеров времени: каждый шаг свёртки возвращает тот же
+    # транзиент (без копии словаря), шагов — не больше, чем заказов
+    folds = []
+
+    def checking_reduce(step, items, acc):
+        steps = 0
+        for item in items:
+            assert step(acc, item) is acc, f"{name}: шаг вернул новый аккумулятор"
+            steps += 1
+        folds.append(steps)
+        return acc
+
+    monkeypatch.setattr(transient, "reduce", checking_reduce)
+    data = make_orders(10_000)
+    FOLDS[name](data)
+    assert folds, f"{name}: отчёт не использует transient_reduce"
+    assert all(steps <= len(data) for steps in folds)
@@ -0,0 +1,74 @@
+import sys
+import os
+import pickle
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed, top_products
+from core.dataset import OrderTable
+from core.versioning import cache_key, versioned_cache
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def test_versions_and_fingerprints():
+    copy = OrderTable(tuple(orders))
+    assert orders.version == orders.version != copy.version
+    assert orders.fingerprint == copy.fingerprint
+    assert products.fingerprint != orders.fingerprint
+    assert hash(orders) == hash(tuple(orders)) == hash(copy)
+    # Дописанные заказы — новая таблица, новая версия и отпечаток
+    extended = orders.extend(orders[:1])
+    assert extended.version != orders.version
+    assert extended.fingerprint != orders.fingerprint
+    # После pickle — та же таблица по содержимому, но своя версия
+    restored = pickle.loads(pickle.dumps(orders))
+    assert restored.fingerprint == orders.fingerprint
+    assert cache_key(restored) != cache_key(orders)
+
+
+def test_versioned_cache_hits_and_bounded_size():
+    calls = []
+
+    @versioned_cache(maxsize=2)
+    def report(orders, k=1):
+        calls.append(k)
+        return len(orders) * k
+
+    assert report(orders, k=2) == report(orders, k=2) == 2 * len(orders)
+    assert calls == [2]
+    report(orders, k=3), report(orders, k=4)  # вытесняет k=2
+    report(orders, k=2)
+    assert calls == [2, 3, 4, 2]
+    info = report.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 4, 2, 2)
+    report.cache_clear()
+    assert report.cache_info().currsize == 0
+
+
+class Probe(OrderTable):
+    """OrderTable, считающая обходы и хеширование содержимого"""
+
+    touches = 0
+
+    def __hash__(self) -> int:
+        Probe.touches += 1
+        return super().__hash__()
+
+    def __iter__(self):
+        Probe.touches += 1
+        return super().__iter__()
+
+
+def test_top_products_hit_does_not_hash_orders():
+    big = Probe(orders * 2000)
+    top_products.cache_clear()
+    expected = top_products(tuple(orders), products, 5)
+    first = top_products(big, products, 5)
+    assert first == expected
+
+    Probe.touches = 0
+    for _ in range(100):
+        assert top_products(big, products, 5) is first
+    # Попадание ключуется по версии: заказы не обходятся и не хешируются
+    assert Probe.touches == 0
+    assert top_products.cache_info().hits == 100
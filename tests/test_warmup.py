@@ -0,0 +1,148 @@
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.transforms import load_seed
+from core.report_cache import ReportCache
+from core.seed_dataset import SeedDataset
+from core.snapshot import file_digest
+from core.warmup import Warmup, DONE, FAILED
+from Analytics_Service.report import sales_summary, retention_rate
+
+categories, products, users, orders = load_seed("data/seed.json")
+
+
+def counting(report):
+    calls = []
+
+    def wrapped(*args, **kwargs):
+        calls.append(args)
+        return report(*args, **kwargs)
+
+    wrapped.__qualname__ = report.__qualname__ + "_counting"
+    return wrapped, calls
+
+
+def gated(gate: threading.Event, started: threading.Event):
+    def task():
+        started.set()
+        gate.wait(5)
+        return "gate"
+
+    return task
+
+
+def test_background_warmup_fills_cache():
+    cache = ReportCache()
+    summary, calls = counting(sales_summary)
+    warmup = Warmup(
+        [
+            ("summary", lambda: cache.get(summary, orders)),
+            ("retention", lambda: cache.get(retention_rate, orders)),
+        ],
+        version=orders.fingerprint,
+    ).start()
+    assert warmup.wait(5) and warmup.finished
+    assert warmup.progress() == (2, 2) and warmup.current() is None
+    assert len(cache) == 2
+
+    assert warmup.get("summary") == sales_summary(orders)
+    assert warmup.get("retention") == retention_rate(orders)
+    assert len(calls) == 1  # страница прочитала прогретый результат
+    assert {s["state"] for s in warmup.stats().values()} == {DONE}
+
+
+def test_pending_task_runs_on_demand_once():
+    gate, started = threading.Event(), threading.Event()
+    cache = ReportCache()
+    summary, calls = counting(sales_summary)
+    warmup = Warmup(
+        [
+            ("slow", gated(gate, started)),
+            ("summary", lambda: cache.get(summary, orders)),
+        ]
+    ).start()
+    started.wait(5)
+    assert warmup.current() == "slow" and warmup.progress() == (0, 2)
+
+    # Прогрев ещё не дошёл до отчёта — страница считает его сама
+    assert warmup.get("summary") == sales_summary(orders)
+    assert warmup.ready("summary") and not warmup.finished
+    gate.set()
+    assert warmup.wait(5)
+    assert len(calls) == 1  # поток прогрева задачу пропустил
+
+
+def test_running_task_is_awaited_not_recomputed():
+    gate, started = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        return gated(gate, started)()
+
+    warmup = Warmup([("slow", slow)]).start()
+    started.wait(5)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(warmup.get("slow")))
+    reader.start()
+    reader.join(0.05)
+    assert reader.is_alive()  # ждёт фоновую задачу
+    gate.set()
+    reader.join(5)
+    # После ожидания результат читается задачей заново (из кэша)
+    assert result == ["gate"] and len(calls) == 2
+
+
+def test_background_error_is_stored_and_raised_by_get():
+    def failing():
+        raise RuntimeError("database is locked")
+
+    warmup = Warmup([("failing", failing), ("next", lambda: 42)])
+    assert not warmup.started
+    warmup.start()
+    assert warmup.started and warmup.wait(5)
+    stats = warmup.stats()
+    assert stats["failing"]["state"] == FAILED and "database is locked" in (
+        stats["failing"]["error"]
+    )
+    assert stats["next"]["state"] == DONE  # прогрев остальных продолжился
+    with pytest.raises(RuntimeError, match="database is locked"):
+        warmup.get("failing")
+
+    broken = Warmup([("broken", lambda: 1 / 0)])
+    with pytest.raises(ZeroDivisionError):
+        broken.get("broken")  # без фонового потока — считается сразу
+    assert isinstance(broken.stats()["broken"]["error"], str)
+
+
+def test_version_is_read_in_warmup_thread(tmp_path):
+    # Снимка ещё нет: чтение отпечатка при создании Warmup перестроило бы его
+    data = SeedDataset("data/seed.json", snapshot=str(tmp_path / "seed.snapshot"))
+    warmup = Warmup(
+        [("count", lambda: len(data.users))], version=lambda: data.fingerprint
+    )
+    assert "_snapshot" not in vars(data) and data.loaded_sections() == ()
+    assert warmup.start().wait(5)
+    assert warmup.version == data.fingerprint == file_digest("data/seed.json")
+
+
+def test_get_recomputes_after_background_failure():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+        return "report"
+
+    warmup = Warmup([("flaky", flaky)]).start()
+    assert warmup.wait(5) and warmup.stats()["flaky"]["state"] == FAILED
+    # Фоновая ошибка не поднимается: страница считает отчёт сама
+    assert warmup.get("flaky") == "report"
+    stats = warmup.stats()["flaky"]
+    assert stats["state"] == DONE and stats["error"] is None
+    assert warmup.get("flaky") == "report" and len(attempts) == 3